@@ -0,0 +1,275 @@
+import numpy as np
+
+from dice import PartyDiceFace, DungeonDiceFace, MONSTER_FACES, PARTY_FACES, DUNGEON_FACES
+from hero import HeroRank
+from monster_table import can_defeat_counts, SPECIALTY_NONE, SPECIALTY_MINSTREL, SPECIALTY_BARD
+from policy import Decision
+from treasure import TreasureActions, TreasureType, COMPANION_TYPES, TREASURE_TYPES
+
+# Plain ints for the hot path of can_defeat_monsters
+FIGHTER, MAGE, CLERIC, THIEF, CHAMPION = (int(face) for face in PartyDiceFace if face != PartyDiceFace.SCROLL)
+GOBLIN, SKELETON, OOZE = (int(face) for face in MONSTER_FACES)
+VORPAL_SWORD, TALISMAN, SCEPTER_OF_POWER, THIEVES_TOOLS = (int(t) for t in COMPANION_TYPES)
+
+# Most dice that can be in the dungeon at once
+MAX_DUNGEON_DICE = 7
+
+# Party dice faces that can be spent as companions
+COMPANION_FACES = tuple(face for face in PARTY_FACES if face != PartyDiceFace.SCROLL)
+
+# Fighters, Clerics and Mages defeat any number of one monster type
+GROUP_TYPES = {
+    PartyDiceFace.FIGHTER: DungeonDiceFace.GOBLIN,
+    PartyDiceFace.CLERIC: DungeonDiceFace.SKELETON,
+    PartyDiceFace.MAGE: DungeonDiceFace.OOZE,
+}
+
+# Party dice faces that can battle the Dragon
+DRAGON_FACES = tuple(face for face in COMPANION_FACES if face != PartyDiceFace.CHAMPION)
+
+# Treasures that can be used outside of combat; companion treasures and Dragon Scales never can
+ACTIVE_TREASURES = (TreasureType.SCROLL, TreasureType.RING_OF_INVISIBILITY, TreasureType.ELIXIR,
+                    TreasureType.DRAGON_BAIT, TreasureType.TOWN_PORTAL)
+
+# A companion is a Party die or a companion treasure, as the phases offer them
+COMPANION_VALUES = tuple(("party", face) for face in COMPANION_FACES) + tuple(("treasure", t) for t in COMPANION_TYPES)
+
+# The option values each decision can offer. None is Cancel, Skip or Done.
+DECISION_VALUES = {
+    Decision.MONSTER_ACTION: ("scroll", "companion", "auto", "treasure", "ultimate", "flee"),
+    Decision.COMPANION: COMPANION_VALUES + (None,),
+    Decision.COMPANION_ROLE: (PartyDiceFace.MAGE, PartyDiceFace.THIEF),
+    Decision.MONSTER_TARGET: tuple((monster, count) for monster in MONSTER_FACES for count in range(1, MAX_DUNGEON_DICE + 1)),
+    Decision.CHAMPION_TARGET: MONSTER_FACES + (None,),
+    Decision.LOOT_ACTION: ("chests", "potions", "scroll", "end"),
+    Decision.CHEST_COMPANION: (tuple(("party", face) for face in PARTY_FACES) +
+                               tuple(("treasure", t) for t in COMPANION_TYPES) + (None,)),
+    Decision.QUAFF_DIE: PARTY_FACES + (None,),
+    Decision.POTION_FACE: PARTY_FACES,
+    Decision.DRAGON_ACTION: ("battle", "treasure", "flee"),
+    Decision.DRAGON_SCROLL: (False, True),
+    Decision.DRAGON_COMPANION: COMPANION_VALUES + (None,),
+    Decision.REGROUP_ACTION: ("retire", "seek_glory", "scroll"),
+    Decision.SCROLL_TARGET: (tuple(("dungeon", face) for face in DUNGEON_FACES) +
+                             tuple(("party", face) for face in PARTY_FACES) + (None,)),
+    Decision.TREASURE: TREASURE_TYPES + (None,),
+    Decision.ELIXIR_FACE: PARTY_FACES,
+    Decision.REVIVE_DIE: PARTY_FACES,
+    Decision.DISCARD_TREASURE: TREASURE_TYPES,
+}
+
+# Every (decision, option value) pair, numbered. An action id means the same thing in every state.
+ACTIONS = tuple((decision, value) for decision, values in DECISION_VALUES.items() for value in values)
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+NUM_ACTIONS = len(ACTIONS)
+
+def action_id(decision, value):
+    """The action id of choosing `value` at `decision`."""
+    return ACTION_INDEX[decision, value]
+
+def legal_mask(decision, options):
+    """Boolean mask over all NUM_ACTIONS of the options offered at a decision."""
+    mask = np.zeros(NUM_ACTIONS, dtype=bool)
+    for option in options:
+        mask[ACTION_INDEX[decision, option.value]] = True
+    return mask
+
+def legal_bitmask(game_state, decision, context=None):
+    """The legal actions at `decision` as an int with bit `action_id` set for each."""
+    bits = 0
+    for value in legal_values(game_state, decision, context):
+        bits |= ACTION_BITS[decision, value]
+    return bits
+
+def legal_action_ids(game_state, decision, context=None):
+    """The action ids legal at `decision`, in the order the phases offer them."""
+    return [ACTION_INDEX[decision, value] for value in legal_values(game_state, decision, context)]
+
+def legal_values(game_state, decision, context=None):
+    """The option values legal at `decision` in `game_state`, in the order the phases offer them.
+
+    Most decisions depend on the state alone. The rest take a `context`:
+    COMPANION_ROLE and MONSTER_TARGET the companion type being spent,
+    CHAMPION_TARGET the type the Champion already defeated (None for the first),
+    DRAGON_COMPANION the set of companion types already chosen, and
+    SCROLL_TARGET whether Dungeon dice may be picked (default True) or, while
+    re-rolling several dice at once, the Counter of dice still re-rollable.
+    LOOT_ACTION takes the (chests, potions) still unclaimed and defaults to the dungeon's.
+    """
+    return _ENUMERATORS[decision](game_state, context)
+
+def monster_specialty(hero_card):
+    """The monster_table specialty code of a hero card."""
+    if hero_card.__class__.__name__ != "MinstrelBardHero":
+        return SPECIALTY_NONE
+    return SPECIALTY_BARD if hero_card.current_rank == HeroRank.MASTER else SPECIALTY_MINSTREL
+
+def can_defeat_monsters(game_state, hero_card):
+    """Check if the party and companion treasures can defeat every monster in the dungeon.
+
+    Each companion treasure is counted as one more die of the face it acts as.
+    That is exact: in the Monster Phase a companion treasure defeats monsters
+    exactly as a die of its face does, under every specialty, and is spent the
+    same way, so the table needs no treasure axis.
+    """
+    party = game_state.party_counts
+    hoard = game_state.player_treasure.counts
+    dungeon = game_state.dungeon_counts
+    return can_defeat_counts(dungeon[GOBLIN], dungeon[SKELETON], dungeon[OOZE],
+                             party[FIGHTER] + hoard[VORPAL_SWORD], party[MAGE] + hoard[SCEPTER_OF_POWER],
+                             party[CLERIC] + hoard[TALISMAN], party[THIEF] + hoard[THIEVES_TOOLS],
+                             party[CHAMPION], monster_specialty(hero_card))
+
+def companion_values(game_state):
+    """Distinct Monster Phase companions: party faces except Scrolls, then companion treasures."""
+    party = game_state.party_counts
+    hoard = game_state.player_treasure.counts
+    return ([value for face, value in _PARTY_COMPANIONS if party[face]] +
+            [value for t, value in _TREASURE_COMPANIONS if hoard[t]])
+
+def chest_companion_values(game_state):
+    """Distinct companions that can open Chests: every party face, then companion treasures."""
+    party = game_state.party_counts
+    hoard = game_state.player_treasure.counts
+    return ([value for face, value in _PARTY_OPENERS if party[face]] +
+            [value for t, value in _TREASURE_COMPANIONS if hoard[t]])
+
+def dragon_companions(game_state):
+    """(value, companion type) of each distinct companion that can battle the Dragon."""
+    party = game_state.party_counts
+    hoard = game_state.player_treasure.counts
+    return ([(("party", face), face) for face in DRAGON_FACES if party[face]] +
+            [(value, COMPANION_TYPES[t]) for t, value in _TREASURE_COMPANIONS if hoard[t]])
+
+def dragon_companion_types(game_state):
+    """The distinct companion types available to battle the Dragon."""
+    party = game_state.party_counts
+    hoard = game_state.player_treasure.counts
+    types = {face for face in DRAGON_FACES if party[face]}
+    types.update(face for t, face in COMPANION_TYPES.items() if hoard[t])
+    return types
+
+def usable_treasures(game_state):
+    """Distinct treasure types held that would have an effect if used right now."""
+    hoard = game_state.player_treasure.counts
+    return [t for t in ACTIVE_TREASURES if hoard[t] and TreasureActions.can_use(game_state, t)]
+
+def reroll_values(game_state, include_dungeon=True):
+    """One re-roll target per distinct die face in play: Dungeon faces first, then party faces."""
+    values = []
+    if include_dungeon:
+        dungeon = game_state.dungeon_counts
+        values = [value for face, value in _DUNGEON_TARGETS if dungeon[face]]
+    party = game_state.party_counts
+    return values + [value for face, value in _PARTY_TARGETS if party[face]]
+
+def _monster_actions(game_state, context):
+    hero_card = game_state.selected_hero_card
+    actions = []
+    if game_state.party_counts[PartyDiceFace.SCROLL]:
+        actions.append("scroll")
+    if companion_values(game_state):
+        actions.append("companion")
+        if can_defeat_monsters(game_state, hero_card):
+            actions.append("auto")
+    if usable_treasures(game_state):
+        actions.append("treasure")
+    if hero_card.can_use_ultimate(game_state):
+        actions.append("ultimate")
+    actions.append("flee")
+    return actions
+
+def _companion_roles(game_state, companion_type):
+    other_type = PartyDiceFace.MAGE if companion_type == PartyDiceFace.THIEF else PartyDiceFace.THIEF
+    return [companion_type, other_type]
+
+def _monster_targets(game_state, companion_type):
+    group_type = GROUP_TYPES.get(companion_type)
+    dungeon = game_state.dungeon_counts
+    targets = []
+    for monster_type in MONSTER_FACES:
+        count = dungeon[monster_type]
+        if not count:
+            continue
+        if monster_type == group_type:
+            targets.insert(0, (monster_type, count))
+        else:
+            targets.append((monster_type, 1))
+    return targets
+
+def _champion_targets(game_state, first_type):
+    dungeon = game_state.dungeon_counts
+    if first_type is None:
+        return [monster_type for monster_type in MONSTER_FACES if dungeon[monster_type]]
+    return [monster_type for monster_type in MONSTER_FACES if dungeon[monster_type]] + [None]
+
+def _loot_actions(game_state, context):
+    if context is None:
+        context = (game_state.dungeon_counts[DungeonDiceFace.CHEST], game_state.dungeon_counts[DungeonDiceFace.POTION])
+    chests, potions = context
+    actions = []
+    if chests > 0 and chest_companion_values(game_state):
+        actions.append("chests")
+    if potions > 0 and game_state.party_size:
+        actions.append("potions")
+    if game_state.party_counts[PartyDiceFace.SCROLL]:
+        actions.append("scroll")
+    actions.append("end")
+    return actions
+
+def _dragon_actions(game_state, context):
+    actions = []
+    if len(dragon_companion_types(game_state)) >= 3 or game_state.party_counts[PartyDiceFace.SCROLL]:
+        actions.append("battle")
+    if usable_treasures(game_state):
+        actions.append("treasure")
+    actions.append("flee")
+    return actions
+
+def _dragon_companions(game_state, used_types):
+    used_types = used_types or ()
+    return [value for value, companion_type in dragon_companions(game_state)
+            if companion_type not in used_types] + [None]
+
+def _regroup_actions(game_state, context):
+    if game_state.party_counts[PartyDiceFace.SCROLL]:
+        return ["retire", "seek_glory", "scroll"]
+    return ["retire", "seek_glory"]
+
+def _scroll_targets(game_state, context):
+    if isinstance(context, dict):
+        return list(context) + [None]
+    return reroll_values(game_state, context is not False)
+
+def _party_faces(counts):
+    return [face for face in PARTY_FACES if counts[face]]
+
+# (face or treasure type, option value) pairs, in the order the phases list them
+_PARTY_COMPANIONS = tuple((face, ("party", face)) for face in COMPANION_FACES)
+_PARTY_OPENERS = tuple((face, ("party", face)) for face in PARTY_FACES)
+_TREASURE_COMPANIONS = tuple((t, ("treasure", t)) for t in COMPANION_TYPES)
+_DUNGEON_TARGETS = tuple((face, ("dungeon", face)) for face in DUNGEON_FACES)
+_PARTY_TARGETS = _PARTY_OPENERS
+
+_ENUMERATORS = {
+    Decision.MONSTER_ACTION: _monster_actions,
+    Decision.COMPANION: lambda game_state, context: companion_values(game_state) + [None],
+    Decision.COMPANION_ROLE: _companion_roles,
+    Decision.MONSTER_TARGET: _monster_targets,
+    Decision.CHAMPION_TARGET: _champion_targets,
+    Decision.LOOT_ACTION: _loot_actions,
+    Decision.CHEST_COMPANION: lambda game_state, context: chest_companion_values(game_state) + [None],
+    Decision.QUAFF_DIE: lambda game_state, context: _party_faces(game_state.party_counts) + [None],
+    Decision.POTION_FACE: lambda game_state, context: list(PARTY_FACES),
+    Decision.DRAGON_ACTION: _dragon_actions,
+    Decision.DRAGON_SCROLL: lambda game_state, context: [False, True],
+    Decision.DRAGON_COMPANION: _dragon_companions,
+    Decision.REGROUP_ACTION: _regroup_actions,
+    Decision.SCROLL_TARGET: _scroll_targets,
+    Decision.TREASURE: lambda game_state, context: usable_treasures(game_state) + [None],
+    Decision.ELIXIR_FACE: lambda game_state, context: list(PARTY_FACES),
+    Decision.REVIVE_DIE: lambda game_state, context: _party_faces(game_state.graveyard_counts),
+    Decision.DISCARD_TREASURE: lambda game_state, context: [t for t in TREASURE_TYPES if game_state.player_treasure.counts[t]],
+}
+
+ACTION_BITS = {action: 1 << index for index, action in enumerate(ACTIONS)}
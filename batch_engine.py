@@ -0,0 +1,646 @@
+import argparse
+import json
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from dice import PartyDiceFace, DungeonDiceFace, DIE_SIDES
+from delve_value import MAX_LEVEL, TOTAL_DICE, LEGEND_XP, roll_outcomes
+from hero import HeroRank
+from policy import Decision, RetireAtLevelPolicy
+from treasure import TreasureType, COMPANION_TREASURES, INITIAL_POOL, NUM_TREASURE_TYPES
+
+MAX_DELVES = 3
+XP_TO_MASTER = 5
+# Treasures the Archaeologist draws when forming the party and discards at the end of the game
+ARCHAEOLOGIST_DRAWS = 2
+ARCHAEOLOGIST_DISCARDS = 6
+
+HEROES = ("minstrel", "alchemist", "archaeologist")
+
+# Batch hero of each hero card class
+HERO_NAMES = {
+    "MinstrelBardHero": "minstrel",
+    "AlchemistThaumaturgeHero": "alchemist",
+    "ArchaeologistTombRaiderHero": "archaeologist",
+}
+
+# Regroup tables are indexed by [hero is master, level, companions in the party]
+REGROUP_TABLE_SHAPE = (2, MAX_LEVEL + 1, TOTAL_DICE + 1)
+
+FIGHTER, MAGE, CLERIC, THIEF, CHAMPION, SCROLL = PartyDiceFace
+GOBLIN, SKELETON, OOZE, DRAGON, CHEST, POTION = DungeonDiceFace
+
+# Faces that defeat single monsters and battle the Dragon, and the hoard column of the treasure acting as each
+KILLER_ORDER = (FIGHTER, MAGE, CLERIC, THIEF)
+KILLER_FACES = np.array(KILLER_ORDER)
+KILLER_TREASURES = np.array([COMPANION_TREASURES[face] for face in KILLER_ORDER])
+
+# The face that defeats any number of each monster type, in monster order
+GROUP_FACES = ((GOBLIN, FIGHTER), (SKELETON, CLERIC), (OOZE, MAGE))
+
+# Treasures that score other than 1 Experience at the end of the game
+SCALE, PORTAL = int(TreasureType.DRAGON_SCALE), int(TreasureType.TOWN_PORTAL)
+
+# Order the Archaeologist discards in: an odd Dragon Scale costs nothing, other treasures 1, Town Portals 2
+DISCARD_ORDER = tuple(t for t in range(NUM_TREASURE_TYPES) if t not in (SCALE, PORTAL)) + (SCALE, PORTAL)
+
+# Companions used up one per single monster, in this order
+SINGLE_ORDER = (THIEF, FIGHTER, CLERIC, MAGE)
+
+MONSTER_ORDER = (GOBLIN, SKELETON, OOZE)
+
+# Party faces that open every Chest, in the order they are given up
+CHEST_OPENERS = {
+    "minstrel": (THIEF, CHAMPION, MAGE),
+    "alchemist": (),
+    "archaeologist": (THIEF, CHAMPION),
+}
+
+# Below one drawing game in this many, treasure draws gather the drawing games' columns
+SPARSE_DRAWS = 4
+
+# Bytes per packed count vector: one per face, padded to a machine word
+PACKED_BYTES = 8
+
+def _roll_table():
+    """Face counts of every sequence of 0 to TOTAL_DICE rolls, one byte per face packed into a uint64.
+
+    Sequences of k dice are numbered 0 to 6**k - 1 and start at ROLL_OFFSETS[k].
+    """
+    tables, offsets, start = [], [], 0
+    for k in range(TOTAL_DICE + 1):
+        faces = np.indices((DIE_SIDES,) * k).reshape(k, DIE_SIDES ** k)
+        counts = np.zeros((DIE_SIDES ** k, PACKED_BYTES), dtype=np.uint8)
+        for face in range(DIE_SIDES):
+            counts[:, face] = (faces == face).sum(axis=0)
+        tables.append(counts.view(np.uint64).ravel())
+        offsets.append(start)
+        start += DIE_SIDES ** k
+    return np.concatenate(tables), np.array(offsets), DIE_SIDES ** np.arange(TOTAL_DICE + 1.0)
+
+ROLL_TABLE, ROLL_OFFSETS, ROLL_SEQUENCES = _roll_table()
+
+def roll_counts(rng, dice):
+    """Roll `dice[i]` six-sided dice for every game i. Returns a (6, games) int8 array of face counts.
+
+    Each game draws one number that picks a whole sequence of rolls, and a
+    table lookup turns the sequence into its face counts.
+    """
+    dice = dice.astype(np.intp)
+    sequence = (rng.random(len(dice)) * ROLL_SEQUENCES[dice]).astype(np.intp)
+    packed = ROLL_TABLE[ROLL_OFFSETS[dice] + sequence]
+    return np.ascontiguousarray(packed.view(np.int8).reshape(len(dice), PACKED_BYTES).T[:DIE_SIDES])
+
+# Result of a batch: per-game final scores and Experience, and totals over every delve
+BatchResult = namedtuple("BatchResult", ["scores", "experience", "delves_fled", "dragons_slain", "level_counts"])
+
+def end_game_experience(hoard):
+    """`PlayerTreasure.calculate_end_game_experience` of every game of a (treasure types, games) hoard array."""
+    scales = hoard[SCALE].astype(np.int16)
+    portals = hoard[PORTAL].astype(np.int16)
+    others = hoard.sum(axis=0, dtype=np.int16) - scales - portals
+    return (scales // 2) * 2 + portals * 2 + others
+
+def retire_at_level(level=3, min_companions=0):
+    """Regroup table that seeks glory below `level` while the party has at least `min_companions` companions.
+
+    Regroup tables are REGROUP_TABLE_SHAPE bool arrays; True means seek glory.
+    """
+    table = np.zeros(REGROUP_TABLE_SHAPE, dtype=bool)
+    table[:, :level, min_companions:] = True
+    return table
+
+class BatchEngine:
+    """Plays `n_games` games of one hero in lockstep, one NumPy array per state field.
+
+    Count vectors are stored face-major, (faces, games), so every face of every
+    game is one contiguous int8 row. Each phase is a few dozen masked array
+    operations over all games, whatever the batch size. The rules are those
+    `delve_value` models, played by a fixed policy:
+
+    - Monsters: each type goes to a party die that defeats the whole group, else
+      to the companion treasure acting as one, then to Champions (largest
+      groups first), then one by one to Thieves, Fighters, Clerics, Mages and
+      finally companion treasures. The Alchemist uses the ultimate when that is
+      not enough; the Minstrel uses it to banish a Dragon the party will lack
+      the companion types to battle.
+    - Loot: a Thief, a Champion or (for the Minstrel) a Mage opens every Chest.
+      Every Potion is quaffed with the least useful die, reviving the Dragon
+      companions the party lacks while Dragons wait and Champions otherwise.
+    - Dragon: battle with the three most plentiful companion types, else flee.
+    - Regroup: seek glory where `regroup_table` says so (see `retire_at_level`).
+
+    Scrolls, other treasures and the Archaeologist's ultimate are never used;
+    treasures are kept for their end-game value. `BatchRulesPolicy` plays the
+    same rules in the object engine.
+    All games share one random stream, so a batch is reproducible from its seed
+    but game i does not match game i of `simulate.py`.
+    """
+    def __init__(self, n_games, hero="minstrel", regroup_table=None, seed=None):
+        if hero not in HEROES:
+            raise ValueError(f"Unknown hero '{hero}'. Choose from: {', '.join(HEROES)}")
+        self.n = n_games
+        self.hero = hero
+        table = retire_at_level() if regroup_table is None else np.asarray(regroup_table, dtype=bool)
+        if table.shape != REGROUP_TABLE_SHAPE:
+            raise ValueError(f"A Regroup table must have shape {REGROUP_TABLE_SHAPE}, not {table.shape}")
+        self.table = table.ravel()
+        self.rng = np.random.default_rng(seed)
+
+        self.party = np.zeros((DIE_SIDES, n_games), dtype=np.int8)
+        self.dungeon = np.zeros((DIE_SIDES, n_games), dtype=np.int8)
+        self.hoard = np.zeros((NUM_TREASURE_TYPES, n_games), dtype=np.int8)
+        self.pool = np.repeat(np.array(INITIAL_POOL, dtype=np.int8)[:, None], n_games, axis=1)
+        self.graveyard = np.zeros(n_games, dtype=np.int8)
+        self.lair = np.zeros(n_games, dtype=np.int8)
+        self.level = np.ones(n_games, dtype=np.int8)
+        self.experience = np.zeros(n_games, dtype=np.int16)
+        self.dragons_slain = np.zeros(n_games, dtype=np.int16)
+        self.master = np.zeros(n_games, dtype=bool)
+        self.exhausted = np.zeros(n_games, dtype=bool)
+        self.delving = np.zeros(n_games, dtype=bool)
+
+        self.delves_fled = 0
+        self.level_counts = np.zeros(MAX_LEVEL + 1, dtype=np.int64)
+
+    def play(self):
+        """Play every game to the end. Returns a BatchResult."""
+        for _ in range(MAX_DELVES):
+            self.setup()
+            while self.delving.any():
+                self.play_level()
+            self.master |= self.experience >= XP_TO_MASTER
+        if self.hero == "archaeologist":
+            self.discard(ARCHAEOLOGIST_DISCARDS)
+        scores = self.experience + end_game_experience(self.hoard)
+        return BatchResult(scores, self.experience.copy(), self.delves_fled, int(self.dragons_slain.sum()),
+                           {level: int(count) for level, count in enumerate(self.level_counts) if count})
+
+    def setup(self):
+        """Form the party, refresh the hero and roll the first level's Dungeon die."""
+        self.party[:] = roll_counts(self.rng, np.full(self.n, TOTAL_DICE))
+        self.graveyard[:] = 0
+        self.lair[:] = 0
+        self.level[:] = 1
+        self.exhausted[:] = False
+        self.delving[:] = True
+        if self.hero == "archaeologist":
+            # Formation draws stop at an empty pool without gaining Experience
+            for _ in range(ARCHAEOLOGIST_DRAWS):
+                self.draw_treasure(self.delving & (self.pool.sum(axis=0, dtype=np.int8) > 0))
+        self.roll_dungeon(self.delving)
+
+    def roll_dungeon(self, rows):
+        """Roll min(level, dice not in the lair) Dungeon dice for `rows`; Dragons go to the lair."""
+        self.dungeon[:] = roll_counts(self.rng, np.minimum(self.level, TOTAL_DICE - self.lair) * rows)
+        self.lair += self.dungeon[DRAGON]
+        self.dungeon[DRAGON] = 0
+
+    def play_level(self):
+        """Monster, Loot, Dragon and Regroup Phases of the current level of every game still delving."""
+        self.monster_phase()
+        self.loot_phase()
+        self.dragon_phase()
+        self.regroup_phase()
+
+    def end_delve(self, rows, fled):
+        """End the delves of the games in bool mask `rows`."""
+        # Levels start at 1, so bin 0 collects the games not ending a delve
+        self.level_counts[1:] += np.bincount(self.level * rows, minlength=MAX_LEVEL + 1)[1:]
+        if fled:
+            self.delves_fled += int(np.count_nonzero(rows))
+        self.lair *= ~rows
+        self.delving &= ~rows
+
+    def fight(self, rows):
+        """Spend companions on every monster of `rows`.
+
+        Returns the party, the companion treasure rows of the hoard, the dice
+        spent and whether every monster fell, without committing anything.
+        """
+        party = self.party.copy()
+        treasures = self.hoard[KILLER_TREASURES]
+        spent = np.zeros(self.n, dtype=np.int8)
+        minstrel = self.hero == "minstrel"
+
+        left = []
+        for monster, face in GROUP_FACES:
+            count = self.dungeon[monster] * rows
+            # The Minstrel's Thieves (and Thieves' Tools) may be used as Mages
+            faces = (face, THIEF) if minstrel and monster == OOZE else (face,)
+            use = np.zeros(self.n, dtype=bool)
+            for group_face in faces:
+                die = (count > 0) & ~use & (party[group_face] > 0)
+                party[group_face] -= die
+                use |= die
+            spent += use
+            for group_face in faces:
+                treasure = treasures[KILLER_ORDER.index(group_face)]
+                token = (count > 0) & ~use & (treasure > 0)
+                treasure -= token
+                use |= token
+            left.append(count * ~use)
+
+        # Champions sweep the largest remaining groups; the Bard's sweep two types each
+        goblins, skeletons, oozes = left
+        total = goblins + skeletons + oozes
+        largest = np.maximum(np.maximum(goblins, skeletons), oozes)
+        smallest = np.minimum(np.minimum(goblins, skeletons), oozes)
+        middle = total - largest - smallest
+        types = (goblins > 0).view(np.int8) + (skeletons > 0) + (oozes > 0)
+        if minstrel:
+            bard = self.master.view(np.int8)
+            swept = np.minimum(types, party[CHAMPION] << bard)
+            champions = (swept + bard) >> bard
+        else:
+            swept = champions = np.minimum(types, party[CHAMPION])
+        party[CHAMPION] -= champions
+        spent += champions
+        singles = total - largest * (swept >= 1) - middle * (swept >= 2) - smallest * (swept >= 3)
+
+        # The rest one at a time, by party dice and then by companion treasures
+        for face in SINGLE_ORDER:
+            take = np.minimum(singles, party[face])
+            party[face] -= take
+            spent += take
+            singles -= take
+        for treasure in treasures:
+            take = np.minimum(singles, treasure)
+            treasure -= take
+            singles -= take
+        return party, treasures, spent, singles == 0
+
+    def monster_phase(self):
+        dungeon = self.dungeon
+        rows = self.delving & (dungeon[GOBLIN] + dungeon[SKELETON] + dungeon[OOZE] > 0)
+        if not rows.any():
+            return
+        party, treasures, spent, ok = self.fight(rows)
+        if self.hero == "minstrel":
+            # The ultimate banishes a Dragon the party will be short of companion types to battle
+            types = sum((party[face] > 0) | (treasure > 0) for face, treasure in zip(KILLER_FACES, treasures))
+            banish = rows & ok & ~self.exhausted & (self.lair >= 3) & (types < 3)
+            self.lair *= ~banish
+            self.exhausted |= banish
+        if self.hero == "alchemist":
+            # Healing Salve / Transformation Potion: roll dice from the Graveyard into the party and try again.
+            # The Monster Phase only offers it while the party or a companion treasure can still act.
+            companions = (self.party.sum(axis=0, dtype=np.int8) > 0) | (self.hoard[KILLER_TREASURES].sum(axis=0) > 0)
+            salve = rows & ~ok & ~self.exhausted & (self.graveyard > 0) & companions
+            if salve.any():
+                revived = np.minimum(1 + self.master, self.graveyard) * salve
+                self.party += roll_counts(self.rng, revived)
+                self.graveyard -= revived
+                self.exhausted |= salve
+                retry_party, retry_treasures, retry_spent, retry_ok = self.fight(salve)
+                party += (retry_party - party) * salve
+                treasures += (retry_treasures - treasures) * salve
+                spent += (retry_spent - spent) * salve
+                ok = (ok & ~salve) | (retry_ok & salve)
+        won = rows & ok
+        self.party += (party - self.party) * won
+        for kind, kept in zip(KILLER_TREASURES, treasures):
+            used = (self.hoard[kind] - kept) * won
+            self.hoard[kind] -= used
+            self.pool[kind] += used
+        self.graveyard += spent * won
+        self.end_delve(rows & ~ok, fled=True)
+
+    def loot_phase(self):
+        rows = self.delving
+        party = self.party
+        chests = self.dungeon[CHEST] * rows
+        potions = self.dungeon[POTION] * rows
+        if self.hero == "alchemist":
+            potions += chests
+            chests[:] = 0
+
+        # One opener per game opens every Chest
+        opened = np.zeros(self.n, dtype=bool)
+        for face in CHEST_OPENERS[self.hero]:
+            use = (chests > 0) & ~opened & (party[face] > 0)
+            party[face] -= use
+            self.graveyard += use
+            opened |= use
+        chests *= opened
+
+        # Quaff every Potion with the least useful die: a Scroll, then the most common companion, then a Champion
+        quaff = (potions > 0) & (party.sum(axis=0, dtype=np.int8) > 0)
+        if quaff.any():
+            common, most = np.full(self.n, FIGHTER, dtype=np.int8), party[FIGHTER]
+            for face in (MAGE, CLERIC, THIEF):
+                common += (face - common) * (party[face] > most)
+                most = np.maximum(most, party[face])
+            die = CHAMPION + (common - CHAMPION) * (most > 0)
+            die += (SCROLL - die) * (party[SCROLL] > 0)
+            for face in range(DIE_SIDES):
+                party[face] -= quaff & (die == face)
+            self.graveyard += quaff
+            revived = np.minimum(potions, self.graveyard) * quaff
+            self.graveyard -= revived
+            waiting = self.lair > 0
+            for face in (FIGHTER, MAGE, CLERIC):
+                give = (revived > 0) & waiting & (party[face] == 0)
+                party[face] += give
+                revived -= give
+            party[CHAMPION] += revived
+
+        for k in range(int(chests.max())):
+            self.draw_treasure(chests > k)
+
+    def dragon_phase(self):
+        games = np.flatnonzero(self.delving & (self.lair >= 3))
+        if not len(games):
+            return
+        dice = self.party[KILLER_FACES[:, None], games]
+        treasures = self.hoard[KILLER_TREASURES[:, None], games]
+        # Fight with party dice before treasures, the most plentiful types first
+        preference = np.where(dice > 0, 2 * TOTAL_DICE + dice, np.where(treasures > 0, 1, 0))
+        battle = (preference > 0).sum(axis=0) >= 3
+        fighters = games[battle]
+        chosen = np.argsort(-preference[:, battle], axis=0, kind="stable")[:3]
+        has_die = np.take_along_axis(dice[:, battle], chosen, axis=0) > 0
+        for kind, from_party in zip(chosen, has_die):
+            self.party[KILLER_FACES[kind], fighters] -= from_party
+            self.graveyard[fighters] += from_party
+            self.hoard[KILLER_TREASURES[kind], fighters] -= ~from_party
+            self.pool[KILLER_TREASURES[kind], fighters] += ~from_party
+        self.experience[fighters] += 1
+        self.dragons_slain[fighters] += 1
+        self.lair[fighters] = 0
+        won = np.zeros(self.n, dtype=bool)
+        won[fighters] = True
+        self.draw_treasure(won)
+
+        fled = np.zeros(self.n, dtype=bool)
+        fled[games[~battle]] = True
+        self.end_delve(fled, fled=True)
+
+    def regroup_phase(self):
+        rows = self.delving
+        legend = rows & (self.level == MAX_LEVEL)
+        self.experience += LEGEND_XP * legend
+        rows = rows & ~legend
+        party = self.party
+        companions = party[FIGHTER] + party[MAGE] + party[CLERIC] + party[THIEF] + party[CHAMPION]
+        index = (self.master * (MAX_LEVEL + 1) + self.level.astype(np.intp)) * (TOTAL_DICE + 1) + companions
+        seek = rows & self.table[index]
+        retire = rows & ~seek
+        self.experience += self.level * retire
+        self.end_delve(legend | retire, fled=False)
+        self.level += seek
+        self.roll_dungeon(seek)
+
+    def draw_treasure(self, rows):
+        """Draw one treasure for each game in bool mask `rows`, or gain 1 Experience from an empty pool."""
+        games = np.flatnonzero(rows)
+        if len(games) * SPARSE_DRAWS < self.n:
+            # Few games draw: work on their columns only
+            pool = self.pool[:, games]
+            size = pool.sum(axis=0, dtype=np.int8)
+            pick = (self.rng.random(len(games)) * size).astype(np.int8)
+            kind = np.zeros(len(games), dtype=np.intp)
+            for treasure in range(NUM_TREASURE_TYPES - 1):
+                pick -= pool[treasure]
+                kind += pick >= 0
+            drawn = size > 0
+            self.pool[kind[drawn], games[drawn]] -= 1
+            self.hoard[kind[drawn], games[drawn]] += 1
+            self.experience[games[~drawn]] += 1
+            return
+        pool = self.pool
+        size = pool.sum(axis=0, dtype=np.int8)
+        self.experience += rows & (size == 0)
+        pick = (self.rng.random(self.n) * size).astype(np.int8)
+        for treasure in range(NUM_TREASURE_TYPES):
+            drawn = rows & (pick >= 0) & (pick < pool[treasure])
+            pick -= pool[treasure]
+            pool[treasure] -= drawn
+            self.hoard[treasure] += drawn
+
+    def discard(self, count):
+        """Return up to `count` treasures of every game to the pool, the least valuable first."""
+        left = np.full(self.n, count, dtype=np.int8)
+        odd_scale = np.minimum(left, self.hoard[SCALE] % 2)
+        for kind, amount in [(SCALE, odd_scale)] + [(kind, None) for kind in DISCARD_ORDER]:
+            amount = np.minimum(left, self.hoard[kind]) if amount is None else amount
+            self.hoard[kind] -= amount
+            self.pool[kind] += amount
+            left -= amount
+
+# One companion of a BatchRulesPolicy Monster Phase plan: the option value, the face it acts as and its targets
+PlanStep = namedtuple("PlanStep", ["companion", "role", "targets"])
+
+class BatchRulesPolicy(RetireAtLevelPolicy):
+    """Plays the BatchEngine's fixed rules, decision by decision, in the object engine.
+
+    A BatchEngine run with `retire_at_level(level)` and games of this policy
+    follow the same rules, so their mean scores agree within sampling error.
+    The Monster Phase plan is recomputed at every Monster Phase action, and a
+    decision the batch rules never reach raises ValueError.
+    """
+    def __init__(self, seed=None, level=3):
+        super().__init__(seed, level)
+        self.step = None
+        self.targets = []
+        self.quaffed = None  # (delve, level) of the last Loot Phase that quaffed Potions
+
+    def choose(self, game_state, decision, options):
+        if decision == Decision.REGROUP_ACTION:
+            return super().choose(game_state, decision, options)
+        rule = getattr(self, decision.value, None)
+        if rule is None:
+            raise ValueError(f"The batch rules never make a {decision.value} decision")
+        values = [option.value for option in options]
+        choice = rule(game_state, values)
+        if choice not in values:
+            raise ValueError(f"The batch rules chose {choice!r}, which is not a legal {decision.value}")
+        return choice
+
+    @staticmethod
+    def hero_name(game_state):
+        return HERO_NAMES[game_state.selected_hero_card.__class__.__name__]
+
+    @staticmethod
+    def spend(party, hoard, companion):
+        """Take one `companion` (an option value) from the party or hoard counts, if there is one."""
+        source, kind = companion
+        counts = party if source == "party" else hoard
+        if not counts[kind]:
+            return False
+        counts[kind] -= 1
+        return True
+
+    @staticmethod
+    def plan(game_state):
+        """`BatchEngine.fight` for one game.
+
+        Returns the PlanSteps, whether every monster falls and the number of
+        Dragon companion types left afterwards.
+        """
+        hero = game_state.selected_hero_card
+        minstrel = hero.__class__.__name__ == "MinstrelBardHero"
+        bard = minstrel and hero.current_rank == HeroRank.MASTER
+        party = list(game_state.party_counts)
+        hoard = list(game_state.player_treasure.counts)
+        monsters = {monster: game_state.dungeon_counts[monster] for monster in MONSTER_ORDER}
+        steps = []
+
+        for monster, face in GROUP_FACES:
+            if not monsters[monster]:
+                continue
+            faces = (face, THIEF) if minstrel and monster == OOZE else (face,)
+            companions = [("party", f) for f in faces] + [("treasure", COMPANION_TREASURES[f]) for f in faces]
+            for companion in companions:
+                if BatchRulesPolicy.spend(party, hoard, companion):
+                    steps.append(PlanStep(companion, face, [(monster, monsters[monster])]))
+                    monsters[monster] = 0
+                    break
+
+        while party[CHAMPION] and any(monsters.values()):
+            largest = sorted((monster for monster in MONSTER_ORDER if monsters[monster]), key=lambda m: -monsters[m])
+            targets = largest[:2 if bard else 1]
+            party[CHAMPION] -= 1
+            steps.append(PlanStep(("party", CHAMPION), CHAMPION, targets))
+            for monster in targets:
+                monsters[monster] = 0
+
+        singles = ([(("party", face), face) for face in SINGLE_ORDER] +
+                   [(("treasure", COMPANION_TREASURES[face]), face) for face in KILLER_ORDER])
+        for companion, face in singles:
+            while any(monsters.values()) and BatchRulesPolicy.spend(party, hoard, companion):
+                monster = next(monster for monster in MONSTER_ORDER if monsters[monster])
+                steps.append(PlanStep(companion, face, [(monster, 1)]))
+                monsters[monster] -= 1
+
+        types = sum(1 for face in KILLER_ORDER if party[face] or hoard[COMPANION_TREASURES[face]])
+        return steps, not any(monsters.values()), types
+
+    def monster_action(self, game_state, values):
+        steps, ok, types = self.plan(game_state)
+        if "ultimate" in values:
+            hero = self.hero_name(game_state)
+            if hero == "alchemist" and not ok:
+                return "ultimate"
+            if hero == "minstrel" and ok and game_state.dragons_lair >= 3 and types < 3:
+                return "ultimate"
+        if not ok:
+            return "flee"
+        self.step = steps[0]
+        self.targets = list(self.step.targets)
+        return "companion"
+
+    def companion(self, game_state, values):
+        return self.step.companion
+
+    def companion_role(self, game_state, values):
+        return self.step.role
+
+    def monster_target(self, game_state, values):
+        return self.targets[0]
+
+    def champion_target(self, game_state, values):
+        return self.targets.pop(0) if self.targets else None
+
+    def revive_die(self, game_state, values):
+        return values[0]
+
+    def loot_action(self, game_state, values):
+        # The batch opens Chests once and then quaffs Potions once
+        party = game_state.party_counts
+        phase = (game_state.delve_count, game_state.level)
+        if self.quaffed == phase:
+            return "end"
+        if "chests" in values and any(party[face] for face in CHEST_OPENERS[self.hero_name(game_state)]):
+            return "chests"
+        if "potions" in values:
+            self.quaffed = phase
+            return "potions"
+        return "end"
+
+    def chest_companion(self, game_state, values):
+        party = game_state.party_counts
+        return next(("party", face) for face in CHEST_OPENERS[self.hero_name(game_state)] if party[face])
+
+    def quaff_die(self, game_state, values):
+        party = game_state.party_counts
+        if party[SCROLL]:
+            return SCROLL
+        common = max(KILLER_ORDER, key=lambda face: party[face])
+        return common if party[common] else CHAMPION
+
+    def potion_face(self, game_state, values):
+        party = game_state.party_counts
+        if game_state.dragons_lair:
+            for face in (FIGHTER, MAGE, CLERIC):
+                if not party[face]:
+                    return face
+        return CHAMPION
+
+    def dragon_action(self, game_state, values):
+        party = game_state.party_counts
+        hoard = game_state.player_treasure.counts
+        types = sum(1 for face in KILLER_ORDER if party[face] or hoard[COMPANION_TREASURES[face]])
+        return "battle" if types >= 3 else "flee"
+
+    def dragon_scroll(self, game_state, values):
+        return False
+
+    def dragon_companion(self, game_state, values):
+        # Party dice before treasures, the most plentiful types first
+        party = game_state.party_counts
+        hoard = game_state.player_treasure.counts
+        faces = [face for face in KILLER_ORDER
+                 if ("party", face) in values or ("treasure", COMPANION_TREASURES[face]) in values]
+        best = max(faces, key=lambda face: 2 * TOTAL_DICE + party[face] if party[face] else 1)
+        return ("party", best) if party[best] else ("treasure", COMPANION_TREASURES[best])
+
+    def discard_treasure(self, game_state, values):
+        hoard = game_state.player_treasure.counts
+        if hoard[SCALE] % 2:
+            return TreasureType(SCALE)
+        return TreasureType(next(kind for kind in DISCARD_ORDER if hoard[kind]))
+
+def play_batch(n_games, hero="minstrel", regroup_table=None, seed=None):
+    """Play `n_games` games with a BatchEngine. Returns its BatchResult."""
+    return BatchEngine(n_games, hero, regroup_table, seed).play()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many games in lockstep as NumPy arrays with a fixed policy.")
+    parser.add_argument("-n", "--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("--hero", choices=HEROES, default="minstrel")
+    parser.add_argument("--retire-at", type=int, default=3, help="seek glory until this level")
+    parser.add_argument("--min-companions", type=int, default=0, help="retire early with fewer companions than this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = play_batch(args.games, args.hero, retire_at_level(args.retire_at, args.min_companions), args.seed)
+    elapsed = time.perf_counter() - start
+    stats = {
+        "games": args.games,
+        "mean_score": float(result.scores.mean()),
+        "score_stdev": float(result.scores.std(ddof=1)) if args.games > 1 else 0.0,
+        "delves_fled": result.delves_fled,
+        "dragons_slain": result.dragons_slain,
+        "level_counts": result.level_counts,
+        "seconds": elapsed,
+        "delves_per_second": args.games * MAX_DELVES / elapsed,
+    }
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+    print(f"Games played:   {stats['games']}")
+    print(f"Mean score:     {stats['mean_score']:.3f} (stdev {stats['score_stdev']:.3f})")
+    print(f"Delves fled:    {stats['delves_fled']} of {args.games * MAX_DELVES}")
+    print(f"Dragons slain:  {stats['dragons_slain']}")
+    print("Levels reached: " + ", ".join(f"L{level}: {count}" for level, count in stats["level_counts"].items()))
+    print(f"Time:           {elapsed:.2f}s ({stats['delves_per_second']:,.0f} delves/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
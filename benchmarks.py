@@ -0,0 +1,155 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from actions import legal_bitmask
+from dice import DiceManager
+from engine import DelveEngine
+from game_record import capture_keyframe, restore_keyframe
+from game_state import GameState
+from monster_phase import MonsterPhase
+from policy import Decision, RandomPolicy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+from simulate import HEROES, play_one
+from treasure import TreasureManager
+
+# Every benchmark is seeded from this, so runs measure the same work
+BENCH_SEED = 2026
+
+# Games played to capture the corpus of Monster Phase states
+CORPUS_GAMES = 200
+
+class CapturingPolicy(RandomPolicy):
+    """Random player that keeps a keyframe of every Monster Phase decision it sees."""
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.captured = []
+
+    def choose(self, game_state, decision, options):
+        if decision == Decision.MONSTER_ACTION:
+            self.captured.append(capture_keyframe(game_state))
+        return super().choose(game_state, decision, options)
+
+def quiet(function):
+    """Run `function` with the game's output switched off."""
+    with rendering(SilentRenderer()):
+        return function()
+
+def measure(name, function, number, repeat, items=1):
+    """Time `repeat` batches of `number` calls. Reports per-item times in microseconds.
+
+    `items` is the number of items each call processes, e.g. the size of a corpus.
+    """
+    function()  # Warm up caches and lazily built tables
+    batches = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        batches.append((time.perf_counter() - start) / (number * items) * 1e6)
+    return {"name": name, "calls": number * items, "repeat": repeat,
+            "best_us": min(batches), "median_us": statistics.median(batches)}
+
+def monster_corpus(hero_name):
+    """(GameState, hero card, specialty active) at every Monster Phase decision of seeded random games."""
+    corpus = []
+    for game_id in range(CORPUS_GAMES):
+        rng = GameRandom(BENCH_SEED, game_id)
+        policy = CapturingPolicy(rng.policy_seed)
+        engine = DelveEngine(HEROES[hero_name](), policy, rng)
+        quiet(engine.play_game)
+        for keyframe in policy.captured:
+            state = GameState(GameRandom(BENCH_SEED, game_id))
+            state.selected_hero_card = HEROES[hero_name]()
+            restore_keyframe(state, keyframe)
+            corpus.append((state, state.selected_hero_card, hero_name == "minstrel"))
+    return corpus
+
+def run_benchmarks(scale=1.0):
+    """Run every benchmark and return the results as a list of dicts. `scale` multiplies the call counts."""
+    def count(n):
+        return max(1, int(n * scale))
+
+    results = []
+    dice = DiceManager(np.random.default_rng(BENCH_SEED))
+    results.append(measure("dice.roll_party_dice(7)", lambda: dice.roll_party_dice(7), count(20000), 5))
+    results.append(measure("dice.roll_dungeon_dice(1)", lambda: dice.roll_dungeon_dice(1), count(20000), 5))
+    results.append(measure("dice.roll_party_batch(10000, 7)", lambda: dice.roll_party_batch(10000, 7), count(200), 5))
+
+    for hero_name in HEROES:
+        corpus = monster_corpus(hero_name)
+
+        def check_corpus():
+            for state, hero_card, specialty_active in corpus:
+                MonsterPhase.can_defeat_monsters(state, hero_card)
+
+        def legal_corpus():
+            for state, _, _ in corpus:
+                legal_bitmask(state, Decision.MONSTER_ACTION)
+
+        def plan_corpus():
+            for state, hero_card, specialty_active in corpus:
+                MonsterPhase.plan_defeat(state, hero_card, specialty_active)
+
+        results.append(measure(f"can_defeat_monsters[{hero_name}]", check_corpus, count(20), 5, len(corpus)))
+        results.append(measure(f"plan_defeat[{hero_name}]", plan_corpus, count(20), 5, len(corpus)))
+        results.append(measure(f"legal_bitmask[{hero_name}]", legal_corpus, count(20), 5, len(corpus)))
+
+    treasure = TreasureManager(np.random.default_rng(BENCH_SEED))
+    results.append(measure("treasure draw + return", lambda: treasure.return_treasure(treasure.draw_treasure()),
+                           count(20000), 5))
+
+    # End-game scoring over the final states of seeded games
+    final_states = [quiet(lambda game_id=game_id: play_one(HEROES["archaeologist"], RandomPolicy, BENCH_SEED, game_id))[0].state
+                    for game_id in range(count(100))]
+    results.append(measure("calculate_final_score", lambda: [state.calculate_final_score() for state in final_states],
+                           count(200), 5, len(final_states)))
+
+    for hero_name, hero_class in HEROES.items():
+        games = iter(range(10 ** 9))
+
+        def one_delve():
+            rng = GameRandom(BENCH_SEED, next(games))
+            engine = DelveEngine(hero_class(), RandomPolicy(rng.policy_seed), rng)
+            quiet(engine.start_delve)
+
+        def one_game():
+            quiet(lambda: play_one(hero_class, RandomPolicy, BENCH_SEED, next(games)))
+
+        results.append(measure(f"delve[{hero_name}]", one_delve, count(200), 5))
+        results.append(measure(f"game[{hero_name}]", one_game, count(100), 5))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine's hot paths.")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("-o", "--output", help="also write the JSON results to this file")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the number of calls (e.g. 0.1 for a quick run)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "seed": BENCH_SEED,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": run_benchmarks(args.scale),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    for result in report["results"]:
+        print(f"{result['name']:40} {result['best_us']:12.2f} us/call (median {result['median_us']:.2f}, {result['calls']} calls)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
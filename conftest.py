@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: takes more than a few seconds")
@@ -0,0 +1,279 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, combinations_with_replacement
+
+import numpy as np
+
+from dice import PartyDiceFace, DungeonDiceFace, DIE_SIDES
+from hero import HeroRank
+from policy import GreedyPolicy
+from monster_solver import solve_monsters
+from monster_table import multisets, build_index, pack, RADIX
+from regroup_table import MAX_REGROUP_LAIR
+from delve_value import (MAX_LEVEL, TOTAL_DICE, LEGEND_XP, DRAGON_XP, TREASURE_XP, DRAGON_COMPANIONS,
+                         MINSTREL, ALCHEMIST, roll_outcomes)
+
+ARCHAEOLOGIST = "ArchaeologistTombRaiderHero"
+HERO_NAMES = (MINSTREL, ALCHEMIST, ARCHAEOLOGIST)
+
+DRAGON_DICE = 3
+
+# Faces worth reviving with a Potion. Scrolls are left out since the solver does not use them.
+REVIVE_FACES = (PartyDiceFace.FIGHTER, PartyDiceFace.MAGE, PartyDiceFace.CLERIC,
+                PartyDiceFace.THIEF, PartyDiceFace.CHAMPION)
+
+# Every party the solver can see: 1716 count vectors over all six faces with at most 7 dice.
+# Arrays over parties carry one extra sentinel row, NO_PARTY, for "no such party".
+PARTY_VECTORS = multisets(DIE_SIDES, TOTAL_DICE)
+PARTY_INDEX = build_index(PARTY_VECTORS)
+NUM_PARTIES = len(PARTY_VECTORS)
+NO_PARTY = NUM_PARTIES
+
+NO_TREASURES = (0,) * DIE_SIDES
+
+# Index of the hero's ultimate state on the exhausted axis
+READY, EXHAUSTED = 0, 1
+
+def party_row(party):
+    """Row of a party count vector in the solver's arrays."""
+    return PARTY_INDEX.item(pack(party))
+
+def monster_transitions(champion_types, swap):
+    """Party left after the cheapest win against every monster roll, as a (parties, 120) row array.
+
+    Fights that can't be won map to NO_PARTY.
+    """
+    solve = solve_monsters.__wrapped__  # Every pair is seen once, so skip the cache
+    transitions = np.full((NUM_PARTIES, RADIX ** 3), NO_PARTY, dtype=np.int32)
+    for row, party in enumerate(PARTY_VECTORS):
+        for goblins, skeletons, oozes in multisets(3, TOTAL_DICE):
+            monsters = (goblins, skeletons, oozes, 0, 0, 0)
+            plan = solve(monsters, party, NO_TREASURES, champion_types, swap)
+            if plan.feasible:
+                left = list(party)
+                for source, face, defeats in plan.steps:
+                    left[face] -= 1
+                transitions[row, pack(monsters[:3])] = party_row(left)
+    return transitions
+
+def quaff_options(party, potions):
+    """Every distinct party reachable by quaffing `potions` Potions with one die, including not quaffing."""
+    options = {party}
+    for quaffer, count in enumerate(party):
+        if not count:
+            continue
+        remaining = list(party)
+        remaining[quaffer] -= 1
+        revived = min(potions, TOTAL_DICE - sum(remaining))
+        for faces in combinations_with_replacement(REVIVE_FACES, revived):
+            option = list(remaining)
+            for face in faces:
+                option[face] += 1
+            options.add(tuple(option))
+    return sorted(options)
+
+def padded_rows(option_lists, pad=None):
+    """Stack ragged lists of party rows into one array, padding short rows with `pad` (default: their first entry)."""
+    width = max(len(options) for options in option_lists)
+    rows = np.empty((len(option_lists), width), dtype=np.int32)
+    for row, options in enumerate(option_lists):
+        rows[row] = options + [options[0] if pad is None else pad] * (width - len(options))
+    return rows
+
+def quaff_table():
+    """Party rows reachable by quaffing, one (parties, options) array per Potion count."""
+    tables = [np.arange(NUM_PARTIES, dtype=np.int32)[:, None]]
+    for potions in range(1, TOTAL_DICE + 1):
+        option_lists = [[party_row(option) for option in quaff_options(party, potions)] for party in PARTY_VECTORS]
+        tables.append(padded_rows(option_lists))
+    return tables
+
+def dragon_table():
+    """Party rows left after each way of battling the Dragon with 3 different companion types."""
+    option_lists = []
+    for party in PARTY_VECTORS:
+        options = []
+        for fighters in combinations([face for face in DRAGON_COMPANIONS if party[face]], DRAGON_DICE):
+            left = list(party)
+            for face in fighters:
+                left[face] -= 1
+            options.append(party_row(left))
+        option_lists.append(options or [NO_PARTY])
+    return padded_rows(option_lists, NO_PARTY)
+
+def revive_table(revives):
+    """Party rows and probabilities after an Alchemist ultimate rolls dice from the Graveyard into the party."""
+    option_lists, weight_lists = [], []
+    for party in PARTY_VECTORS:
+        revived = min(revives, TOTAL_DICE - sum(party))
+        outcomes = roll_outcomes(revived) if revived else ()
+        option_lists.append([party_row(tuple(p + r for p, r in zip(party, rolled))) for rolled, _ in outcomes] or [0])
+        weight_lists.append([probability for _, probability in outcomes])
+    rows = padded_rows(option_lists, 0)
+    weights = np.zeros(rows.shape)
+    for row, row_weights in enumerate(weight_lists):
+        weights[row, :len(row_weights)] = row_weights
+    return rows, weights
+
+def outcome_arrays(num_dice, chests_are_potions):
+    """Monster roll key, Dragons, Potions and probability of every distinct dungeon roll."""
+    outcomes = roll_outcomes(num_dice)
+    monsters = np.array([pack(dungeon[:3]) for dungeon, _ in outcomes])
+    dragons = np.array([dungeon[DungeonDiceFace.DRAGON] for dungeon, _ in outcomes])
+    potions = np.array([dungeon[DungeonDiceFace.POTION] + chests_are_potions * dungeon[DungeonDiceFace.CHEST]
+                        for dungeon, _ in outcomes])
+    probabilities = np.array([probability for _, probability in outcomes])
+    return monsters, dragons, potions, probabilities
+
+class DelveSolver:
+    """Backward induction over every delve state of one hero and rank: an approximate single-delve solver.
+
+    A state is taken at the Regroup Phase: (level, party count vector, dice in
+    the Dragon's Lair, ultimate exhausted). Level 0 stands for the start of a
+    delve, where the party must enter level 1. The Regroup choice, quaffing
+    and the faces revived, the Dragon's companions and the Minstrel's banish
+    are chosen optimally within the model, but the model is simpler than the
+    game: monsters are always defeated with the cheapest `solve_monsters`
+    plan, though another plan could leave a better party; the Alchemist's
+    ultimate is used only when the fight could not be won without it; the
+    Minstrel banishes only in a Monster Phase, as the engine offers it, so
+    never on a level without monsters; and companion treasures, Chests other
+    than the Alchemist's and Scrolls are not modelled. The values are
+    therefore estimates, and the choices a strong policy rather than the
+    optimal one.
+
+    Each level is solved for every state at once with NumPy, one array axis per
+    state component and the party axis indexed by multiset.
+    """
+    def __init__(self, hero, rank):
+        self.hero = hero
+        self.rank = rank
+        self.minstrel = hero == MINSTREL
+        self.alchemist = hero == ALCHEMIST
+        champion_types = 2 if self.minstrel and rank == HeroRank.MASTER else 1
+        self.monsters = monster_transitions(champion_types, self.minstrel)
+        self.quaffs = quaff_table()
+        self.dragons = dragon_table()
+        self.revives = revive_table(2 if rank == HeroRank.MASTER else 1) if self.alchemist else None
+
+    def after_loot(self, regroup, banish=False):
+        """Value after the Loot Phase by (lair, exhausted, party), from the next Regroup values.
+
+        `banish` is whether the Minstrel had the chance to banish the Dragon in this level's Monster Phase.
+        """
+        after = np.empty((TOTAL_DICE + 1, 2, NUM_PARTIES + 1))
+        after[:, :, NO_PARTY] = 0.0
+        after[:MAX_REGROUP_LAIR + 1, :, :NUM_PARTIES] = regroup
+
+        # Battle the Dragon with the best three companions, banish it or flee for nothing
+        battle = np.append(regroup[0], np.full((2, 1), -np.inf), axis=1)[:, self.dragons].max(axis=-1)
+        dragon = np.maximum(battle + DRAGON_XP + TREASURE_XP, 0.0)
+        if self.minstrel and banish:
+            dragon[READY] = np.maximum(dragon[READY], regroup[0, EXHAUSTED])
+        after[DRAGON_DICE:, :, :NUM_PARTIES] = dragon
+        return after
+
+    def best_loot(self, after):
+        """Value before the Loot Phase by (potions, lair, exhausted, party) when quaffing optimally."""
+        best = np.empty((TOTAL_DICE + 1,) + after.shape)
+        for potions, options in enumerate(self.quaffs):
+            best[potions, :, :, :NUM_PARTIES] = after[:, :, options].max(axis=-1)
+            best[potions, :, :, NO_PARTY] = 0.0
+        return best
+
+    def seek_values(self, level, loot, banish_loot):
+        """Expected value of seeking glory from every Regroup state of `level` by (lair, exhausted, party).
+
+        `banish_loot` replaces `loot` after rolls with monsters, when the Minstrel could banish the Dragon.
+        """
+        seek = np.empty((MAX_REGROUP_LAIR + 1, 2, NUM_PARTIES))
+        for lair in range(MAX_REGROUP_LAIR + 1):
+            num_dice = min(level + 1, TOTAL_DICE - lair)
+            monsters, dragons, potions, probabilities = outcome_arrays(num_dice, self.alchemist)
+            survivors = self.monsters[:, monsters]
+            fought = monsters != 0
+            values = [np.where(fought, banish_loot[potions, lair + dragons, exhausted, survivors],
+                               loot[potions, lair + dragons, exhausted, survivors]) for exhausted in (READY, EXHAUSTED)]
+            if self.alchemist:
+                # A lost fight can still be won after the ultimate revives dice from the Graveyard
+                rows, weights = self.revives
+                rescued = sum(weights[:, i, None] * values[EXHAUSTED][rows[:, i]] for i in range(rows.shape[1]))
+                lost = survivors == NO_PARTY
+                values[READY][lost] = rescued[lost]
+            for exhausted in (READY, EXHAUSTED):
+                seek[lair, exhausted] = values[exhausted] @ probabilities
+        return seek
+
+    def solve(self):
+        """Solve every state of the delve and return the DelvePolicy."""
+        shape = (MAX_LEVEL + 1, MAX_REGROUP_LAIR + 1, 2, NUM_PARTIES)
+        values = np.zeros(shape)
+        seek = np.zeros(shape, dtype=bool)
+        margins = np.zeros(shape)
+        values[MAX_LEVEL] = LEGEND_XP
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            loot = self.best_loot(self.after_loot(values[level + 1]))
+            banish_loot = self.best_loot(self.after_loot(values[level + 1], banish=True)) if self.minstrel else loot
+            seek_value = self.seek_values(level, loot, banish_loot)
+            margins[level] = seek_value - level
+            if level:
+                values[level] = np.maximum(seek_value, level)
+                seek[level] = seek_value > level
+            else:
+                values[level] = seek_value
+                seek[level] = True
+        return DelvePolicy(self.hero, self.rank, values, seek, margins)
+
+class DelvePolicy:
+    """Solved Regroup values and choices for one hero and rank. Level 0 is the start of a delve.
+
+    `margins` is the expected Experience of seeking glory minus retiring.
+    `regroup_table.write_table` writes the policies of every hero to the Regroup table.
+    """
+    def __init__(self, hero, rank, values, seek, margins):
+        self.hero = hero
+        self.rank = rank
+        self.values = values
+        self.seek = seek
+        self.margins = margins
+
+    def value(self, level, party, lair=0, exhausted=False):
+        """Expected Experience of the rest of the delve under the solved policy, in the solver's model."""
+        return float(self.values[level, lair, int(exhausted), party_row(party)])
+
+    def should_seek(self, level, party, lair=0, exhausted=False):
+        """Whether seeking glory beats retiring at this Regroup Phase."""
+        return bool(self.seek[level, lair, int(exhausted), party_row(party)])
+
+    @property
+    def start_value(self):
+        """Expected Experience of a whole delve, averaged over the starting party roll."""
+        return sum(probability * self.value(0, party) for party, probability in roll_outcomes(TOTAL_DICE))
+
+def solve_policy(hero, rank):
+    """Solve one hero and rank. Runs in a worker process."""
+    return DelveSolver(hero, rank).solve()
+
+def solve_all(workers=None):
+    """Solve every hero at both ranks across a process pool. Returns {(hero, rank): DelvePolicy}."""
+    jobs = [(hero, rank) for hero in HERO_NAMES for rank in HeroRank]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return {job: solve_policy(*job) for job in jobs}
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        return dict(zip(jobs, executor.map(solve_policy, *zip(*jobs))))
+
+class SolverPolicy(GreedyPolicy):
+    """Plays like GreedyPolicy but makes every Regroup choice from the memory-mapped Regroup table in `path`.
+
+    The table is solved by `DelveSolver`, so its choices are only as good as
+    that model. Companion treasures are not part of its key: a state with
+    treasures gets the choice of the same party dice holding none.
+    """
+    def __init__(self, seed=None, path=None):
+        super().__init__(seed)
+        from regroup_table import open_table
+        self.table = open_table(path)
+
+    def should_seek(self, game_state):
+        return self.table.should_seek(game_state)
@@ -0,0 +1,160 @@
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import factorial, prod
+
+from dice import PartyDiceFace, DungeonDiceFace, MONSTER_FACES, DUNGEON_FACES, DIE_SIDES
+from hero import HeroRank
+from monster_solver import solve_monsters
+
+MAX_LEVEL = 10
+TOTAL_DICE = 7
+LEGEND_XP = 10
+DRAGON_XP = 1
+# A treasure kept to the end of the game scores about one Experience token
+TREASURE_XP = 1
+
+# Regroup Phases looked ahead by default. Each extra one multiplies the work by up to 792 rolls.
+LOOKAHEAD = 1
+
+# Faces that can battle the Dragon
+DRAGON_COMPANIONS = (PartyDiceFace.FIGHTER, PartyDiceFace.MAGE, PartyDiceFace.CLERIC, PartyDiceFace.THIEF)
+
+MINSTREL, ALCHEMIST = "MinstrelBardHero", "AlchemistThaumaturgeHero"
+
+# Everything the rest of a delve depends on. `party` and `treasures` are count vectors
+# (treasures by the party face they act as); `hero` is the hero class name.
+DelveState = namedtuple("DelveState", ["level", "party", "graveyard", "lair", "treasures", "hero", "rank", "exhausted"])
+
+def delve_state(game_state, hero_card):
+    """Get the canonical DelveState of a game in progress."""
+    treasures = game_state.player_treasure.companion_counts()
+    return DelveState(game_state.level, tuple(game_state.party_counts), game_state.graveyard_size,
+                      game_state.dragons_lair, tuple(treasures), hero_card.__class__.__name__,
+                      hero_card.current_rank, hero_card.is_exhausted)
+
+def regroup_values(game_state, hero_card, depth=LOOKAHEAD):
+    """Estimated Experience from this delve for each Regroup choice: {"retire": ..., "seek_glory": ...}.
+
+    A heuristic, not a full expectimax: see `seek_glory_value`. `delve_policy`
+    solves the whole delve offline.
+    """
+    state = delve_state(game_state, hero_card)
+    return {"retire": float(state.level), "seek_glory": seek_glory_value(state, depth)}
+
+@lru_cache(maxsize=None)
+def roll_outcomes(num_dice):
+    """Every distinct roll of `num_dice` six-sided dice as (count vector, probability)."""
+    outcomes = []
+    for faces in combinations_with_replacement(range(DIE_SIDES), num_dice):
+        counts = tuple(faces.count(face) for face in range(DIE_SIDES))
+        ways = factorial(num_dice) // prod(factorial(count) for count in counts)
+        outcomes.append((counts, ways / DIE_SIDES ** num_dice))
+    return tuple(outcomes)
+
+@lru_cache(maxsize=1 << 18)
+def seek_glory_value(state, depth=LOOKAHEAD):
+    """Heuristic estimate of the Experience from this delve if the party seeks glory now.
+
+    Every dungeon roll of the next `depth` levels is averaged over, and at each
+    of the next `depth` Regroup Phases the party takes the better of retiring
+    and seeking glory again; after that it retires. Within a level the choices
+    are not searched: monsters are defeated with the cheapest `solve_monsters`
+    plan, Potions go to fixed faces and the Dragon is battled with the most
+    common companions. Chests and Scroll re-rolls are not valued, so the
+    estimate is somewhat pessimistic. Each extra level of depth multiplies the
+    work by up to 792 rolls, so depth 2 already takes most of a second.
+    """
+    num_dice = min(state.level + 1, TOTAL_DICE - state.lair)
+    return sum(probability * _after_roll(state, dungeon, depth)
+               for dungeon, probability in roll_outcomes(num_dice))
+
+def continue_value(state, depth):
+    """Expected Experience from the Regroup Phase on: the better of retiring and seeking glory."""
+    if state.level >= MAX_LEVEL:
+        return LEGEND_XP
+    if depth <= 1:
+        return state.level
+    return max(state.level, seek_glory_value(state, depth - 1))
+
+def _after_roll(state, dungeon, depth):
+    """Expected Experience once the next level's dungeon dice show `dungeon`."""
+    party, treasures = list(state.party), list(state.treasures)
+    graveyard, exhausted = state.graveyard, state.exhausted
+    lair = state.lair + dungeon[DungeonDiceFace.DRAGON]
+    bonus = 0
+
+    # Monster Phase
+    monsters = tuple(dungeon[face] if face in MONSTER_FACES else 0 for face in DUNGEON_FACES)
+    if any(monsters):
+        swap = state.hero == MINSTREL
+        champion_types = 2 if swap and state.rank == HeroRank.MASTER else 1
+        plan = solve_monsters(monsters, tuple(party), tuple(treasures), champion_types, swap)
+        if not plan.feasible and state.hero == ALCHEMIST and not exhausted and graveyard:
+            # Healing Salve / Transformation Potion: roll dice from the Graveyard into the party
+            revived = min(2 if state.rank == HeroRank.MASTER else 1, graveyard)
+            return sum(probability * _after_roll(
+                           state._replace(party=tuple(p + r for p, r in zip(party, rolled)),
+                                          graveyard=graveyard - revived, exhausted=True), dungeon, depth)
+                       for rolled, probability in roll_outcomes(revived))
+        if not plan.feasible:
+            return 0
+        for source, face, defeats in plan.steps:
+            if source == "party":
+                party[face] -= 1
+                graveyard += 1
+            else:
+                treasures[face] -= 1
+                bonus -= TREASURE_XP
+
+    # Loot Phase: quaff every Potion, using the least useful die
+    potions = dungeon[DungeonDiceFace.POTION]
+    if state.hero == ALCHEMIST:
+        potions += dungeon[DungeonDiceFace.CHEST]  # All Chests become Potions
+    if potions and sum(party):
+        quaffer = _least_useful(party)
+        party[quaffer] -= 1
+        graveyard += 1
+        for _ in range(min(potions, graveyard)):
+            party[_potion_face(party, lair)] += 1
+            graveyard -= 1
+
+    # Dragon Phase: battle if possible, otherwise the party flees. The Minstrel may have banished the
+    # Dragon with the ultimate instead, but that is only offered while monsters remain in the Monster Phase.
+    if lair >= 3:
+        types = sorted((face for face in DRAGON_COMPANIONS if party[face] or treasures[face]),
+                       key=lambda face: -party[face])
+        if len(types) >= 3:
+            for face in types[:3]:
+                if party[face]:
+                    party[face] -= 1
+                    graveyard += 1
+                else:
+                    treasures[face] -= 1
+                    bonus -= TREASURE_XP
+            bonus += DRAGON_XP + TREASURE_XP
+            lair = 0
+        elif state.hero == MINSTREL and not exhausted and any(monsters):
+            lair, exhausted = 0, True
+        else:
+            return bonus
+
+    return bonus + continue_value(DelveState(state.level + 1, tuple(party), graveyard, lair, tuple(treasures),
+                                             state.hero, state.rank, exhausted), depth)
+
+def _least_useful(party):
+    """The party face to give up first: a Scroll, then the most common companion, then a Champion."""
+    if party[PartyDiceFace.SCROLL]:
+        return PartyDiceFace.SCROLL
+    companions = [face for face in DRAGON_COMPANIONS if party[face]]
+    if companions:
+        return max(companions, key=lambda face: party[face])
+    return PartyDiceFace.CHAMPION
+
+def _potion_face(party, lair):
+    """The face to give a revived die: a missing Dragon companion type while Dragons wait, else a Champion."""
+    if lair:
+        for face in DRAGON_COMPANIONS[:3]:
+            if not party[face]:
+                return face
+    return PartyDiceFace.CHAMPION
@@ -1,32 +1,107 @@
-import random
-from enum import Enum
-
-class PartyDiceFace(Enum):
-    FIGHTER = "Fighter"
-    MAGE = "Mage"
-    CLERIC = "Cleric"
-    THIEF = "Thief"
-    CHAMPION = "Champion"
-    SCROLL = "Scroll"
-
-class DungeonDiceFace(Enum):
-    GOBLIN = "Goblin"
-    SKELETON = "Skeleton"
-    OOZE = "Ooze"
-    DRAGON = "Dragon"
-    CHEST = "Chest"
-    POTION = "Potion"
+import numpy as np
+from enum import IntEnum
+
+class DieFace(IntEnum):
+    """A die face stored as a small int. Converts to its display name only when printed."""
+    @property
+    def label(self):
+        return self.name.capitalize()
+
+    def __str__(self):
+        return self.label
+
+    def __format__(self, format_spec):
+        return format(self.label, format_spec)
+
+    # Hash like the plain int so faces and ints are interchangeable dict keys, at C speed
+    __hash__ = int.__hash__
+
+class PartyDiceFace(DieFace):
+    FIGHTER = 0
+    MAGE = 1
+    CLERIC = 2
+    THIEF = 3
+    CHAMPION = 4
+    SCROLL = 5
+
+class DungeonDiceFace(DieFace):
+    GOBLIN = 0
+    SKELETON = 1
+    OOZE = 2
+    DRAGON = 3
+    CHEST = 4
+    POTION = 5
+
+MONSTER_FACES = (DungeonDiceFace.GOBLIN, DungeonDiceFace.SKELETON, DungeonDiceFace.OOZE)
+
+# Faces in die order, so a rolled index is also the face's value
+PARTY_FACES = tuple(PartyDiceFace)
+DUNGEON_FACES = tuple(DungeonDiceFace)
+DIE_SIDES = 6
+
+# Number of die rolls generated at a time to serve single-die calls
+ROLL_BUFFER_SIZE = 1024
 
 class DiceManager:
-    @staticmethod
-    def roll_party_dice(num_dice=7):
+    """Rolls dice from its own NumPy `Generator`, so every game can have an independent stream."""
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._roll_buffer = []
+        self._roll_pos = 0
+        self.recorder = None  # Optional GameRecorder told about every roll
+
+    def seed(self, seed=None):
+        """Reseed the dice and discard any pre-rolled results."""
+        self.rng = np.random.default_rng(seed)
+        self._roll_buffer = []
+        self._roll_pos = 0
+
+    def stream_state(self):
+        """The generator state and the pre-rolled results not used yet, for `resume_stream`."""
+        return self.rng.bit_generator.state, self._roll_buffer[self._roll_pos:]
+
+    def resume_stream(self, rng, stream_state):
+        """Roll from `rng` set to a `stream_state()`, repeating the rolls that followed it."""
+        rng.bit_generator.state, self._roll_buffer = stream_state
+        self.rng = rng
+        self._roll_pos = 0
+
+    def roll_party_batch(self, n_games, num_dice=7):
+        """Roll `num_dice` party dice for each of `n_games` games.
+
+        Returns a (n_games, num_dice) uint8 array of indices into PARTY_FACES.
+        """
+        return self.rng.integers(0, len(PARTY_FACES), size=(n_games, num_dice), dtype=np.uint8)
+
+    def roll_dungeon_batch(self, n_games, num_dice=1):
+        """Roll `num_dice` dungeon dice for each of `n_games` games.
+
+        Returns a (n_games, num_dice) uint8 array of indices into DUNGEON_FACES.
+        """
+        return self.rng.integers(0, len(DUNGEON_FACES), size=(n_games, num_dice), dtype=np.uint8)
+
+    def _roll_indices(self, num_dice):
+        """Take `num_dice` six-sided rolls from the pre-rolled buffer, refilling it in bulk."""
+        end = self._roll_pos + num_dice
+        if end > len(self._roll_buffer):
+            refill = self.rng.integers(0, DIE_SIDES, size=max(ROLL_BUFFER_SIZE, num_dice), dtype=np.uint8)
+            self._roll_buffer = self._roll_buffer[self._roll_pos:] + refill.tolist()
+            self._roll_pos = 0
+            end = num_dice
+        rolls = self._roll_buffer[self._roll_pos:end]
+        self._roll_pos = end
+        return rolls
+
+    def roll_party_dice(self, num_dice=7):
         """Roll the party dice."""
-        party_faces = [face.value for face in PartyDiceFace]
-        return [random.choice(party_faces) for _ in range(num_dice)]
-    
-    @staticmethod
-    def roll_dungeon_dice(num_dice=1):
+        rolls = self._roll_indices(num_dice)
+        if self.recorder is not None:
+            self.recorder.party_roll(rolls)
+        return [PARTY_FACES[i] for i in rolls]
+
+    def roll_dungeon_dice(self, num_dice=1):
         """Roll the dungeon dice."""
-        dungeon_faces = [face.value for face in DungeonDiceFace]
-        result = [random.choice(dungeon_faces) for _ in range(num_dice)]
-        return result 
\ No newline at end of file
+        rolls = self._roll_indices(num_dice)
+        if self.recorder is not None:
+            self.recorder.dungeon_roll(rolls)
+        return [DUNGEON_FACES[i] for i in rolls]
@@ -0,0 +1,313 @@
+from collections import namedtuple
+from game_state import GameState
+from phases import MonsterPhase, LootPhase, DragonPhase, RegroupPhase
+from treasure import TreasureType
+from hero import HeroRank
+from policy import Decision
+from render import say, display
+
+# Outcome of one delve: the dungeon level it ended on and whether the party fled
+DelveResult = namedtuple("DelveResult", ["level", "fled"])
+
+# Phases of a delve that offer an action menu, in play order
+PHASES = ("monster", "loot", "dragon", "regroup")
+
+# Decisions that open a phase's action menu. The engine can resume a restored game at each of them.
+MENU_PHASES = {
+    Decision.MONSTER_ACTION: "monster",
+    Decision.LOOT_ACTION: "loot",
+    Decision.DRAGON_ACTION: "dragon",
+    Decision.REGROUP_ACTION: "regroup",
+}
+
+# Where a game can be resumed: an action menu, with the game's Keyframe and its dice and
+# treasure streams (`stream_state()`) as they were there
+Anchor = namedtuple("Anchor", ["phase", "keyframe", "dice", "treasure"])
+
+class DelveEngine:
+    """Runs the game rules, asking a `Policy` for every decision.
+
+    The engine never reads from the terminal, so it can play complete games
+    headlessly; the interactive game is the same engine driven by a CLIPolicy.
+    """
+    MAX_DELVES = 3
+    MAX_PARTY_DICE = 7
+    MAX_DUNGEON_DICE = 7
+    MAX_LEVEL = 10
+
+    def __init__(self, hero_card=None, policy=None, rng=None, recorder=None, stats=None):
+        self.state = GameState(rng)
+        self.state.selected_hero_card = hero_card
+        self.dice_manager = self.state.dice
+        self.policy = policy
+        self.recorder = recorder
+        if recorder is not None:
+            from game_record import RecordingPolicy
+            self.policy = RecordingPolicy(policy, recorder)
+            self.state.dice.recorder = recorder
+            self.state.treasure_manager.recorder = recorder
+        self.stats = stats
+        self.delve_results = []
+
+    def run_phase(self, phase, function, *args):
+        """Call one phase, timing it when a PhaseStats is attached."""
+        if self.stats is None:
+            return function(*args)
+        return self.stats.timed(phase, function, *args)
+
+    def used_town_portal(self, portals):
+        """Whether a Town Portal ended the last phase. `portals` is the number held before it."""
+        return self.state.player_treasure.count_treasure_type(TreasureType.TOWN_PORTAL) < portals
+
+    def end_delve(self, outcome):
+        """Count how the delve ended."""
+        if self.stats is not None:
+            self.stats.outcome(outcome)
+
+    def phase_complete(self, phase_name):
+        """Hook called between phases. The interactive game pauses here."""
+        pass
+
+    def play_game(self):
+        """Play all delves and return the final score."""
+        # Initialize game state
+        self.state.delve_count = 0
+        self.state.level = 1
+        self.state.reset_dice()
+        self.state.treasure_tokens = 0
+        self.state.experience_tokens = 0
+        self.state.dragons_slain = 0
+        self.delve_results = []
+        return self.play_remaining_delves()
+
+    def resume_game(self, phase):
+        """Finish a game restored in the middle of a delve, at the action menu of `phase`.
+
+        `phase` is "monster", "loot", "dragon" or "regroup", or None for the start of
+        a level, where game records take their keyframes. Tree search restores a
+        keyframe into `state` and calls this to play out the rest of the game.
+        Returns the final score.
+        """
+        self.play_delve(phase)
+        self.finish_delve()
+        return self.play_remaining_delves()
+
+    def play_remaining_delves(self):
+        """Play delves until the last one is over, then score the game."""
+        # Main game loop - 3 delves
+        while self.state.delve_count < self.MAX_DELVES:
+            self.start_delve()
+            self.finish_delve()
+
+        score = self.run_phase("end_game", self.end_game)
+        if self.recorder is not None:
+            self.recorder.keyframe(self.state)
+        return score
+
+    def finish_delve(self):
+        """Level the hero up, show the summary and pause between delves."""
+        # Check for hero level up between delves
+        if (self.state.selected_hero_card.current_rank == HeroRank.NOVICE and
+            self.state.experience_tokens >= self.state.selected_hero_card.xp_to_expert):
+            self.state.selected_hero_card.check_level_up(self.state.experience_tokens)
+
+        # Show progress after each delve
+        self.show_delve_summary()
+
+        # Pause between delves (except after the last one)
+        if self.state.delve_count < self.MAX_DELVES:
+            self.phase_complete("Delve")
+
+    @display
+    def show_delve_summary(self):
+        """Print the Experience and treasure collected so far."""
+        say(f"\n📊 End of Delve {self.state.delve_count} Summary:")
+        say(f"🌟 Experience: {self.state.experience_tokens} tokens")
+        say(f"💎 Treasure: {self.state.treasure_tokens} tokens")
+        self.state.display_treasure_info()
+
+    def end_game(self):
+        """Handle end game scoring and final display. Returns the final score."""
+        say("\n" + "="*40)
+        say("GAME OVER - FINAL SCORING")
+        say("="*40)
+
+        # Apply hero's end-game specialty
+        if self.state.selected_hero_card:
+            self.state.selected_hero_card.apply_end_game_specialty(self.state, self.policy)
+
+        final_score = self.state.calculate_final_score()
+        self.show_final_score(final_score)
+        return final_score
+
+    @display
+    def show_final_score(self, final_score):
+        """Print the hero's final state and the score breakdown."""
+        # Display hero final state
+        say(f"\nFinal Hero State:")
+        say(f"Hero: {self.state.selected_hero_card.name}")
+        say(f"Rank: {self.state.selected_hero_card.current_rank.value}")
+
+        # Display base experience
+        say(f"\nBase Experience: {self.state.experience_tokens} tokens")
+
+        # Display treasure scoring details
+        say("\nTreasure Scoring:")
+        treasures = self.state.get_available_treasures()
+
+        # Count Dragon Scales
+        dragon_scales = self.state.player_treasure.count_treasure_type(TreasureType.DRAGON_SCALE)
+        if dragon_scales > 0:
+            pairs = dragon_scales // 2
+            say(f"Dragon Scale pairs: {pairs} (Worth {pairs * 2} Experience)")
+
+        # Count Town Portals
+        town_portals = self.state.player_treasure.count_treasure_type(TreasureType.TOWN_PORTAL)
+        if town_portals > 0:
+            say(f"Unused Town Portals: {town_portals} (Worth {town_portals * 2} Experience)")
+
+        # Count other treasures
+        other_treasures = len(treasures) - dragon_scales - town_portals
+        if other_treasures > 0:
+            say(f"Other unused treasures: {other_treasures} (Worth {other_treasures} Experience)")
+
+        # Calculate and display final score
+        treasure_exp = self.state.player_treasure.calculate_end_game_experience()
+
+        say("\nFinal Score Breakdown:")
+        say(f"Base Experience:     {self.state.experience_tokens}")
+        say(f"Treasure Bonuses:    {treasure_exp}")
+        say(f"{'='*20}")
+        say(f"FINAL SCORE:        {final_score}")
+
+        # Display achievement message based on score
+        if final_score >= 30:
+            say("\nLEGENDARY! You are truly a master of the dungeon!")
+        elif final_score >= 20:
+            say("\nIMPRESSIVE! You've proven yourself a worthy adventurer!")
+        elif final_score >= 10:
+            say("\nGOOD EFFORT! You're learning the ways of the dungeon.")
+        else:
+            say("\nYou've survived to tell the tale. Better luck next time!")
+
+    def start_delve(self):
+        """Start a new delve (one game round) with proper setup. Returns True if the party fled."""
+        self.state.delve_count += 1
+
+        # Setup phase
+        self.run_phase("setup", self.setup_delve)
+
+        # Pause after Setup Phase
+        self.phase_complete("Setup")
+        return self.play_delve()
+
+    def play_delve(self, resume_phase=None):
+        """Play the phases of the current delve until it ends. Returns True if the party fled.
+
+        With `resume_phase`, the first pass starts at that phase's action menu
+        (see `resume_game`) and skips the phases before it.
+        """
+        hero_card = self.state.selected_hero_card
+        skip = PHASES.index(resume_phase) if resume_phase else 0
+
+        # Continue until the delve is over (player chooses to end or fails)
+        fled = False
+        delve_active = True
+        while delve_active:
+            if self.recorder is not None and not skip:
+                self.recorder.keyframe(self.state)
+
+            # Town Portals held, to tell a Town Portal from fleeing when the delve ends
+            portals = self.state.player_treasure.count_treasure_type(TreasureType.TOWN_PORTAL)
+
+            # Monster Phase
+            if skip <= 0:
+                monster = MonsterPhase.resolve if resume_phase == "monster" else MonsterPhase.execute
+                monster_result = self.run_phase("monster", monster, self.state, hero_card, self.policy)
+                if not monster_result:
+                    fled = not self.used_town_portal(portals)
+                    if fled:
+                        say("The monsters were too powerful! Delve ends.")
+                    # Clear dragon's lair when leaving the dungeon
+                    if self.state.dragons_lair:
+                        dragon_count = self.state.dragons_lair
+                        self.state.dragons_lair = 0
+                        say(f"{dragon_count} Dragon dice returned to the available pool.")
+                    self.end_delve("fled_monsters" if fled else "town_portal")
+                    break
+
+                # Pause after Monster Phase
+                self.phase_complete("Monster")
+
+            # Loot Phase
+            if skip <= 1:
+                loot = LootPhase.collect if resume_phase == "loot" else LootPhase.execute
+                self.run_phase("loot", loot, self.state, self.policy)
+
+                # Pause after Loot Phase
+                self.phase_complete("Loot")
+
+            # Dragon Phase if dragons are present
+            if skip <= 2 and self.state.dragons_lair:
+                dragon_result = self.run_phase("dragon", DragonPhase.execute, self.state, hero_card, self.policy)
+                if not dragon_result:
+                    # Dragon phase might end the delve based on the result
+                    # Clear dragon's lair when fleeing or ending delve
+                    fled = not self.used_town_portal(portals)
+                    dragon_count = self.state.dragons_lair
+                    self.state.dragons_lair = 0
+                    if fled:
+                        say(f"\nThe dragons return to the available pool as you flee the dungeon!")
+                    say(f"{dragon_count} Dragon dice returned to the available pool.")
+                    self.end_delve("fled_dragon" if fled else "town_portal")
+                    break
+
+                # Pause after Dragon Phase (only if it occurred)
+                self.phase_complete("Dragon")
+
+            # Regroup Phase - player decides whether to continue or end delve
+            regroup_result = self.run_phase("regroup", RegroupPhase.execute, self.state, hero_card, self.policy)
+            if not regroup_result:
+                if self.used_town_portal(portals):
+                    self.end_delve("town_portal")
+                else:
+                    self.end_delve("stuff_of_legend" if self.state.level == self.MAX_LEVEL else "retired")
+                say("You've chosen to end this delve.")
+                delve_active = False
+            skip = 0
+            resume_phase = None
+
+        self.delve_results.append(DelveResult(self.state.level, fled))
+        return fled
+
+    def setup_delve(self):
+        """Set up for a new delve (one game round) with proper setup."""
+        say("\n--- SETUP PHASE ---")
+        say(f"🗡️  DELVE {self.state.delve_count} OF {self.MAX_DELVES}  🗡️")
+
+        # Step 1: Roll all 7 Party Dice
+        say("Rolling 7 Party Dice to form your starting party...")
+        self.state.reset_dice()
+        self.state.add_party_dice(self.dice_manager.roll_party_dice(self.MAX_PARTY_DICE))
+
+        # Step 2: Apply hero's formation specialty
+        if self.state.selected_hero_card:
+            self.state.selected_hero_card.apply_formation_specialty(self.state)
+
+        # Step 3: Refresh Hero Card if exhausted
+        if self.state.selected_hero_card and self.state.selected_hero_card.is_exhausted:
+            self.state.selected_hero_card.refresh()
+
+        # Step 4: Set Level Die to 1
+        self.state.level = 1
+        say("Dungeon Level set to 1")
+
+        # Step 5: Roll 1 Dungeon Die to populate the dungeon
+        say("Rolling 1 Dungeon Die to populate the dungeon...")
+        self.roll_dungeon_dice(1)
+
+    def roll_dungeon_dice(self, num_dice=1):
+        """Roll dungeon dice into the dungeon, handling dragons specially."""
+        dragons = self.state.add_dungeon_dice(self.dice_manager.roll_dungeon_dice(num_dice))
+        for _ in range(dragons):
+            say("A Dragon appears! The die moves to the Dragon's Lair.")
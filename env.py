@@ -0,0 +1,290 @@
+import pickle
+import threading
+import traceback
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from queue import SimpleQueue
+
+import numpy as np
+
+from actions import ACTIONS, NUM_ACTIONS, legal_mask
+from dice import DIE_SIDES
+from engine import DelveEngine
+from hero import HeroRank
+from policy import Decision, Policy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+from simulate import HEROES
+from treasure import NUM_TREASURE_TYPES
+
+DECISIONS = tuple(Decision)
+HERO_CLASSES = tuple(HEROES.values())
+
+# Observation layout: party, graveyard and dungeon counts, treasure hoard and pool counts,
+# then the scalars, the hero class and the decision being made, one-hot
+OBSERVATION_FIELDS = (
+    ("party", DIE_SIDES), ("graveyard", DIE_SIDES), ("dungeon", DIE_SIDES),
+    ("hoard", NUM_TREASURE_TYPES), ("pool", NUM_TREASURE_TYPES),
+    ("lair", 1), ("level", 1), ("delve", 1), ("experience", 1), ("dragons_slain", 1),
+    ("master", 1), ("exhausted", 1), ("hero", len(HERO_CLASSES)), ("decision", len(DECISIONS)),
+)
+OBSERVATION_SIZE = sum(size for _, size in OBSERVATION_FIELDS)
+
+def encode_observation(game_state, decision, out=None):
+    """Write the fixed-length float32 encoding of a game state and the decision being made into `out`."""
+    if out is None:
+        out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+    else:
+        out[:] = 0
+    hero = game_state.selected_hero_card
+    values = (game_state.party_counts + game_state.graveyard_counts + game_state.dungeon_counts +
+              game_state.player_treasure.counts + game_state.treasure_manager.pool_counts +
+              [game_state.dragons_lair, game_state.level, game_state.delve_count, game_state.experience_tokens,
+               game_state.dragons_slain, hero.current_rank == HeroRank.MASTER, hero.is_exhausted])
+    out[:len(values)] = values
+    out[len(values) + HERO_CLASSES.index(type(hero))] = 1
+    if decision is not None:
+        out[len(values) + len(HERO_CLASSES) + DECISIONS.index(decision)] = 1
+    return out
+
+class _Abandon(BaseException):
+    """Unwinds an engine thread whose episode was reset or closed before the game ended."""
+
+class HandoffPolicy(Policy):
+    """Passes every decision to the environment and waits for the chosen option value."""
+    def __init__(self):
+        super().__init__()
+        self.decisions = SimpleQueue()
+        self.answers = SimpleQueue()
+
+    def choose(self, game_state, decision, options):
+        self.decisions.put((decision, options))
+        value = self.answers.get()
+        if value is _Abandon:
+            raise _Abandon
+        return value
+
+class DungeonDiceEnv:
+    """Reset/step environment over one hero's games.
+
+    The engine asks its policy for decisions from inside the phases, so each
+    episode's engine runs on its own thread and hands every decision to `step`.
+    Actions are ids into `actions.ACTIONS`, the same in every state; the
+    action mask marks the options legal at the current decision. The reward is
+    the change in final score (Experience plus the end-game treasure value)
+    since the previous step, so an episode's rewards add up to its score.
+
+    The engine thread only runs while `reset`, `step` or `close` waits for it,
+    and its output is silenced for just that time; the caller's own output
+    between steps is left alone.
+    """
+    num_actions = NUM_ACTIONS
+    observation_size = OBSERVATION_SIZE
+
+    def __init__(self, hero="minstrel", seed=0):
+        self.hero_class = HEROES[hero]
+        self.seed = seed
+        self.episode = 0
+        self.engine = None
+        self.thread = None
+        self.policy = None
+        self.options = None
+        self.decision = None
+        self.score = 0
+
+    def reset(self, seed=None):
+        """Start a new game. Returns (observation, info); info holds the action mask."""
+        self.close()
+        if seed is not None:
+            self.seed = seed
+            self.episode = 0
+        self.policy = HandoffPolicy()
+        self.engine = DelveEngine(self.hero_class(), self.policy, GameRandom(self.seed, self.episode))
+        self.episode += 1
+        self.score = 0
+        self.thread = threading.Thread(target=self._play, daemon=True)
+        with rendering(SilentRenderer()):
+            self.thread.start()
+            self._await_decision()
+        return self.observation(), {"action_mask": self.action_mask()}
+
+    def step(self, action):
+        """Take action id `action`. Returns (observation, reward, terminated, truncated, info)."""
+        if self.options is None:
+            raise ValueError("The episode is over; call reset()")
+        decision, value = ACTIONS[action]
+        if decision != self.decision or all(option.value != value or type(option.value) is not type(value)
+                                            for option in self.options):
+            raise ValueError(f"Action {action} ({decision.value}: {value}) is not legal now")
+        with rendering(SilentRenderer()):
+            self.policy.answers.put(value)
+            self._await_decision()
+        score = self.engine.state.calculate_final_score()
+        reward, self.score = score - self.score, score
+        info = {"action_mask": self.action_mask()}
+        if self.options is None:
+            info["score"] = score
+        return self.observation(), float(reward), self.options is None, False, info
+
+    def observation(self, out=None):
+        return encode_observation(self.engine.state, self.decision, out)
+
+    def action_mask(self):
+        if self.options is None:
+            return np.zeros(NUM_ACTIONS, dtype=bool)
+        return legal_mask(self.decision, self.options)
+
+    def close(self):
+        """Abandon the current episode, if any, and stop its engine thread."""
+        if self.thread is not None and self.options is not None:
+            with rendering(SilentRenderer()):
+                self.policy.answers.put(_Abandon)
+                self.thread.join()
+        self.thread = None
+        self.options = None
+        self.decision = None
+
+    def _play(self):
+        try:
+            self.engine.play_game()
+        except _Abandon:
+            return
+        except Exception as e:
+            self.policy.decisions.put((e, None))
+            return
+        self.policy.decisions.put((None, None))
+
+    def _await_decision(self):
+        decision, options = self.policy.decisions.get()
+        if isinstance(decision, Exception):
+            self.options = self.decision = None
+            raise decision
+        self.decision, self.options = decision, options
+
+def _failure(error):
+    """An exception and its formatted traceback, as sent from a worker to the parent."""
+    try:
+        pickle.dumps(error)
+    except Exception:
+        error = RuntimeError(f"{type(error).__name__}: {error}")
+    return error, traceback.format_exc()
+
+def _worker(connection, shm_names, first, count, hero, seed):
+    """Step environments [first, first + count) of a SubprocVectorEnv. Results go straight to shared memory.
+
+    Each command is answered with None, or with `_failure()` of the exception
+    that stopped it; the worker then waits for the next command.
+    """
+    buffers = [SharedMemory(name=name) for name in shm_names]
+    observations, masks, rewards, dones, scores, actions = _views(buffers, first + count)
+    envs = [DungeonDiceEnv(hero, seed) for _ in range(count)]
+    try:
+        while True:
+            command = connection.recv()
+            if command == "close":
+                break
+            try:
+                for i, env in enumerate(envs, first):
+                    if command == "reset":
+                        env.reset(seed=seed + i)
+                        dones[i] = False
+                    else:
+                        _, rewards[i], dones[i], _, info = env.step(int(actions[i]))
+                        if dones[i]:
+                            scores[i] = info["score"]
+                            env.reset()
+                    env.observation(observations[i])
+                    masks[i] = env.action_mask()
+            except Exception as e:
+                connection.send(_failure(e))
+            else:
+                connection.send(None)
+    finally:
+        for env in envs:
+            env.close()
+        del observations, masks, rewards, dones, scores, actions
+        for buffer in buffers:
+            buffer.close()
+
+# Shared arrays of a SubprocVectorEnv: (name, per-env shape, dtype)
+SHARED_ARRAYS = (
+    ("observations", (OBSERVATION_SIZE,), np.float32),
+    ("masks", (NUM_ACTIONS,), np.bool_),
+    ("rewards", (), np.float32),
+    ("dones", (), np.bool_),
+    ("scores", (), np.int32),
+    ("actions", (), np.int32),
+)
+
+def _views(buffers, num_envs):
+    return [np.ndarray((num_envs,) + shape, dtype=dtype, buffer=buffer.buf)
+            for buffer, (_, shape, dtype) in zip(buffers, SHARED_ARRAYS)]
+
+class SubprocVectorEnv:
+    """Steps `num_envs` DungeonDiceEnvs split across worker processes.
+
+    Observations, action masks, rewards, done flags and actions live in shared
+    memory; the pipes carry only a one-word command and an empty reply per step.
+    Finished episodes are reset automatically: `dones[i]` is set on the step that
+    ended one, `scores[i]` holds its final score and `observations[i]` is
+    already the first observation of the next episode. Environment i is seeded
+    with `seed + i`.
+
+    An exception in a worker, such as an illegal action, is raised again by
+    the `reset` or `step` that caused it, with the worker's traceback as its
+    cause. The environments are then in an undefined state until `reset`.
+    """
+    def __init__(self, num_envs, hero="minstrel", seed=0, workers=None):
+        import os
+        if hero not in HEROES:
+            raise ValueError(f"Unknown hero '{hero}'. Choose from: {', '.join(HEROES)}")
+        workers = max(1, min(workers or os.cpu_count() or 1, num_envs))
+        self.num_envs = num_envs
+        self.buffers = [SharedMemory(create=True, size=max(1, num_envs * int(np.prod(shape)) * np.dtype(dtype).itemsize))
+                        for _, shape, dtype in SHARED_ARRAYS]
+        (self.observations, self.masks, self.rewards, self.dones, self.scores,
+         self.actions) = _views(self.buffers, num_envs)
+        context = get_context()
+        self.connections = []
+        self.processes = []
+        for w in range(workers):
+            first = w * num_envs // workers
+            count = (w + 1) * num_envs // workers - first
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(child, [b.name for b in self.buffers], first, count, hero, seed))
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def _broadcast(self, command):
+        for connection in self.connections:
+            connection.send(command)
+        # Every worker answers before any error is raised, so the pipes stay in step
+        failures = [reply for reply in [connection.recv() for connection in self.connections] if reply is not None]
+        if failures:
+            error, trace = failures[0]
+            raise error from RuntimeError(f"in a worker process:\n{trace}")
+
+    def reset(self):
+        """Reset every environment. Returns (observations, masks); both are shared arrays updated in place."""
+        self._broadcast("reset")
+        return self.observations, self.masks
+
+    def step(self, actions):
+        """Take one action id per environment. Returns (observations, rewards, dones, masks)."""
+        self.actions[:] = actions
+        self._broadcast("step")
+        return self.observations, self.rewards, self.dones, self.masks
+
+    def close(self):
+        if not self.processes:
+            return
+        for connection in self.connections:
+            connection.send("close")
+        for process in self.processes:
+            process.join()
+        self.processes = []
+        for buffer in self.buffers:
+            buffer.close()
+            buffer.unlink()
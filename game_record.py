@@ -0,0 +1,324 @@
+import struct
+from bisect import bisect_right
+from collections import namedtuple
+
+from dice import DIE_SIDES, PARTY_FACES, DUNGEON_FACES
+from hero import HeroRank
+from policy import Decision, Policy
+from treasure import NUM_TREASURE_TYPES
+
+# A record is: header | events | keyframe index | trailer.
+# Every event starts with a tag byte; its payload length follows from the tag.
+MAGIC = b"DDGR"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+TRAILER = struct.Struct("<III4s")  # index offset, keyframe count, event count, magic
+INDEX_ENTRY = struct.Struct("<II")  # event number, byte offset
+
+# Tag ranges. Decisions carry the decision code in the tag and the chosen option index in one
+# payload byte; rolls carry the number of dice in the tag and two dice per payload byte.
+TAG_DECISION = 0x00      # 0x00-0x3f
+TAG_PARTY_ROLL = 0x40    # 0x40-0x4f
+TAG_DUNGEON_ROLL = 0x50  # 0x50-0x5f
+TAG_TREASURE = 0x60      # 0x60-0x6f: the type drawn
+TAG_POOL_EMPTY = 0x70    # a draw from the empty treasure pool
+TAG_KEYFRAME = 0x80      # followed by a KEYFRAME struct
+
+MAX_ROLL = 0x0f
+
+DECISIONS = tuple(Decision)
+DECISION_CODES = {decision: code for code, decision in enumerate(DECISIONS)}
+
+# Hero classes by code; 0 means no hero chosen yet
+HERO_NAMES = ("", "MinstrelBardHero", "AlchemistThaumaturgeHero", "ArchaeologistTombRaiderHero")
+RANKS = tuple(HeroRank)
+
+# Full game state: delve, level, party, graveyard and dungeon counts, lair, experience,
+# treasure tokens, dragons slain, treasure pool and hoard counts, hero, rank, exhausted
+KEYFRAME = struct.Struct(f"<BB{DIE_SIDES}B{DIE_SIDES}B{DIE_SIDES}BBHBB"
+                         f"{NUM_TREASURE_TYPES}B{NUM_TREASURE_TYPES}BBBB")
+
+Keyframe = namedtuple("Keyframe", ["delve", "level", "party", "graveyard", "dungeon", "lair", "experience",
+                                   "treasure_tokens", "dragons_slain", "pool", "hoard", "hero", "rank",
+                                   "exhausted"])
+
+# One decoded event. `kind` is "decision", "party_roll", "dungeon_roll", "treasure" or "keyframe";
+# `value` is the option index, the rolled face values, the treasure type (None if the pool was
+# empty) or the Keyframe.
+Event = namedtuple("Event", ["kind", "decision", "value"])
+
+def capture_keyframe(game_state):
+    """Take a Keyframe of a game in progress."""
+    hero = game_state.selected_hero_card
+    return Keyframe(game_state.delve_count, game_state.level, tuple(game_state.party_counts),
+                    tuple(game_state.graveyard_counts), tuple(game_state.dungeon_counts),
+                    game_state.dragons_lair, game_state.experience_tokens, game_state.treasure_tokens,
+                    game_state.dragons_slain, game_state.treasure_manager.snapshot(),
+                    game_state.player_treasure.snapshot(),
+                    HERO_NAMES.index(hero.__class__.__name__) if hero else 0,
+                    RANKS.index(hero.current_rank) if hero else 0,
+                    bool(hero and hero.is_exhausted))
+
+def restore_keyframe(game_state, keyframe):
+    """Load a Keyframe into a GameState. The hero card must already be selected."""
+    game_state.delve_count = keyframe.delve
+    game_state.level = keyframe.level
+    game_state.party_counts = list(keyframe.party)
+    game_state.graveyard_counts = list(keyframe.graveyard)
+    game_state.dungeon_counts = list(keyframe.dungeon)
+    game_state.dragons_lair = keyframe.lair
+    game_state.experience_tokens = keyframe.experience
+    game_state.treasure_tokens = keyframe.treasure_tokens
+    game_state.dragons_slain = keyframe.dragons_slain
+    game_state.treasure_manager.restore(keyframe.pool)
+    game_state.player_treasure.restore(keyframe.hoard)
+    hero = game_state.selected_hero_card
+    if hero:
+        hero.current_rank = RANKS[keyframe.rank]
+        hero.is_exhausted = keyframe.exhausted
+
+def pack_keyframe(keyframe):
+    return KEYFRAME.pack(keyframe.delve, keyframe.level, *keyframe.party, *keyframe.graveyard, *keyframe.dungeon,
+                         keyframe.lair, keyframe.experience, keyframe.treasure_tokens, keyframe.dragons_slain,
+                         *keyframe.pool, *keyframe.hoard, keyframe.hero, keyframe.rank, keyframe.exhausted)
+
+def unpack_keyframe(data, offset):
+    fields = KEYFRAME.unpack_from(data, offset)
+    counts = [tuple(fields[2 + i * DIE_SIDES:2 + (i + 1) * DIE_SIDES]) for i in range(3)]
+    rest = 2 + 3 * DIE_SIDES
+    delve, level = fields[:2]
+    lair, experience, treasure_tokens, dragons_slain = fields[rest:rest + 4]
+    pool = tuple(fields[rest + 4:rest + 4 + NUM_TREASURE_TYPES])
+    hoard = tuple(fields[rest + 4 + NUM_TREASURE_TYPES:rest + 4 + 2 * NUM_TREASURE_TYPES])
+    hero, rank, exhausted = fields[-3:]
+    return Keyframe(delve, level, *counts, lair, experience, treasure_tokens, dragons_slain, pool, hoard,
+                    hero, rank, bool(exhausted))
+
+def pack_faces(faces):
+    """Two dice per byte, low nibble first."""
+    return bytes(faces[i] | (faces[i + 1] << 4 if i + 1 < len(faces) else 0) for i in range(0, len(faces), 2))
+
+class GameRecorder:
+    """Collects the events of one game as they happen and encodes them as a binary record.
+
+    Attach it with `DelveEngine(..., recorder=GameRecorder())`: the engine routes
+    every decision through `RecordingPolicy`, its dice and treasure pool report
+    every outcome, and a keyframe is written at the start of every level.
+    """
+    def __init__(self):
+        self.body = bytearray()
+        self.events = 0
+        self.index = []
+
+    def decision(self, decision, option_index):
+        self.body += bytes((TAG_DECISION | DECISION_CODES[decision], option_index))
+        self.events += 1
+
+    def party_roll(self, faces):
+        self._roll(TAG_PARTY_ROLL, faces)
+
+    def dungeon_roll(self, faces):
+        self._roll(TAG_DUNGEON_ROLL, faces)
+
+    def _roll(self, tag, faces):
+        for start in range(0, len(faces), MAX_ROLL):
+            chunk = faces[start:start + MAX_ROLL]
+            self.body.append(tag | len(chunk))
+            self.body += pack_faces(chunk)
+            self.events += 1
+
+    def treasure(self, treasure_type):
+        self.body.append(TAG_POOL_EMPTY if treasure_type is None else TAG_TREASURE | treasure_type)
+        self.events += 1
+
+    def keyframe(self, game_state):
+        self.index.append((self.events, HEADER.size + len(self.body)))
+        self.body.append(TAG_KEYFRAME)
+        self.body += pack_keyframe(capture_keyframe(game_state))
+        self.events += 1
+
+    def getvalue(self):
+        """The finished record as bytes."""
+        index_offset = HEADER.size + len(self.body)
+        return (HEADER.pack(MAGIC, VERSION) + bytes(self.body) +
+                b"".join(INDEX_ENTRY.pack(*entry) for entry in self.index) +
+                TRAILER.pack(index_offset, len(self.index), self.events, MAGIC))
+
+class RecordingPolicy(Policy):
+    """Wraps another policy and records the index of every option it chooses."""
+    def __init__(self, policy, recorder):
+        self.policy = policy
+        self.recorder = recorder
+        # The game sees the wrapped policy's escape hatches and random stream
+        self.interactive = policy.interactive
+        self.rng = policy.rng
+
+    def choose(self, game_state, decision, options):
+        value = self.policy.choose(game_state, decision, options)
+        self.recorder.decision(decision, next(i for i, option in enumerate(options) if option.value == value))
+        return value
+
+class ReplayDone(Exception):
+    """A replay has applied every event up to its last step."""
+
+class Replay(Policy):
+    """Plays recorded events back into an engine in place of its policy, dice and treasure draws.
+
+    Keyframe events are skipped. Asking for an event past step `last` raises
+    ReplayDone; asking for an event of the wrong kind raises ValueError.
+    """
+    def __init__(self, events, last, treasure_manager):
+        self.events = events
+        self.last = last
+        self.treasure_manager = treasure_manager
+
+    def next_event(self, kind):
+        for step, event in self.events:
+            if event.kind == "keyframe":
+                continue
+            if step > self.last:
+                raise ReplayDone()
+            if event.kind != kind:
+                raise ValueError(f"step {step} is a {event.kind} event, but the game asked for a {kind}")
+            return event
+        raise ValueError("the record ends before the game does")
+
+    def choose(self, game_state, decision, options):
+        event = self.next_event("decision")
+        if event.decision != decision:
+            raise ValueError(f"the record chose {event.decision.name}, but the game asked for {decision.name}")
+        return options[event.value].value
+
+    def roll_party_dice(self, num_dice=7):
+        return [PARTY_FACES[i] for i in self._roll("party_roll", num_dice)]
+
+    def roll_dungeon_dice(self, num_dice=1):
+        return [DUNGEON_FACES[i] for i in self._roll("dungeon_roll", num_dice)]
+
+    def _roll(self, kind, num_dice):
+        # Rolls of more than MAX_ROLL dice span several events
+        rolls = []
+        while len(rolls) < num_dice:
+            rolls += self.next_event(kind).value
+        return rolls
+
+    def draw_treasure(self):
+        treasure_type = self.next_event("treasure").value
+        if treasure_type is None:
+            return None
+        return self.treasure_manager.take_treasure(treasure_type)
+
+class GameRecord:
+    """Reads a binary game record. Any step can be reached from the keyframe before it."""
+    def __init__(self, data):
+        self.data = bytes(data)
+        magic, version = HEADER.unpack_from(self.data)
+        index_offset, keyframes, self.num_events, trailer_magic = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+        if magic != MAGIC or trailer_magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Dungeon Dice game record")
+        self.body_end = index_offset
+        entries = [INDEX_ENTRY.unpack_from(self.data, index_offset + i * INDEX_ENTRY.size) for i in range(keyframes)]
+        self.keyframe_steps = [step for step, _ in entries]
+        self.keyframe_offsets = [offset for _, offset in entries]
+
+    def __len__(self):
+        return self.num_events
+
+    def events(self, start=0, offset=None):
+        """Decode events from step `start`, beginning at byte `offset` (the start of the body by default)."""
+        data = self.data
+        offset = HEADER.size if offset is None else offset
+        step = start
+        while offset < self.body_end:
+            tag = data[offset]
+            offset += 1
+            if tag < TAG_PARTY_ROLL:
+                event = Event("decision", DECISIONS[tag], data[offset])
+                offset += 1
+            elif tag < TAG_TREASURE:
+                count = tag & MAX_ROLL
+                packed = data[offset:offset + (count + 1) // 2]
+                faces = [nibble for byte in packed for nibble in (byte & 0x0f, byte >> 4)][:count]
+                event = Event("party_roll" if tag < TAG_DUNGEON_ROLL else "dungeon_roll", None, faces)
+                offset += len(packed)
+            elif tag < TAG_POOL_EMPTY:
+                event = Event("treasure", None, tag & 0x0f)
+            elif tag == TAG_POOL_EMPTY:
+                event = Event("treasure", None, None)
+            else:
+                event = Event("keyframe", None, unpack_keyframe(data, offset))
+                offset += KEYFRAME.size
+            yield step, event
+            step += 1
+
+    def seek(self, step):
+        """Jump to `step`: returns the latest Keyframe at or before it and the events from there up to `step`."""
+        if not 0 <= step < self.num_events:
+            raise IndexError(f"step {step} out of range")
+        k = bisect_right(self.keyframe_steps, step) - 1
+        if k < 0:
+            keyframe, start, offset = None, 0, None
+        else:
+            keyframe = unpack_keyframe(self.data, self.keyframe_offsets[k] + 1)
+            start, offset = self.keyframe_steps[k], self.keyframe_offsets[k]
+        events = []
+        for position, event in self.events(start, offset):
+            if position > step:
+                break
+            events.append(event)
+        return keyframe, events
+
+    def state_at(self, step):
+        """The GameState after event `step`, rebuilt from the keyframe before it.
+
+        A DelveEngine restored to that keyframe plays on with the recorded choices,
+        rolls and draws, and stops when the game asks for the event after `step`.
+        """
+        import hero as heroes
+        from engine import DelveEngine
+        from render import rendering, SilentRenderer
+        if not 0 <= step < self.num_events:
+            raise IndexError(f"step {step} out of range")
+        k = bisect_right(self.keyframe_steps, step) - 1
+        # Before the first keyframe the game is played from the start, with the hero it names
+        keyframe = unpack_keyframe(self.data, self.keyframe_offsets[max(k, 0)] + 1)
+        engine = DelveEngine(getattr(heroes, HERO_NAMES[keyframe.hero])())
+        state = engine.state
+        events = self.events() if k < 0 else self.events(self.keyframe_steps[k], self.keyframe_offsets[k])
+        replay = Replay(events, step, state.treasure_manager)
+        engine.policy = replay
+        state.dice = engine.dice_manager = replay
+        state.treasure_manager.draw_treasure = replay.draw_treasure
+        with rendering(SilentRenderer()):
+            try:
+                if k < 0:
+                    engine.play_game()
+                else:
+                    restore_keyframe(state, keyframe)
+                    # The last keyframe is taken after the final score, with nothing left to play
+                    if self.keyframe_steps[k] < self.num_events - 1:
+                        engine.resume_game(None)
+            except ReplayDone:
+                pass
+        return state
+
+    def keyframes(self):
+        """Every keyframe as (step, Keyframe)."""
+        return [(step, unpack_keyframe(self.data, offset + 1))
+                for step, offset in zip(self.keyframe_steps, self.keyframe_offsets)]
+
+def write_archive(path, records):
+    """Write game records to one file, each prefixed by its length."""
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(struct.pack("<I", len(record)))
+            f.write(record)
+
+def read_archive(path):
+    """Yield every GameRecord in an archive written by `write_archive`."""
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(4)
+            if len(prefix) < 4:
+                return
+            yield GameRecord(f.read(struct.unpack("<I", prefix)[0]))
@@ -1,35 +1,271 @@
-from treasure import TreasureManager, PlayerTreasure, TreasureType
+from collections import namedtuple
+from dice import DungeonDiceFace, DiceManager, MONSTER_FACES, PARTY_FACES, DUNGEON_FACES, DIE_SIDES
+from treasure import TreasureManager, PlayerTreasure, TreasureType, TREASURE_TOKENS
+from rng import GameRandom
+from hero import HeroRank
+from render import say, display
+from zobrist import (ZobristHash, HashedCounts, check_count, PARTY_KEYS, GRAVEYARD_KEYS, DUNGEON_KEYS, POOL_KEYS,
+                     HOARD_KEYS, LAIR_KEYS, LEVEL_KEYS, DELVE_KEYS, HERO_KEYS)
+
+# Places a die can be moved between with `GameState.apply`. The Lair holds only Dragons, so
+# faces are ignored there; SUPPLY is outside the game (dice not rolled yet or set aside).
+PARTY, GRAVEYARD, DUNGEON, LAIR, SUPPLY = range(5)
+
+# Places a treasure token can be moved between
+TREASURE_POOL, HOARD = range(2)
+
+# Primitive state changes for tree search. `GameState.apply` returns the opposite change as the undo token.
+# MoveDice moves `count` dice showing `face` from `source` to `target`, where they show `new_face`
+# (the same face if None); a re-roll is a move from PARTY to PARTY with a new face.
+MoveDice = namedtuple("MoveDice", ["source", "target", "face", "new_face", "count"], defaults=(None, 1))
+MoveTreasure = namedtuple("MoveTreasure", ["treasure_type", "source", "target"])
+# Adds `delta` to "level", "delve_count", "experience_tokens" or "dragons_slain"
+Adjust = namedtuple("Adjust", ["field", "delta"])
+SetExhausted = namedtuple("SetExhausted", ["exhausted"])
+
+ADJUSTABLE_FIELDS = ("level", "delve_count", "experience_tokens", "dragons_slain")
 
 class GameState:
-    def __init__(self):
+    def __init__(self, rng=None):
         self.delve_count = 0
         self.level = 1
-        self.party_dice = []  # Active party dice
-        self.graveyard = []   # Used party dice go here
-        self.dungeon_dice = []
-        self.dragons_lair = []  # Stores dragon dice separately
+        # Dice pools are count vectors: entry i is the number of dice showing face i.
+        # Every write to a count vector updates the Zobrist hash.
+        self.zobrist = ZobristHash()
+        self._party_counts = HashedCounts([0] * DIE_SIDES, PARTY_KEYS, self.zobrist)          # Active party dice
+        self._graveyard_counts = HashedCounts([0] * DIE_SIDES, GRAVEYARD_KEYS, self.zobrist)  # Used party dice go here
+        self._dungeon_counts = HashedCounts([0] * DIE_SIDES, DUNGEON_KEYS, self.zobrist)      # The Dragon entry stays 0; Dragons go to the lair
+        self.dragons_lair = 0  # Number of Dragon dice in the Dragon's Lair
         self.treasure_tokens = 0  # This is now just a counter for display
         self.experience_tokens = 0
+        self.dragons_slain = 0  # Statistic only, not part of the rules
         self.selected_hero_card = None
         self.current_phase = None
         
+        # Every random draw of the game comes from these streams
+        self.rng = rng or GameRandom()
+        self.dice = DiceManager(self.rng.dice)
+
         # Initialize treasure system
-        self.treasure_manager = TreasureManager()
+        self.treasure_manager = TreasureManager(self.rng.treasure)
         self.player_treasure = PlayerTreasure(self.treasure_manager)
-        
-    def use_party_die(self, die_index):
-        """Move a party die to the graveyard and return its value."""
-        if die_index < 0 or die_index >= len(self.party_dice):
+        self.treasure_manager.pool_counts = HashedCounts(self.treasure_manager.pool_counts, POOL_KEYS, self.zobrist)
+        self.player_treasure.counts = HashedCounts(self.player_treasure.counts, HOARD_KEYS, self.zobrist)
+
+    # Assigning a dice pool copies into the hashed count vector
+    @property
+    def party_counts(self):
+        return self._party_counts
+
+    @party_counts.setter
+    def party_counts(self, counts):
+        self._party_counts[:] = counts
+
+    @property
+    def graveyard_counts(self):
+        return self._graveyard_counts
+
+    @graveyard_counts.setter
+    def graveyard_counts(self, counts):
+        self._graveyard_counts[:] = counts
+
+    @property
+    def dungeon_counts(self):
+        return self._dungeon_counts
+
+    @dungeon_counts.setter
+    def dungeon_counts(self, counts):
+        self._dungeon_counts[:] = counts
+
+    @property
+    def zobrist_hash(self):
+        """64-bit Zobrist hash of the dice pools, Dragon's Lair, treasure pool and hoard, level, delve and hero card.
+
+        Count vectors are hashed incrementally as they change; the scalars are mixed in here.
+        """
+        for scalar in (self.dragons_lair, self.level, self.delve_count):
+            check_count(scalar)
+        value = (self.zobrist.value ^ LAIR_KEYS[self.dragons_lair] ^ LEVEL_KEYS[self.level] ^
+                 DELVE_KEYS[self.delve_count])
+        hero = self.selected_hero_card
+        if hero:
+            value ^= HERO_KEYS[hero.current_rank == HeroRank.MASTER][hero.is_exhausted]
+        return value
+    
+    def reset_dice(self):
+        """Empty every dice pool."""
+        self.party_counts = [0] * DIE_SIDES
+        self.graveyard_counts = [0] * DIE_SIDES
+        self.dungeon_counts = [0] * DIE_SIDES
+        self.dragons_lair = 0
+    
+    @property
+    def party_size(self):
+        return sum(self.party_counts)
+    
+    @property
+    def graveyard_size(self):
+        return sum(self.graveyard_counts)
+    
+    @property
+    def dungeon_size(self):
+        return sum(self.dungeon_counts)
+    
+    @property
+    def monster_count(self):
+        return sum(self.dungeon_counts[face] for face in MONSTER_FACES)
+    
+    def has_party_face(self, face):
+        return self.party_counts[face] > 0
+    
+    def party_faces(self):
+        """Get the (face, count) pairs of the active party, skipping empty faces."""
+        return [(face, count) for face, count in zip(PARTY_FACES, self.party_counts) if count]
+    
+    def graveyard_faces(self):
+        """Get the (face, count) pairs of the Graveyard, skipping empty faces."""
+        return [(face, count) for face, count in zip(PARTY_FACES, self.graveyard_counts) if count]
+    
+    def dungeon_faces(self):
+        """Get the (face, count) pairs of the dungeon, skipping empty faces."""
+        return [(face, count) for face, count in zip(DUNGEON_FACES, self.dungeon_counts) if count]
+    
+    def add_party_dice(self, dice):
+        """Add rolled party dice to the active party."""
+        for die in dice:
+            self.party_counts[die] += 1
+    
+    def add_dungeon_dice(self, dice):
+        """Add rolled dungeon dice to the dungeon. Returns the number of Dragons, which move to the Dragon's Lair."""
+        dragons = 0
+        for die in dice:
+            if die == DungeonDiceFace.DRAGON:
+                dragons += 1
+            else:
+                self.dungeon_counts[die] += 1
+        self.dragons_lair += dragons
+        return dragons
+    
+    def use_party_face(self, face):
+        """Move one party die showing `face` to the graveyard and return its value."""
+        if not self.party_counts[face]:
             return None
+        self.party_counts[face] -= 1
+        self.graveyard_counts[face] += 1
+        return face
+    
+    def revive_die(self, face, from_face=None):
+        """Return one die from the graveyard to the active party showing `face`.
         
-        die = self.party_dice.pop(die_index)
-        self.graveyard.append(die)
-        return die
+        `from_face` picks which Graveyard die is revived; by default any one is.
+        """
+        if from_face is None:
+            from_face = next((f for f in PARTY_FACES if self.graveyard_counts[f]), None)
+        if from_face is None or not self.graveyard_counts[from_face]:
+            return None
+        self.graveyard_counts[from_face] -= 1
+        self.party_counts[face] += 1
+        return face
+    
+    def reroll_party_die(self, face):
+        """Re-roll one party die showing `face` and return the new face."""
+        new_die = self.dice.roll_party_dice(1)[0]
+        self.party_counts[face] -= 1
+        self.party_counts[new_die] += 1
+        return new_die
+    
+    def reroll_dungeon_die(self, face):
+        """Re-roll one dungeon die showing `face`. A rolled Dragon moves to the Dragon's Lair."""
+        self.dungeon_counts[face] -= 1
+        new_die = self.dice.roll_dungeon_dice(1)[0]
+        self.add_dungeon_dice((new_die,))
+        return new_die
     
+    def remove_dungeon_dice(self, face, count=1):
+        """Remove `count` dungeon dice showing `face` (defeated monsters, opened chests, quaffed potions)."""
+        self.dungeon_counts[face] -= count
+    
+    def apply(self, action):
+        """Apply a primitive change, or a list of them in order, and return the token that undoes it.
+
+        Only the counts touched by the change are updated, so branching a search
+        tree and backtracking with `undo` costs O(changes). Raises ValueError
+        (leaving the state unchanged) if the dice or token to move is not there.
+        """
+        kind = type(action)
+        if kind is MoveDice:
+            source, target, face, new_face, count = action
+            if new_face is None:
+                new_face = face
+            self._take_dice(source, face, count)
+            self._put_dice(target, new_face, count)
+            return MoveDice(target, source, new_face, face, count)
+        if kind is MoveTreasure:
+            treasure_type, source, target = action
+            if source == target:
+                return action
+            if source == TREASURE_POOL:
+                if not self.treasure_manager.take_treasure(treasure_type):
+                    raise ValueError(f"No {treasure_type} left in the treasure pool")
+                self.player_treasure.add_treasure(TREASURE_TOKENS[treasure_type])
+                self.treasure_tokens += 1
+            else:
+                if not self.player_treasure.use_treasure_type(treasure_type):
+                    raise ValueError(f"No {treasure_type} in the hoard")
+                self.treasure_tokens -= 1
+            return MoveTreasure(treasure_type, target, source)
+        if kind is Adjust:
+            if action.field not in ADJUSTABLE_FIELDS:
+                raise ValueError(f"Cannot adjust {action.field}")
+            setattr(self, action.field, getattr(self, action.field) + action.delta)
+            return Adjust(action.field, -action.delta)
+        if kind is SetExhausted:
+            hero = self.selected_hero_card
+            previous = hero.is_exhausted
+            hero.is_exhausted = action.exhausted
+            return SetExhausted(previous)
+        if kind in (list, tuple):
+            tokens = []
+            try:
+                for step in action:
+                    tokens.append(self.apply(step))
+            except ValueError:
+                self.undo(tokens[::-1])
+                raise
+            return tokens[::-1]
+        raise TypeError(f"Unknown action {action!r}")
+
+    def undo(self, token):
+        """Reverse a change made by `apply`, given the token it returned."""
+        self.apply(token)
+
+    def _take_dice(self, place, face, count):
+        if place == SUPPLY:
+            return
+        if place == LAIR:
+            if self.dragons_lair < count:
+                raise ValueError(f"Only {self.dragons_lair} dice in the Dragon's Lair")
+            self.dragons_lair -= count
+            return
+        counts = self._dice_pool(place)
+        if counts[face] < count:
+            raise ValueError(f"Only {counts[face]} {face} dice to move")
+        counts[face] -= count
+
+    def _put_dice(self, place, face, count):
+        if place == LAIR:
+            self.dragons_lair += count
+        elif place != SUPPLY:
+            self._dice_pool(place)[face] += count
+
+    def _dice_pool(self, place):
+        return (self.party_counts, self.graveyard_counts, self.dungeon_counts)[place]
+
     def reset_graveyard(self):
         """Return all dice from graveyard to active party."""
-        self.party_dice.extend(self.graveyard)
-        self.graveyard = []
+        for face, count in enumerate(self.graveyard_counts):
+            self.party_counts[face] += count
+        self.graveyard_counts = [0] * DIE_SIDES
     
     def draw_treasure(self):
         """Draw a treasure token from the pool."""
@@ -41,12 +277,12 @@ class GameState:
         else:
             # If no treasure tokens remain, gain experience instead
             self.experience_tokens += 1
-            print("No Treasure tokens remain! You gain an Experience token instead.")
+            say("No Treasure tokens remain! You gain an Experience token instead.")
             return None
     
-    def use_treasure(self, index):
-        """Use a treasure token from the player's collection."""
-        token = self.player_treasure.use_treasure(index)
+    def use_treasure_type(self, treasure_type):
+        """Use a treasure token of the given type from the player's collection."""
+        token = self.player_treasure.use_treasure_type(treasure_type)
         if token:
             self.treasure_tokens -= 1  # Decrement display counter
         return token
@@ -65,24 +301,25 @@ class GameState:
         treasure_exp = self.player_treasure.calculate_end_game_experience()
         return base_exp + treasure_exp
     
+    @display
     def display_treasure_info(self):
         """Display detailed information about available treasures."""
         treasures = self.get_available_treasures()
         if not treasures:
-            print("No treasures in your collection.")
+            say("No treasures in your collection.")
             return
         
-        print("\nYour Treasures:")
+        say("\nYour Treasures:")
         for i, token in enumerate(treasures):
-            print(f"{i+1}. {token.name}")
-            print(f"   Effect: {token.get_description()}")
+            say(f"{i+1}. {token.name}")
+            say(f"   Effect: {token.get_description()}")
         
         # Show special counts
         dragon_scales = self.player_treasure.count_treasure_type(TreasureType.DRAGON_SCALE)
         if dragon_scales > 0:
             pairs = dragon_scales // 2
-            print(f"\nDragon Scale pairs: {pairs} (Worth {pairs * 2} exp at game end)")
+            say(f"\nDragon Scale pairs: {pairs} (Worth {pairs * 2} exp at game end)")
         
         town_portals = self.player_treasure.count_treasure_type(TreasureType.TOWN_PORTAL)
         if town_portals > 0:
-            print(f"Unused Town Portals: {town_portals} (Worth {town_portals * 2} exp if unused at game end)") 
\ No newline at end of file
+            say(f"Unused Town Portals: {town_portals} (Worth {town_portals * 2} exp if unused at game end)") 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Milliseconds each entry point may take to import in a fresh interpreter, NumPy included:
+# the wait a user actually sees. They are measured at 72-75 ms, of which NumPy is about 55 ms
+# and cannot be deferred, since the dice and treasure draws come from NumPy Generators. The
+# budgets leave about 50% for slower machines.
+BUDGETS_MS = {
+    "engine": 110,
+    "simulate": 115,
+    "main": 110,
+}
+
+# Modules an entry point must not load until they are actually used
+NOT_LOADED = {
+    "engine": ("main", "simulate", "game_record", "instrumentation", "delve_value", "delve_policy", "regroup_table", "dungeon_dice_game"),
+    "simulate": ("main", "game_record", "delve_value", "delve_policy", "regroup_table", "dungeon_dice_game"),
+    "main": ("simulate", "game_record", "instrumentation", "delve_value", "delve_policy", "regroup_table", "dungeon_dice_game"),
+}
+
+RUNS = 5
+
+# Run in a fresh interpreter: NumPy is imported first so its share of the total is reported separately
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import numpy
+numpy_done = time.perf_counter()
+import {module}
+done = time.perf_counter()
+print(json.dumps([numpy_done - start, done - numpy_done, sorted(sys.modules)]))
+"""
+
+def measure(module, runs=RUNS):
+    """Import times in ms (NumPy, the module itself, total) of the fastest of `runs` runs, and the modules it loaded."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = (float("inf"),) * 3
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+        numpy_time, module_time, loaded = json.loads(output)
+        times = (numpy_time * 1000, module_time * 1000, (numpy_time + module_time) * 1000)
+        best = min(best, times, key=lambda t: t[2])
+    return (*best, loaded)
+
+def check(runs=RUNS):
+    """Measure every entry point. Returns one dict per entry point with an `ok` flag."""
+    results = []
+    for module, budget in BUDGETS_MS.items():
+        numpy_ms, module_ms, total_ms, loaded = measure(module, runs)
+        unexpected = [name for name in NOT_LOADED[module] if name in loaded]
+        results.append({"module": module, "numpy_ms": numpy_ms, "import_ms": module_ms, "total_ms": total_ms,
+                        "budget_ms": budget, "unexpected_modules": unexpected,
+                        "ok": total_ms <= budget and not unexpected})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the entry points, NumPy included, import within their time budget.")
+    parser.add_argument("--runs", type=int, default=RUNS, help="fresh interpreters per entry point (best is kept)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = check(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            status = "ok" if result["ok"] else "OVER BUDGET"
+            print(f"{result['module']:10} {result['total_ms']:7.1f} ms (budget {result['budget_ms']} ms; "
+                  f"NumPy {result['numpy_ms']:.1f} ms, own modules {result['import_ms']:.1f} ms)  {status}")
+            if result["unexpected_modules"]:
+                print(f"           loads {', '.join(result['unexpected_modules'])} eagerly")
+    return 0 if all(result["ok"] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import time
+
+# Timed sections of a game, in the order they are played
+PHASES = ("setup", "monster", "loot", "dragon", "regroup", "end_game")
+
+# Ways a delve can end
+OUTCOMES = ("fled_monsters", "fled_dragon", "town_portal", "retired", "stuff_of_legend")
+
+class PhaseStats:
+    """Wall and CPU time, entry counts per phase and delve outcome counters.
+
+    Pass one to `DelveEngine(..., stats=PhaseStats())` to collect them; without
+    it the engine calls the phases directly and records nothing. Stats from
+    any number of games or processes merge exactly, except for the timings.
+    """
+    def __init__(self):
+        self.entries = dict.fromkeys(PHASES, 0)
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+
+    def timed(self, phase, function, *args):
+        """Call `function(*args)` and charge its wall and CPU time to `phase`."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return function(*args)
+        finally:
+            self.wall[phase] += time.perf_counter() - wall
+            self.cpu[phase] += time.process_time() - cpu
+            self.entries[phase] += 1
+
+    def outcome(self, name):
+        """Count one delve ending as `name`."""
+        self.outcomes[name] += 1
+
+    @property
+    def delves(self):
+        return sum(self.outcomes.values())
+
+    def merge(self, other):
+        """Add the stats of another run to these."""
+        for phase in PHASES:
+            self.entries[phase] += other.entries[phase]
+            self.wall[phase] += other.wall[phase]
+            self.cpu[phase] += other.cpu[phase]
+        for name in OUTCOMES:
+            self.outcomes[name] += other.outcomes[name]
+        return self
+
+    def to_dict(self):
+        return {
+            "phases": {phase: {"entries": self.entries[phase], "wall_s": self.wall[phase], "cpu_s": self.cpu[phase]}
+                       for phase in PHASES},
+            "outcomes": dict(self.outcomes),
+            "delves": self.delves,
+        }
+
+    def report(self):
+        """The stats as printable lines."""
+        total_wall = sum(self.wall.values()) or 1.0
+        lines = [f"{'Phase':10} {'Entries':>10} {'Wall s':>10} {'CPU s':>10} {'us/entry':>10} {'Share':>7}"]
+        for phase in PHASES:
+            entries = self.entries[phase]
+            per_entry = self.wall[phase] / entries * 1e6 if entries else 0.0
+            lines.append(f"{phase:10} {entries:10} {self.wall[phase]:10.3f} {self.cpu[phase]:10.3f} "
+                         f"{per_entry:10.1f} {self.wall[phase] / total_wall:7.1%}")
+        delves = self.delves or 1
+        lines.append("Delve outcomes: " + ", ".join(f"{name} {count} ({count / delves:.1%})"
+                                                    for name, count in self.outcomes.items()))
+        return lines
@@ -0,0 +1,340 @@
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from engine import DelveEngine, MENU_PHASES, Anchor
+from game_record import capture_keyframe, restore_keyframe
+from policy import Decision, Policy, GreedyPolicy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+
+# Decisions whose None option cancels back to the action menu. The search never considers it:
+# picking another action at the menu does the same, and a cancelled choice could repeat forever.
+CANCELLABLE = {Decision.COMPANION, Decision.CHEST_COMPANION, Decision.QUAFF_DIE, Decision.TREASURE,
+               Decision.DRAGON_COMPANION}
+
+# Time per move in milliseconds, when no other budget is given
+DEFAULT_BUDGET_MS = 50
+
+# UCT exploration constant, in points of final score
+EXPLORATION = 5.0
+
+class _Timeout(Exception):
+    """Raised by an iteration still running at the move's deadline, to abandon it."""
+
+class ChanceNode:
+    """One option of a decision: its total and visit count, and the decisions its random outcomes led to.
+
+    `outcomes` maps the key of each next decision reached to its DecisionNode;
+    dungeon rolls, Scroll re-rolls and treasure draws each give a different key.
+    """
+    __slots__ = ("visits", "total", "outcomes")
+
+    def __init__(self):
+        self.visits = 0
+        self.total = 0.0
+        self.outcomes = {}
+
+class DecisionNode:
+    """A decision in the search tree, with one ChanceNode per legal option value."""
+    __slots__ = ("visits", "edges")
+
+    def __init__(self, values):
+        self.visits = 0
+        self.edges = {value: ChanceNode() for value in values}
+
+    def select(self, rng):
+        """The UCT choice: an untried option at random, else the best upper confidence bound."""
+        untried = [value for value, edge in self.edges.items() if not edge.visits]
+        if untried:
+            return rng.choice(untried)
+        scale = EXPLORATION * math.sqrt(math.log(self.visits))
+        return max(self.edges, key=lambda value: self.edges[value].total / self.edges[value].visits +
+                   scale / math.sqrt(self.edges[value].visits))
+
+    def best(self):
+        """The most visited option, ties broken by mean score."""
+        return max(self.edges, key=lambda value: (self.edges[value].visits,
+                                                  self.edges[value].total / max(1, self.edges[value].visits)))
+
+def searched_values(decision, options):
+    """The option values the search chooses among."""
+    if decision in CANCELLABLE:
+        return [option.value for option in options if option.value is not None]
+    return [option.value for option in options]
+
+def node_key(game_state, decision, pending):
+    """Transposition key of a decision: the state's dice and treasure counts, Experience and the choices pending.
+
+    Count vectors hash the same however the dice were rolled, so equal
+    multisets reached by different paths share one node. `pending` is the
+    values chosen since the last action menu, which the state does not show yet.
+    """
+    return game_state.zobrist_hash, game_state.experience_tokens, decision, pending
+
+class _Iteration(Policy):
+    """Plays one search iteration in the search's engine.
+
+    Replays the real game's choices since the anchor, walks the tree from the
+    root with UCT, expands one node and finishes the game with the rollout policy.
+    """
+    def __init__(self, search):
+        super().__init__()
+        self.search = search
+        self.trail = ()
+        self.replayed = 0
+        self.pending = []
+        self.path = []
+        self.visited = set()
+        self.edge = None  # ChanceNode taken last, to link the next node to
+        self.in_tree = False
+
+    def start(self, trail):
+        self.trail = trail
+        self.replayed = 0
+        self.pending = []
+        self.path = []
+        self.visited = set()
+        self.edge = None
+        self.in_tree = False
+
+    def choose(self, game_state, decision, options):
+        search = self.search
+        if search.deadline is not None and time.perf_counter() > search.deadline:
+            raise _Timeout
+        if decision in MENU_PHASES:
+            self.pending = []
+        if self.replayed < len(self.trail):
+            expected, value = self.trail[self.replayed]
+            if expected != decision:
+                raise RuntimeError(f"Search replay diverged: expected {expected.value}, got {decision.value}")
+            self.replayed += 1
+        elif self.replayed == len(self.trail):
+            # The root: everything random from here on is sampled, never the real game's future
+            self.replayed += 1
+            self.in_tree = True
+            search.sample_streams()
+            value = self.tree_choice(game_state, decision, options)
+        elif self.in_tree:
+            value = self.tree_choice(game_state, decision, options)
+        else:
+            value = search.rollout.choose(game_state, decision, options)
+        self.pending.append(value)
+        return value
+
+    def tree_choice(self, game_state, decision, options):
+        values = searched_values(decision, options)
+        if len(values) == 1:
+            return values[0]
+        search = self.search
+        key = node_key(game_state, decision, tuple(self.pending))
+        if key in self.visited:
+            # Cancelling a choice comes back to the same decision; leave the tree rather than loop
+            self.in_tree = False
+            return search.rollout.choose(game_state, decision, options)
+        self.visited.add(key)
+        node = search.nodes.get(key)
+        if node is None:
+            node = search.nodes[key] = DecisionNode(values)
+            self.in_tree = False  # Expand one node per iteration, then roll out
+        if self.edge is not None:
+            self.edge.outcomes[key] = node
+        value = node.select(search.rng)
+        self.edge = node.edges[value]
+        self.path.append((node, self.edge))
+        return value
+
+    def backpropagate(self, score):
+        for node, edge in self.path:
+            node.visits += 1
+            edge.visits += 1
+            edge.total += score
+
+class MCTSPolicy(Policy):
+    """Monte Carlo tree search over the real engine, for every decision of every phase.
+
+    Each iteration restores the state of the last action menu, replays the
+    choices made since (with the dice and treasure streams rewound to that
+    menu, so the past comes out the same), then samples fresh rolls and draws
+    from the current decision on. Decision nodes are keyed by the state's
+    count vectors, so equal dice multisets merge; each option is a chance
+    node whose children are the decisions its random outcomes lead to.
+    The subtree under the chosen option and the real outcome is kept for the
+    next decision. Unexplored positions are played out to the end of the
+    game by `rollout`, a policy class called with a seed: GreedyPolicy, or
+    SolverPolicy once the Regroup table has been built. Without
+    `full_rollouts`, playouts stop at the end of the root's delve and the
+    delves left are worth the expected Experience of a delve each, from the
+    Regroup table, which is cheaper but plays weaker.
+
+    Each move searches for `budget_ms` milliseconds, or `iterations` iterations
+    if given. The deadline is checked at every decision of an iteration, and
+    an iteration still running at the deadline is abandoned without being
+    backed up, so a move overruns its budget by at most one engine step.
+    """
+    def __init__(self, seed=None, budget_ms=DEFAULT_BUDGET_MS, iterations=None, rollout=GreedyPolicy,
+                 full_rollouts=True):
+        super().__init__(seed)
+        self.budget_ms = budget_ms
+        self.iterations = iterations
+        self.full_rollouts = full_rollouts
+        if full_rollouts:
+            self.table = None
+        else:
+            from regroup_table import open_table
+            self.table = open_table()
+        self.rollout = rollout(seed=self.rng.getrandbits(64))
+        self.sampler = np.random.default_rng(self.rng.getrandbits(64))
+        self.replay_dice = np.random.default_rng()
+        self.replay_treasure = np.random.default_rng()
+        self.game_state = None
+        self.engine = None
+        self.anchor = None  # The last action menu of the real game
+        self.trail = []     # The (decision, value) choices made since the anchor
+        self.nodes = {}
+        self.walk = _Iteration(self)
+        self.deadline = None  # perf_counter() time the current move's search must stop by
+        self.move_times = []
+
+    def choose(self, game_state, decision, options):
+        if game_state is not self.game_state:
+            self.new_game(game_state)
+        phase = MENU_PHASES.get(decision)
+        if phase is not None:
+            self.anchor = Anchor(phase, capture_keyframe(game_state), game_state.dice.stream_state(),
+                                 game_state.treasure_manager.stream_state())
+            self.trail = []
+        values = searched_values(decision, options)
+        if len(values) == 1:
+            value = values[0]
+        elif self.anchor is None:
+            value = self.rollout.choose(game_state, decision, options)
+        else:
+            value = self.search(game_state, decision, options)
+        if self.anchor is not None:
+            self.trail.append((decision, value))
+        return value
+
+    def new_game(self, game_state):
+        self.game_state = game_state
+        self.engine = DelveEngine(type(game_state.selected_hero_card)(), self.walk, GameRandom(0))
+        self.anchor = None
+        self.trail = []
+        self.nodes = {}
+
+    def search(self, game_state, decision, options):
+        """Run the search from the current decision and return the option value chosen.
+
+        If not one iteration finished in time, the rollout policy chooses.
+        """
+        start = time.perf_counter()
+        self.deadline = None if self.iterations is not None else start + self.budget_ms / 1000
+        key = node_key(game_state, decision, tuple(value for _, value in self.trail))
+        root = self.nodes.get(key)
+        if root is None:
+            root = DecisionNode(searched_values(decision, options))
+        self.nodes = self.subtree(key, root)
+
+        trail = tuple(self.trail)
+        done = 0
+        with rendering(SilentRenderer()):
+            while self.iterations is None or done < self.iterations:
+                try:
+                    self.iterate(trail)
+                except _Timeout:
+                    break
+                done += 1
+        self.deadline = None
+        self.move_times.append(time.perf_counter() - start)
+        if not root.visits:
+            return self.rollout.choose(game_state, decision, options)
+        return root.best()
+
+    @staticmethod
+    def subtree(key, root):
+        """The transposition table of the nodes reachable from `root`, which drops the rest of the tree."""
+        nodes = {key: root}
+        frontier = [root]
+        while frontier:
+            node = frontier.pop()
+            for edge in node.edges.values():
+                for child_key, child in edge.outcomes.items():
+                    if child_key not in nodes:
+                        nodes[child_key] = child
+                        frontier.append(child)
+        return nodes
+
+    def iterate(self, trail):
+        """Play one iteration from the anchor and back its score up the tree path."""
+        anchor = self.anchor
+        engine = self.engine
+        state = engine.state
+        restore_keyframe(state, anchor.keyframe)
+        state.dice.resume_stream(self.replay_dice, anchor.dice)
+        state.treasure_manager.resume_stream(self.replay_treasure, anchor.treasure)
+        engine.delve_results = []
+        self.walk.start(trail)
+        if self.full_rollouts:
+            self.walk.backpropagate(engine.resume_game(anchor.phase))
+            return
+
+        # Play out the delve the root is in, then estimate the delves left
+        engine.play_delve(anchor.phase)
+        engine.finish_delve()
+        while state.delve_count < engine.MAX_DELVES:
+            if self.walk.replayed > len(trail):
+                delve_value = self.table.delve_value(state.selected_hero_card)
+                self.walk.backpropagate(state.calculate_final_score() +
+                                        (engine.MAX_DELVES - state.delve_count) * delve_value)
+                return
+            engine.start_delve()
+            engine.finish_delve()
+        self.walk.backpropagate(engine.end_game())
+
+    def sample_streams(self):
+        """Switch the search's engine to fresh random outcomes."""
+        self.engine.state.dice.seed(self.sampler)
+        self.engine.state.treasure_manager.rng = self.sampler
+
+def main(argv=None):
+    from simulate import HEROES
+    parser = argparse.ArgumentParser(description="Play headless games with the Monte Carlo tree search policy.")
+    parser.add_argument("-n", "--games", type=int, default=10, help="number of games to play")
+    parser.add_argument("--hero", choices=sorted(HEROES), default="minstrel")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="search time per move")
+    parser.add_argument("--iterations", type=int, default=None, help="search iterations per move instead of a time budget")
+    parser.add_argument("--rollout", choices=("greedy", "solver"), default="greedy",
+                        help="policy that plays out positions outside the tree (solver needs regroup_table.bin)")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    args = parser.parse_args(argv)
+
+    rollout = GreedyPolicy
+    if args.rollout == "solver":
+        from delve_policy import SolverPolicy
+        from regroup_table import DEFAULT_PATH
+        if not os.path.exists(DEFAULT_PATH):
+            parser.error(f"{DEFAULT_PATH} not found. Run `python regroup_table.py` to solve the Regroup table first")
+        rollout = SolverPolicy
+
+    scores = []
+    move_times = []
+    with rendering(SilentRenderer()):
+        for game_id in range(args.games):
+            rng = GameRandom(args.seed, game_id)
+            policy = MCTSPolicy(rng.policy_seed, args.budget_ms, args.iterations, rollout)
+            scores.append(DelveEngine(HEROES[args.hero](), policy, rng).play_game())
+            move_times += policy.move_times
+    print(f"Games played:  {len(scores)}")
+    print(f"Mean score:    {statistics.fmean(scores):.3f}")
+    if move_times:
+        print(f"Searches:      {len(move_times)}, mean {statistics.fmean(move_times) * 1000:.1f}ms, "
+              f"max {max(move_times) * 1000:.1f}ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,1271 +1,306 @@
-from dice import PartyDiceFace, DungeonDiceFace, DiceManager
+from actions import GROUP_TYPES, legal_values, can_defeat_monsters
+from dice import PartyDiceFace, DungeonDiceFace, MONSTER_FACES
 from hero import HeroRank
-from treasure import TreasureType
-import random
+from policy import Decision, Option
+from scroll import ScrollActions
+from monster_solver import solve_monsters
+from treasure import TreasureActions, COMPANION_TYPES, COMPANION_TREASURES, TREASURE_TOKENS
+from render import say, display
 
-class TreasureActions:
-    @staticmethod
-    def use_treasure(game_state):
-        """Handle using a treasure token."""
-        treasures = game_state.get_available_treasures()
-        if not treasures:
-            print("No treasures available!")
-            return False
-            
-        print("\nAvailable Treasures:")
-        game_state.display_treasure_info()
-        print(f"{len(treasures)+1}. Cancel")
-        
-        choice = input("Choose treasure to use (number): ").strip()
-        try:
-            choice_idx = int(choice) - 1
-            if choice_idx == len(treasures):
-                return False
-            if 0 <= choice_idx < len(treasures):
-                token = treasures[choice_idx]
-                
-                # Handle different treasure types
-                if token.type == TreasureType.RING_OF_INVISIBILITY:
-                    # Return dragons to pool without defeating them
-                    dragon_count = len(game_state.dragons_lair)
-                    game_state.dragons_lair = []
-                    print(f"Ring of Invisibility used! {dragon_count} Dragon dice returned to pool.")
-                    game_state.use_treasure(choice_idx)
-                    return True
-                    
-                elif token.type == TreasureType.ELIXIR:
-                    if not game_state.graveyard:
-                        print("No dice in Graveyard to revive!")
-                        return False
-                    
-                    print("\nChoose a die face for the revived Party die:")
-                    for i, face in enumerate(PartyDiceFace):
-                        print(f"{i+1}. {face.value}")
-                    
-                    face_choice = input("Choose face (number): ").strip()
-                    try:
-                        face_idx = int(face_choice) - 1
-                        if 0 <= face_idx < len(PartyDiceFace):
-                            # Remove a die from graveyard
-                            game_state.graveyard.pop()
-                            # Add new die with chosen face
-                            chosen_face = list(PartyDiceFace)[face_idx].value
-                            game_state.party_dice.append(chosen_face)
-                            print(f"Elixir used! Added a {chosen_face} to your active party!")
-                            game_state.use_treasure(choice_idx)
-                            return True
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                        
-                elif token.type == TreasureType.DRAGON_BAIT:
-                    # Transform all monsters into dragons
-                    monster_count = 0
-                    for i, die in enumerate(game_state.dungeon_dice):
-                        if die in [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]:
-                            game_state.dragons_lair.append(DungeonDiceFace.DRAGON.value)
-                            monster_count += 1
-                    
-                    # Remove transformed monsters
-                    game_state.dungeon_dice = [die for die in game_state.dungeon_dice 
-                                             if die not in [DungeonDiceFace.GOBLIN.value, 
-                                                          DungeonDiceFace.SKELETON.value, 
-                                                          DungeonDiceFace.OOZE.value]]
-                    
-                    print(f"Dragon Bait used! {monster_count} monsters transformed into Dragons!")
-                    game_state.use_treasure(choice_idx)
-                    return True
-                    
-                elif token.type == TreasureType.TOWN_PORTAL:
-                    # Gain experience equal to level and end delve
-                    exp_gained = game_state.level
-                    game_state.experience_tokens += exp_gained
-                    print(f"Town Portal used! Gained {exp_gained} Experience tokens!")
-                    game_state.use_treasure(choice_idx)
-                    return "END_DELVE"
-                    
-                else:  # Companion-like treasures are handled in their respective phases
-                    print("This treasure must be used during combat or specific phases.")
-                    return False
-            else:
-                print("Invalid choice.")
-                return False
-        except ValueError:
-            print("Invalid input.")
-            return False
+# Each of these companions defeats any number of one monster type (and one of any other)
+GROUP_KILLS = GROUP_TYPES
+
+ACTION_LABELS = {
+    "scroll": "🎲 Use a Scroll to re-roll dice",
+    "companion": "🤝 Use Companions to defeat monsters",
+    "auto": "🤖 Defeat all monsters with the fewest Companions",
+    "treasure": "💎 Use Treasure",
+    "ultimate": "⚡ Use Hero Ultimate Ability",
+    "flee": "🏃 Flee the Dungeon",
+}
 
 class MonsterPhase:
     @staticmethod
-    def execute(game_state, hero_card):
+    def execute(game_state, hero_card, policy):
         """Execute the Monster Phase."""
-        print("\n" + "="*50)
-        print("🗡️  MONSTER PHASE  🗡️".center(50))
-        print("="*50)
-        
+        say("\n" + "="*50)
+        say("🗡️  MONSTER PHASE  🗡️".center(50))
+        say("="*50)
+
         # Display current state
         MonsterPhase.print_state(game_state)
         hero_card.display_card_info()
-        
+
         # Process monster encounters
-        monsters = [die for die in game_state.dungeon_dice if die in 
-                  [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]]
-        
-        if not monsters:
-            print("\n🌟 Lucky! No monsters encountered in this phase! 🌟")
+        if not game_state.monster_count:
+            say("\n🌟 Lucky! No monsters encountered in this phase! 🌟")
             return True
-        
-        print(f"\n⚔️  You've encountered {len(monsters)} fearsome monster(s)! ⚔️")
-        
+
+        say(f"\n⚔️  You've encountered {game_state.monster_count} fearsome monster(s)! ⚔️")
+        return MonsterPhase.resolve(game_state, hero_card, policy)
+
+    @staticmethod
+    def resolve(game_state, hero_card, policy):
+        """Offer the Monster Phase actions until every monster is defeated or the party flees."""
+        # Check if current hero has Minstrel/Bard specialty
+        specialty_active = (hero_card.__class__.__name__ == "MinstrelBardHero")
+
         # Phase actions
-        while monsters and (game_state.party_dice or game_state.get_usable_companions()):
-            print("\n📋 Available Monster Phase Actions:")
-            print("🎲 A) Use a Scroll to re-roll dice")
-            print("🤝 B) Use Companions to defeat monsters")
-            print("💎 C) Use Treasure")
-            print("⚡ D) Use Hero Ultimate Ability")
-            
-            choice = input("\nChoose action (letter): ").strip().upper()
-            
-            if choice == "A":
-                if MonsterPhase.use_scroll(game_state):
-                    # Update monster list as dice may have changed
-                    monsters = [die for die in game_state.dungeon_dice if die in 
-                              [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]]
-                    MonsterPhase.print_state(game_state)
-            elif choice == "B":
-                # Go directly to companion selection with descriptions
-                # Check if current hero has Minstrel/Bard specialty
-                specialty_active = (hero_card.__class__.__name__ == "MinstrelBardHero")
-                if MonsterPhase.use_companions(game_state, monsters, hero_card, specialty_active):
-                    # Update monster list as dice may have changed
-                    monsters = [die for die in game_state.dungeon_dice if die in 
-                              [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]]
-                    MonsterPhase.print_state(game_state)
-            elif choice == "C":
-                result = TreasureActions.use_treasure(game_state)
-                if result == "END_DELVE":
+        while game_state.monster_count and (game_state.party_size or game_state.get_usable_companions()):
+            say("\n📋 Available Monster Phase Actions:")
+            choice = policy.choose(game_state, Decision.MONSTER_ACTION, MonsterPhase.get_actions(game_state))
+
+            if choice == "scroll":
+                acted = ScrollActions.use_party_scroll(game_state, policy)
+            elif choice == "companion":
+                acted = MonsterPhase.use_companions(game_state, hero_card, specialty_active, policy)
+            elif choice == "auto":
+                acted = MonsterPhase.use_companions_for_remaining_monsters(game_state, hero_card, specialty_active)
+            elif choice == "treasure":
+                acted = TreasureActions.use_treasure(game_state, policy)
+                if acted == "END_DELVE":
                     return False
-                # Update monster list after treasure use
-                monsters = [die for die in game_state.dungeon_dice if die in 
-                          [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]]
+            elif choice == "ultimate":
+                acted = hero_card.use_ultimate(game_state, policy)
+            else:  # flee
+                say("\nYou choose to flee the Dungeon!")
+                say("The delve is over immediately, and no experience (XP) is gained.")
+                return False
+
+            if acted:
                 MonsterPhase.print_state(game_state)
-            elif choice == "D":
-                # Use hero's ultimate ability
-                if hero_card.use_ultimate(game_state):
-                    # Update monster list after ultimate use
-                    monsters = [die for die in game_state.dungeon_dice if die in 
-                              [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]]
-                    MonsterPhase.print_state(game_state)
-            else:
-                print("Invalid choice. Please enter a letter A-D.")
-                continue
-            
+
             # After each action, check if all monsters are defeated
-            if not monsters:
-                print("All monsters have been defeated!")
+            if not game_state.monster_count:
+                say("All monsters have been defeated!")
                 return True
-        
+
         # Final assessment - can all monsters be defeated?
-        if not monsters:
-            print("All monsters have been defeated!")
+        if not game_state.monster_count:
+            say("All monsters have been defeated!")
             return True
         else:
-            # Check if current hero has Minstrel/Bard specialty
-            specialty_active = (hero_card.__class__.__name__ == "MinstrelBardHero")
-            
-            if MonsterPhase.can_defeat_monsters(game_state, monsters, hero_card, specialty_active):
-                print("\nYour remaining party can defeat all monsters!")
-                print("Automatically using companions to defeat monsters...")
+            if MonsterPhase.can_defeat_monsters(game_state, hero_card):
+                say("\nYour remaining party can defeat all monsters!")
+                say("Automatically using companions to defeat monsters...")
                 # Use companions to defeat remaining monsters
-                MonsterPhase.use_companions_for_remaining_monsters(game_state, monsters, hero_card, specialty_active)
+                MonsterPhase.use_companions_for_remaining_monsters(game_state, hero_card, specialty_active)
                 return True
             else:
-                print("\nYou must flee the Dungeon! The monsters are too powerful!")
-                print("The delve is over immediately, and no experience (XP) is gained.")
+                say("\nYou must flee the Dungeon! The monsters are too powerful!")
+                say("The delve is over immediately, and no experience (XP) is gained.")
                 return False
-    
+
+    @staticmethod
+    def get_actions(game_state):
+        """Get the legal Monster Phase actions."""
+        return [Option(action, ACTION_LABELS[action]) for action in legal_values(game_state, Decision.MONSTER_ACTION)]
+
     @staticmethod
+    @display
     def print_state(game_state):
         """Display the current state."""
-        print("\n📊 Active Party Dice:")
-        dice_counts = {}
-        total_companions = 0
-        for die in game_state.party_dice:
-            dice_counts[die] = dice_counts.get(die, 0) + 1
-            if die != PartyDiceFace.SCROLL.value:  # Don't count scrolls as companions
-                total_companions += 1
-        
-        for die_face, count in dice_counts.items():
-            print(f"  ▫️ {die_face}: {count} dice")
-        print(f"  Total Companions: {total_companions}")
-        print(f"  Total Scrolls: {dice_counts.get(PartyDiceFace.SCROLL.value, 0)}")
-        
-        print("\n💎 Carried Treasure:")
+        say("\n📊 Active Party Dice:")
+        scrolls = game_state.party_counts[PartyDiceFace.SCROLL]
+        for die_face, count in game_state.party_faces():
+            say(f"  ▫️ {die_face}: {count} dice")
+        say(f"  Total Companions: {game_state.party_size - scrolls}")  # Don't count scrolls as companions
+        say(f"  Total Scrolls: {scrolls}")
+
+        say("\n💎 Carried Treasure:")
         treasures = game_state.get_available_treasures()
         if treasures:
             for treasure in treasures:
-                print(f"  ▫️ {treasure.name} - {treasure.get_description()}")
+                say(f"  ▫️ {treasure.name} - {treasure.get_description()}")
         else:
-            print("  ▫️ None")
-        
-        print("\n⚰️  Graveyard (Used Dice):")
-        graveyard_counts = {}
-        for die in game_state.graveyard:
-            graveyard_counts[die] = graveyard_counts.get(die, 0) + 1
-        if graveyard_counts:
-            for die_face, count in graveyard_counts.items():
-                print(f"  ▫️ {die_face}: {count} dice")
+            say("  ▫️ None")
+
+        say("\n⚰️  Graveyard (Used Dice):")
+        if game_state.graveyard_size:
+            for die_face, count in game_state.graveyard_faces():
+                say(f"  ▫️ {die_face}: {count} dice")
         else:
-            print("  ▫️ Empty")
-        
-        print("\n🎲 Dungeon Encounter:")
-        dungeon_counts = {}
-        total_monsters = 0
-        for die in game_state.dungeon_dice:
-            dungeon_counts[die] = dungeon_counts.get(die, 0) + 1
-            if die in [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]:
-                total_monsters += 1
-        for die_face, count in dungeon_counts.items():
-            print(f"  ▫️ {die_face}: {count} dice")
-        print(f"  Total Monsters: {total_monsters}")
-        print(f"  Total Chests: {dungeon_counts.get(DungeonDiceFace.CHEST.value, 0)}")
-        print(f"  Total Potions: {dungeon_counts.get(DungeonDiceFace.POTION.value, 0)}")
-        
-        print("\n🐉 Dragon's Lair:")
+            say("  ▫️ Empty")
+
+        say("\n🎲 Dungeon Encounter:")
+        for die_face, count in game_state.dungeon_faces():
+            say(f"  ▫️ {die_face}: {count} dice")
+        say(f"  Total Monsters: {game_state.monster_count}")
+        say(f"  Total Chests: {game_state.dungeon_counts[DungeonDiceFace.CHEST]}")
+        say(f"  Total Potions: {game_state.dungeon_counts[DungeonDiceFace.POTION]}")
+
+        say("\n🐉 Dragon's Lair:")
         if game_state.dragons_lair:
-            print(f"  ▫️ Dragon: {len(game_state.dragons_lair)} dice")
+            say(f"  ▫️ Dragon: {game_state.dragons_lair} dice")
         else:
-            print("  ▫️ Empty")
-    
+            say("  ▫️ Empty")
+
     @staticmethod
-    def use_scroll(game_state):
-        """Use a Scroll to re-roll dice."""
-        # Check if there are scrolls available
-        scroll_indices = [i for i, die in enumerate(game_state.party_dice) if die == PartyDiceFace.SCROLL.value]
-        
-        if not scroll_indices:
-            print("No Scrolls available in your active party!")
-            return False
-        
-        # Select a scroll to use
-        if len(scroll_indices) == 1:
-            scroll_idx = scroll_indices[0]
-        else:
-            print("Select which Scroll to use:")
-            for i, idx in enumerate(scroll_indices):
-                print(f"{i+1}. Scroll at position {idx+1}")
-            choice = input("Choose a Scroll (number): ").strip()
-            try:
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(scroll_indices):
-                    scroll_idx = scroll_indices[choice_idx]
-                else:
-                    print("Invalid choice.")
-                    return False
-            except ValueError:
-                print("Invalid input.")
-                return False
-        
-        # Move scroll to graveyard
-        game_state.use_party_die(scroll_idx)
-        print("Used a Scroll! Select dice to re-roll (results will be random).")
-        
-        # Create a list of all available dice to re-roll
-        print("\nAvailable Dice to Re-roll:")
-        print("=== Dungeon Dice (excluding Dragon dice) ===")
-        reroll_options = []
-        # Add dungeon dice (excluding dragon dice)
-        for i, die in enumerate(game_state.dungeon_dice):
-            reroll_options.append(("dungeon", i, die))
-            print(f"{len(reroll_options)}. Dungeon Die: {die}")
-        
-        print("\n=== Party Dice ===")
-        # Add party dice (excluding the scroll we just used)
-        for i, die in enumerate(game_state.party_dice):
-            if i != scroll_idx:  # Don't show the scroll we just used
-                reroll_options.append(("party", i, die))
-                print(f"{len(reroll_options)}. Party Die: {die}")
-        
-        if not reroll_options:
-            print("No dice available to re-roll!")
-            return False
-        
-        print(f"{len(reroll_options)+1}. Cancel")
-        
-        choice = input("Choose dice to re-roll (number): ").strip()
-        try:
-            choice_idx = int(choice) - 1
-            if choice_idx == len(reroll_options):
-                print("Re-roll cancelled.")
-                return False
-            if 0 <= choice_idx < len(reroll_options):
-                source, idx, old_die = reroll_options[choice_idx]
-                
-                # Re-roll the selected die
-                dice_manager = DiceManager()
-                if source == "dungeon":
-                    new_die = dice_manager.roll_dungeon_dice(1)[0]
-                    game_state.dungeon_dice[idx] = new_die
-                    print(f"Dungeon die re-rolled: {old_die} → {new_die}")
-                else:  # party
-                    new_die = dice_manager.roll_party_dice(1)[0]
-                    game_state.party_dice[idx] = new_die
-                    print(f"Party die re-rolled: {old_die} → {new_die}")
-                
-                return True
-            else:
-                print("Invalid choice.")
-                return False
-        except ValueError:
-            print("Invalid input.")
-            return False
-    
+    def get_companion_options(game_state):
+        """Get one option per distinct companion: party dice (except Scrolls) and companion treasures."""
+        return [Option(value, MonsterPhase.companion_label(*value)) for value in legal_values(game_state, Decision.COMPANION)[:-1]]
+
     @staticmethod
-    def use_champion(game_state, monsters, hero_card, specialty_active):
-        """Use a Champion to defeat monsters."""
-        champion_indices = [i for i, die in enumerate(game_state.party_dice) if die == PartyDiceFace.CHAMPION.value]
-        
-        if not champion_indices:
-            print("No Champions available!")
-            return False
-        
-        # Select a champion to use
-        if len(champion_indices) == 1:
-            champion_idx = champion_indices[0]
-        else:
-            print("Select which Champion to use:")
-            for i, idx in enumerate(champion_indices):
-                print(f"{i+1}. Champion at position {idx+1}")
-            choice = input("Choose a Champion (number): ").strip()
-            try:
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(champion_indices):
-                    champion_idx = champion_indices[choice_idx]
-                else:
-                    print("Invalid choice.")
-                    return False
-            except ValueError:
-                print("Invalid input.")
-                return False
-        
-        # Champions can defeat all monsters of a given type
-        # Group monsters by type
-        monster_types = {}
-        for monster in monsters:
-            if monster not in monster_types:
-                monster_types[monster] = []
-            monster_types[monster].append(monster)
-        
-        # Check if Expert Bard specialty is active
-        bard_master_active = specialty_active and hero_card.current_rank == HeroRank.MASTER
-        
-        if bard_master_active:
-            print(f"\n✨ Expert Bard's specialty active: Champion can defeat monsters of TWO different types! ✨")
-            print(f"Champion can defeat all monsters of a given type:")
-        else:
-            print(f"\nChampion can defeat all monsters of a given type:")
-        
-        for i, (monster_type, monster_list) in enumerate(monster_types.items()):
-            print(f"{i+1}. All {monster_type}s ({len(monster_list)} monster(s))")
-        
-        # Let player choose first monster type to defeat
-        choice = input("Choose first monster type to defeat (number): ").strip()
-        try:
-            choice_idx = int(choice) - 1
-            if 0 <= choice_idx < len(monster_types):
-                selected_type = list(monster_types.keys())[choice_idx]
-                selected_monsters = monster_types[selected_type]
-                
-                print(f"Champion defeats {len(selected_monsters)} {selected_type}(s).")
-                
-                # Remove defeated monsters from dungeon dice and monsters list
-                for monster in selected_monsters:
-                    game_state.dungeon_dice.remove(monster)
-                    monsters.remove(monster)
-                
-                # If Expert Bard is active, allow selecting a second monster type
-                if bard_master_active and len(monster_types) > 1:
-                    # Update monster types after first defeat
-                    remaining_monster_types = {}
-                    for monster in monsters:
-                        if monster not in remaining_monster_types:
-                            remaining_monster_types[monster] = []
-                        remaining_monster_types[monster].append(monster)
-                    
-                    if remaining_monster_types:
-                        print(f"\n✨ Expert Bard's specialty allows defeating a second monster type! ✨")
-                        print(f"Remaining monster types:")
-                        for i, (monster_type, monster_list) in enumerate(remaining_monster_types.items()):
-                            print(f"{i+1}. All {monster_type}s ({len(monster_list)} monster(s))")
-                        
-                        second_choice = input("Choose second monster type to defeat (number, or 0 to skip): ").strip()
-                        try:
-                            second_choice_idx = int(second_choice) - 1
-                            if second_choice_idx == -1:  # Skip second choice
-                                print("Skipping second monster type.")
-                            elif 0 <= second_choice_idx < len(remaining_monster_types):
-                                second_selected_type = list(remaining_monster_types.keys())[second_choice_idx]
-                                second_selected_monsters = remaining_monster_types[second_selected_type]
-                                
-                                print(f"✨ Champion also defeats {len(second_selected_monsters)} {second_selected_type}(s)! ✨")
-                                
-                                # Remove second set of defeated monsters
-                                for monster in second_selected_monsters:
-                                    game_state.dungeon_dice.remove(monster)
-                                    monsters.remove(monster)
-                                
-                                # Move champion to graveyard
-                                game_state.use_party_die(champion_idx)
-                                total_defeated = len(selected_monsters) + len(second_selected_monsters)
-                                print(f"Champion moved to Graveyard after defeating {total_defeated} monsters ({len(selected_monsters)} {selected_type}s + {len(second_selected_monsters)} {second_selected_type}s).")
-                                
-                                return True
-                            else:
-                                print("Invalid choice for second monster type.")
-                                # Move champion to graveyard for first defeat only
-                                game_state.use_party_die(champion_idx)
-                                print(f"Champion moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                                
-                                return True
-                        except ValueError:
-                            print("Invalid input for second monster type.")
-                            # Move champion to graveyard for first defeat only
-                            game_state.use_party_die(champion_idx)
-                            print(f"Champion moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                            
-                            return True
-                    else:
-                        # No remaining monsters after first defeat
-                        game_state.use_party_die(champion_idx)
-                        print(f"Champion moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                        
-                        return True
-                else:
-                    # Normal Champion behavior (no Expert Bard or no second monster type available)
-                    game_state.use_party_die(champion_idx)
-                    print(f"Champion moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                    
-                    return True
-            else:
-                print("Invalid choice.")
-                return False
-        except ValueError:
-            print("Invalid input.")
-            return False
-    
+    def companion_label(source, companion):
+        if source == "party":
+            return f"Party: {companion}"
+        token = TREASURE_TOKENS[companion]
+        return f"Treasure: {token.name} (acts as {token.get_companion_type()})"
+
+    @staticmethod
+    def spend_companion(game_state, source, companion, message=""):
+        """Move a used party die to the Graveyard or return a used treasure to the pool."""
+        if source == "party":
+            game_state.use_party_face(companion)
+            say(f"{companion} moved to Graveyard{message}.")
+        else:  # treasure
+            token = game_state.use_treasure_type(companion)
+            say(f"{token.name} used and returned to treasure pool{message}.")
+
     @staticmethod
-    def use_companions(game_state, monsters, hero_card, specialty_active):
+    def use_companions(game_state, hero_card, specialty_active, policy):
         """Use companions to defeat monsters."""
-        if not monsters:
-            print("No monsters to defeat!")
+        if not game_state.monster_count:
+            say("No monsters to defeat!")
             return False
-        
-        if not game_state.party_dice and not game_state.get_usable_companions():
-            print("No companions available!")
+
+        companions = MonsterPhase.get_companion_options(game_state)
+        if not companions:
+            say("No companions available!")
             return False
-        
-        print("\n📋 Monster Defeat Guide:")
-        print("• Fighter: defeats one Skeleton, one Ooze, or any number of Goblins")
-        print("• Cleric: defeats one Goblin, one Ooze, or any number of Skeletons")
-        print("• Mage: defeats one Goblin, one Skeleton, or any number of Oozes")
-        print("• Thief: defeats one Goblin, one Skeleton, or one Ooze")
-        print("• Champion: defeats any number of Goblins, Skeletons, or Oozes")
-        
+
+        say("\n📋 Monster Defeat Guide:")
+        say("• Fighter: defeats one Skeleton, one Ooze, or any number of Goblins")
+        say("• Cleric: defeats one Goblin, one Ooze, or any number of Skeletons")
+        say("• Mage: defeats one Goblin, one Skeleton, or any number of Oozes")
+        say("• Thief: defeats one Goblin, one Skeleton, or one Ooze")
+        say("• Champion: defeats any number of Goblins, Skeletons, or Oozes")
+
         if specialty_active:
-            print(f"\n✨ {hero_card.name}'s specialty active:")
-            if hero_card.current_rank == HeroRank.NOVICE:
-                print("• Thieves may be used as Mages and Mages may be used as Thieves")
-            else:  # Master
-                print("• Thieves may be used as Mages and Mages may be used as Thieves")
-                print("• Champions can defeat monsters of TWO different types")
-        
+            say(f"\n✨ {hero_card.name}'s specialty active:")
+            say("• Thieves may be used as Mages and Mages may be used as Thieves")
+            if hero_card.current_rank == HeroRank.MASTER:
+                say("• Champions can defeat monsters of TWO different types")
+
         # Show available companions
-        print("\n🤝 Available Companions:")
-        companions = []
-        option_number = 1
-        
-        # Add party dice companions
-        for i, die in enumerate(game_state.party_dice):
-            if die != PartyDiceFace.SCROLL.value:  # Scrolls are not companions
-                companions.append(("party", i, die))
-                print(f"{option_number}. Party: {die}")
-                option_number += 1
-        
-        # Add treasure companions
-        treasure_companions = game_state.get_usable_companions()
-        for idx, token in treasure_companions:
-            companions.append(("treasure", idx, token))
-            print(f"{option_number}. Treasure: {token.name} (acts as {token.get_companion_type()})")
-            option_number += 1
-        
-        if not companions:
-            print("No companions available!")
+        say("\n🤝 Available Companions:")
+        choice = policy.choose(game_state, Decision.COMPANION, companions + [Option(None, "Cancel")])
+        if choice is None:
             return False
-        
-        print(f"{option_number}. Cancel")
-        
-        choice = input("\nChoose companion to use (number): ").strip()
-        try:
-            choice_idx = int(choice) - 1
-            if choice_idx == len(companions):
-                return False
-            if 0 <= choice_idx < len(companions):
-                source, idx, companion = companions[choice_idx]
-                
-                # Determine companion type
-                if source == "treasure":
-                    companion_type = companion.get_companion_type()
-                else:
-                    companion_type = companion
-                
-                # Store original companion type for specialty choice
-                original_companion_type = companion_type
-                
-                # Apply specialty transformations if Minstrel/Bard specialty is active
-                if specialty_active and companion_type in [PartyDiceFace.THIEF.value, PartyDiceFace.MAGE.value]:
-                    print(f"\n✨ Minstrel/Bard specialty allows {companion_type} to be used as either {companion_type} or the other type!")
-                    print(f"1. Use as {companion_type} (original abilities)")
-                    if companion_type == PartyDiceFace.THIEF.value:
-                        print(f"2. Use as {PartyDiceFace.MAGE.value} (defeat all Oozes, open all chests)")
-                    else:  # MAGE
-                        print(f"2. Use as {PartyDiceFace.THIEF.value} (defeat all Oozes, open all chests)")
-                    
-                    choice = input("Choose how to use this companion (1 or 2): ").strip()
-                    try:
-                        choice_idx = int(choice)
-                        if choice_idx == 1:
-                            # Use original abilities
-                            companion_type = original_companion_type
-                        elif choice_idx == 2:
-                            # Use other type's abilities
-                            if companion_type == PartyDiceFace.THIEF.value:
-                                companion_type = PartyDiceFace.MAGE.value
-                                print(f"✨ {original_companion_type} acts as {companion_type}")
-                            else:  # MAGE
-                                companion_type = PartyDiceFace.THIEF.value
-                                print(f"✨ {original_companion_type} acts as {companion_type}")
-                        else:
-                            print("Invalid choice. Using original abilities.")
-                            companion_type = original_companion_type
-                    except ValueError:
-                        print("Invalid input. Using original abilities.")
-                        companion_type = original_companion_type
-                
-                # Special handling for Champions
-                if companion_type == PartyDiceFace.CHAMPION.value:
-                    # Champions can defeat all monsters of a given type
-                    # Group monsters by type
-                    monster_types = {}
-                    for monster in monsters:
-                        if monster not in monster_types:
-                            monster_types[monster] = []
-                        monster_types[monster].append(monster)
-                    
-                    # Check if Master Bard specialty is active
-                    bard_master_active = specialty_active and hero_card.current_rank == HeroRank.MASTER
-                    
-                    if bard_master_active:
-                        print(f"\n✨ Master Bard's specialty active: Champion can defeat monsters of TWO different types! ✨")
-                        print(f"Champion can defeat all monsters of a given type:")
-                    else:
-                        print(f"\nChampion can defeat all monsters of a given type:")
-                    
-                    for i, (monster_type, monster_list) in enumerate(monster_types.items()):
-                        print(f"{i+1}. All {monster_type}s ({len(monster_list)} monster(s))")
-                    
-                    # Let player choose first monster type to defeat
-                    choice = input("Choose first monster type to defeat (number): ").strip()
-                    try:
-                        choice_idx = int(choice) - 1
-                        if 0 <= choice_idx < len(monster_types):
-                            selected_type = list(monster_types.keys())[choice_idx]
-                            selected_monsters = monster_types[selected_type]
-                            
-                            print(f"Champion defeats {len(selected_monsters)} {selected_type}(s).")
-                            
-                            # Remove defeated monsters from dungeon dice and monsters list
-                            for monster in selected_monsters:
-                                game_state.dungeon_dice.remove(monster)
-                                monsters.remove(monster)
-                            
-                            # If Expert Bard is active, allow selecting a second monster type
-                            if bard_master_active and len(monster_types) > 1:
-                                # Update monster types after first defeat
-                                remaining_monster_types = {}
-                                for monster in monsters:
-                                    if monster not in remaining_monster_types:
-                                        remaining_monster_types[monster] = []
-                                    remaining_monster_types[monster].append(monster)
-                                
-                                if remaining_monster_types:
-                                    print(f"\n✨ Expert Bard's specialty allows defeating a second monster type! ✨")
-                                    print(f"Remaining monster types:")
-                                    for i, (monster_type, monster_list) in enumerate(remaining_monster_types.items()):
-                                        print(f"{i+1}. All {monster_type}s ({len(monster_list)} monster(s))")
-                                    
-                                    second_choice = input("Choose second monster type to defeat (number, or 0 to skip): ").strip()
-                                    try:
-                                        second_choice_idx = int(second_choice) - 1
-                                        if second_choice_idx == -1:  # Skip second choice
-                                            print("Skipping second monster type.")
-                                        elif 0 <= second_choice_idx < len(remaining_monster_types):
-                                            second_selected_type = list(remaining_monster_types.keys())[second_choice_idx]
-                                            second_selected_monsters = remaining_monster_types[second_selected_type]
-                                            
-                                            print(f"✨ Champion also defeats {len(second_selected_monsters)} {second_selected_type}(s)! ✨")
-                                            
-                                            # Remove second set of defeated monsters
-                                            for monster in second_selected_monsters:
-                                                game_state.dungeon_dice.remove(monster)
-                                                monsters.remove(monster)
-                                            
-                                            # Use companion
-                                            if source == "party":
-                                                game_state.use_party_die(idx)
-                                                total_defeated = len(selected_monsters) + len(second_selected_monsters)
-                                                print(f"{companion} moved to Graveyard after defeating {total_defeated} monsters ({len(selected_monsters)} {selected_type}s + {len(second_selected_monsters)} {second_selected_type}s).")
-                                            else:  # treasure
-                                                game_state.use_treasure(idx)
-                                                total_defeated = len(selected_monsters) + len(second_selected_monsters)
-                                                print(f"{companion.name} used and returned to treasure pool after defeating {total_defeated} monsters ({len(selected_monsters)} {selected_type}s + {len(second_selected_monsters)} {second_selected_type}s).")
-                                            
-                                            return True
-                                        else:
-                                            print("Invalid choice for second monster type.")
-                                            # Use companion for first defeat only
-                                            if source == "party":
-                                                game_state.use_party_die(idx)
-                                                print(f"{companion} moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                                            else:  # treasure
-                                                game_state.use_treasure(idx)
-                                                print(f"{companion.name} used and returned to treasure pool after defeating {len(selected_monsters)} {selected_type}(s).")
-                                            
-                                            return True
-                                    except ValueError:
-                                        print("Invalid input for second monster type.")
-                                        # Use companion for first defeat only
-                                        if source == "party":
-                                            game_state.use_party_die(idx)
-                                            print(f"{companion} moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                                        else:  # treasure
-                                            game_state.use_treasure(idx)
-                                            print(f"{companion.name} used and returned to treasure pool after defeating {len(selected_monsters)} {selected_type}(s).")
-                                        
-                                        return True
-                                else:
-                                    # No remaining monsters after first defeat
-                                    if source == "party":
-                                        game_state.use_party_die(idx)
-                                        print(f"{companion} moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                                    else:  # treasure
-                                        game_state.use_treasure(idx)
-                                        print(f"{companion.name} used and returned to treasure pool after defeating {len(selected_monsters)} {selected_type}(s).")
-                                    
-                                    return True
-                            else:
-                                # Normal Champion behavior (no Expert Bard or no second monster type available)
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard after defeating {len(selected_monsters)} {selected_type}(s).")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool after defeating {len(selected_monsters)} {selected_type}(s).")
-                                
-                                return True
-                        else:
-                            print("Invalid choice.")
-                            return False
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                
-                # Find monsters this companion can defeat
-                defeatable_monsters = []
-                for monster in monsters:
-                    if MonsterPhase.can_defeat_monster(companion_type, monster):
-                        defeatable_monsters.append(monster)
-                
-                if not defeatable_monsters:
-                    print(f"{companion_type} cannot defeat any of the remaining monsters!")
-                    return False
-                
-                # Handle different companion types according to the rules
-                if companion_type == PartyDiceFace.FIGHTER.value:
-                    # Fighter defeats one Skeleton, one Ooze, or any number of Goblins
-                    goblins = [m for m in defeatable_monsters if m == DungeonDiceFace.GOBLIN.value]
-                    skeletons = [m for m in defeatable_monsters if m == DungeonDiceFace.SKELETON.value]
-                    oozes = [m for m in defeatable_monsters if m == DungeonDiceFace.OOZE.value]
-                    
-                    print(f"\nFighter can:")
-                    options = []
-                    option_number = 1
-                    if goblins:
-                        options.append((option_number, f"Defeat ALL Goblins ({len(goblins)} monster(s))"))
-                        option_number += 1
-                    if skeletons:
-                        options.append((option_number, f"Defeat 1 Skeleton"))
-                        option_number += 1
-                    if oozes:
-                        options.append((option_number, f"Defeat 1 Ooze"))
-                        option_number += 1
-                    
-                    for num, option in options:
-                        print(f"  {num}. {option}")
-                    
-                    choice = input("Choose option (number): ").strip()
-                    try:
-                        choice_idx = int(choice)
-                        # Find the selected option
-                        selected_option = None
-                        for num, option in options:
-                            if num == choice_idx:
-                                selected_option = option
-                                break
-                        
-                        if selected_option:
-                            if "Defeat ALL Goblins" in selected_option and goblins:
-                                # Defeat all Goblins
-                                for monster in goblins:
-                                    game_state.dungeon_dice.remove(monster)
-                                    monsters.remove(monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard after defeating {len(goblins)} Goblin(s).")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool after defeating {len(goblins)} Goblin(s).")
-                                
-                                print(f"Defeated {len(goblins)} Goblin(s)!")
-                                return True
-                            elif "Defeat 1 Skeleton" in selected_option and skeletons:
-                                # Defeat 1 Skeleton
-                                defeated_monster = skeletons[0]
-                                game_state.dungeon_dice.remove(defeated_monster)
-                                monsters.remove(defeated_monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard.")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool.")
-                                
-                                print(f"Defeated {defeated_monster}!")
-                                return True
-                            elif "Defeat 1 Ooze" in selected_option and oozes:
-                                # Defeat 1 Ooze
-                                defeated_monster = oozes[0]
-                                game_state.dungeon_dice.remove(defeated_monster)
-                                monsters.remove(defeated_monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard.")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool.")
-                                
-                                print(f"Defeated {defeated_monster}!")
-                                return True
-                            else:
-                                print("Invalid choice.")
-                                return False
-                        else:
-                            print("Invalid choice.")
-                            return False
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                        
-                elif companion_type == PartyDiceFace.CLERIC.value:
-                    # Cleric defeats one Goblin, one Ooze, or any number of Skeletons
-                    goblins = [m for m in defeatable_monsters if m == DungeonDiceFace.GOBLIN.value]
-                    skeletons = [m for m in defeatable_monsters if m == DungeonDiceFace.SKELETON.value]
-                    oozes = [m for m in defeatable_monsters if m == DungeonDiceFace.OOZE.value]
-                    
-                    print(f"\nCleric can:")
-                    options = []
-                    option_number = 1
-                    if skeletons:
-                        options.append((option_number, f"Defeat ALL Skeletons ({len(skeletons)} monster(s))"))
-                        option_number += 1
-                    if goblins:
-                        options.append((option_number, f"Defeat 1 Goblin"))
-                        option_number += 1
-                    if oozes:
-                        options.append((option_number, f"Defeat 1 Ooze"))
-                        option_number += 1
-                    
-                    for num, option in options:
-                        print(f"  {num}. {option}")
-                    
-                    choice = input("Choose option (number): ").strip()
-                    try:
-                        choice_idx = int(choice)
-                        # Find the selected option
-                        selected_option = None
-                        for num, option in options:
-                            if num == choice_idx:
-                                selected_option = option
-                                break
-                        
-                        if selected_option:
-                            if "Defeat ALL Skeletons" in selected_option and skeletons:
-                                # Defeat all Skeletons
-                                for monster in skeletons:
-                                    game_state.dungeon_dice.remove(monster)
-                                    monsters.remove(monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard after defeating {len(skeletons)} Skeleton(s).")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool after defeating {len(skeletons)} Skeleton(s).")
-                                
-                                print(f"Defeated {len(skeletons)} Skeleton(s)!")
-                                return True
-                            elif "Defeat 1 Goblin" in selected_option and goblins:
-                                # Defeat 1 Goblin
-                                defeated_monster = goblins[0]
-                                game_state.dungeon_dice.remove(defeated_monster)
-                                monsters.remove(defeated_monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard.")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool.")
-                                
-                                print(f"Defeated {defeated_monster}!")
-                                return True
-                            elif "Defeat 1 Ooze" in selected_option and oozes:
-                                # Defeat 1 Ooze
-                                defeated_monster = oozes[0]
-                                game_state.dungeon_dice.remove(defeated_monster)
-                                monsters.remove(defeated_monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard.")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool.")
-                                
-                                print(f"Defeated {defeated_monster}!")
-                                return True
-                            else:
-                                print("Invalid choice.")
-                                return False
-                        else:
-                            print("Invalid choice.")
-                            return False
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                        
-                elif companion_type == PartyDiceFace.MAGE.value:
-                    # Mage defeats one Goblin, one Skeleton, or any number of Oozes
-                    goblins = [m for m in defeatable_monsters if m == DungeonDiceFace.GOBLIN.value]
-                    skeletons = [m for m in defeatable_monsters if m == DungeonDiceFace.SKELETON.value]
-                    oozes = [m for m in defeatable_monsters if m == DungeonDiceFace.OOZE.value]
-                    
-                    print(f"\nMage can:")
-                    options = []
-                    option_number = 1
-                    if oozes:
-                        options.append((option_number, f"Defeat ALL Oozes ({len(oozes)} monster(s))"))
-                        option_number += 1
-                    if goblins:
-                        options.append((option_number, f"Defeat 1 Goblin"))
-                        option_number += 1
-                    if skeletons:
-                        options.append((option_number, f"Defeat 1 Skeleton"))
-                        option_number += 1
-                    
-                    for num, option in options:
-                        print(f"  {num}. {option}")
-                    
-                    choice = input("Choose option (number): ").strip()
-                    try:
-                        choice_idx = int(choice)
-                        # Find the selected option
-                        selected_option = None
-                        for num, option in options:
-                            if num == choice_idx:
-                                selected_option = option
-                                break
-                        
-                        if selected_option:
-                            if "Defeat ALL Oozes" in selected_option and oozes:
-                                # Defeat all Oozes
-                                for monster in oozes:
-                                    game_state.dungeon_dice.remove(monster)
-                                    monsters.remove(monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard after defeating {len(oozes)} Ooze(s).")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool after defeating {len(oozes)} Ooze(s).")
-                                
-                                print(f"Defeated {len(oozes)} Ooze(s)!")
-                                return True
-                            elif "Defeat 1 Goblin" in selected_option and goblins:
-                                # Defeat 1 Goblin
-                                defeated_monster = goblins[0]
-                                game_state.dungeon_dice.remove(defeated_monster)
-                                monsters.remove(defeated_monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard.")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool.")
-                                
-                                print(f"Defeated {defeated_monster}!")
-                                return True
-                            elif "Defeat 1 Skeleton" in selected_option and skeletons:
-                                # Defeat 1 Skeleton
-                                defeated_monster = skeletons[0]
-                                game_state.dungeon_dice.remove(defeated_monster)
-                                monsters.remove(defeated_monster)
-                                
-                                # Use companion
-                                if source == "party":
-                                    game_state.use_party_die(idx)
-                                    print(f"{companion} moved to Graveyard.")
-                                else:  # treasure
-                                    game_state.use_treasure(idx)
-                                    print(f"{companion.name} used and returned to treasure pool.")
-                                
-                                print(f"Defeated {defeated_monster}!")
-                                return True
-                            else:
-                                print("Invalid choice.")
-                                return False
-                        else:
-                            print("Invalid choice.")
-                            return False
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                        
-                else:
-                    # For Thieves and other companions, they can only defeat one monster
-                    print(f"\n{companion_type} can defeat:")
-                    for i, monster in enumerate(defeatable_monsters):
-                        print(f"{i+1}. {monster}")
-                    
-                    monster_choice = input("Choose monster to defeat (number): ").strip()
-                    try:
-                        monster_idx = int(monster_choice) - 1
-                        if 0 <= monster_idx < len(defeatable_monsters):
-                            defeated_monster = defeatable_monsters[monster_idx]
-                            
-                            # Remove monster from dungeon dice
-                            game_state.dungeon_dice.remove(defeated_monster)
-                            
-                            # Use companion
-                            if source == "party":
-                                game_state.use_party_die(idx)
-                                print(f"{companion} moved to Graveyard.")
-                            else:  # treasure
-                                game_state.use_treasure(idx)
-                                print(f"{companion.name} used and returned to treasure pool.")
-                            
-                            print(f"Defeated {defeated_monster}!")
-                            return True
-                        else:
-                            print("Invalid choice.")
-                            return False
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-            else:
-                print("Invalid choice.")
-                return False
-        except ValueError:
-            print("Invalid input.")
-            return False
-    
+        source, companion = choice
+
+        # Determine companion type
+        companion_type = COMPANION_TYPES[companion] if source == "treasure" else companion
+
+        # Apply specialty transformations if Minstrel/Bard specialty is active
+        if specialty_active and companion_type in [PartyDiceFace.THIEF, PartyDiceFace.MAGE]:
+            other_type = PartyDiceFace.MAGE if companion_type == PartyDiceFace.THIEF else PartyDiceFace.THIEF
+            say(f"\n✨ Minstrel/Bard specialty allows {companion_type} to be used as either {companion_type} or {other_type}!")
+            roles = [Option(companion_type, f"Use as {companion_type} (original abilities)"),
+                     Option(other_type, f"Use as {other_type}")]
+            role = policy.choose(game_state, Decision.COMPANION_ROLE, roles)
+            if role != companion_type:
+                say(f"✨ {companion_type} acts as {role}")
+                companion_type = role
+
+        # Special handling for Champions
+        if companion_type == PartyDiceFace.CHAMPION:
+            return MonsterPhase.champion_attack(game_state, source, companion, hero_card, specialty_active, policy)
+
+        # Fighters, Clerics and Mages may defeat ALL monsters of their type, or any single monster
+        group_type = GROUP_KILLS.get(companion_type)
+        say(f"\n{companion_type} can:")
+        options = [Option((monster_type, count), f"Defeat ALL {monster_type}s ({count} monster(s))"
+                          if monster_type == group_type else f"Defeat 1 {monster_type}")
+                   for monster_type, count in legal_values(game_state, Decision.MONSTER_TARGET, companion_type)]
+
+        monster_type, count = policy.choose(game_state, Decision.MONSTER_TARGET, options)
+        game_state.remove_dungeon_dice(monster_type, count)
+        if count > 1 or monster_type == group_type:
+            MonsterPhase.spend_companion(game_state, source, companion, f" after defeating {count} {monster_type}(s)")
+            say(f"Defeated {count} {monster_type}(s)!")
+        else:
+            MonsterPhase.spend_companion(game_state, source, companion)
+            say(f"Defeated {monster_type}!")
+        return True
+
+    @staticmethod
+    def champion_attack(game_state, source, companion, hero_card, specialty_active, policy):
+        """Use a Champion to defeat all monsters of a chosen type (two types for an Expert Bard)."""
+        monsters = game_state.dungeon_counts
+        bard_master_active = specialty_active and hero_card.current_rank == HeroRank.MASTER
+
+        if bard_master_active:
+            say(f"\n✨ Expert Bard's specialty active: Champion can defeat monsters of TWO different types! ✨")
+        say(f"\nChampion can defeat all monsters of a given type:")
+
+        options = [Option(monster_type, f"All {monster_type}s ({monsters[monster_type]} monster(s))")
+                   for monster_type in legal_values(game_state, Decision.CHAMPION_TARGET)]
+        selected_type = policy.choose(game_state, Decision.CHAMPION_TARGET, options)
+        selected_count = monsters[selected_type]
+        game_state.remove_dungeon_dice(selected_type, selected_count)
+        say(f"Champion defeats {selected_count} {selected_type}(s).")
+
+        # If Expert Bard is active, allow selecting a second monster type
+        remaining = [option for option in options if option.value != selected_type]
+        if bard_master_active and remaining:
+            say(f"\n✨ Expert Bard's specialty allows defeating a second monster type! ✨")
+            say(f"Remaining monster types:")
+            second_type = policy.choose(game_state, Decision.CHAMPION_TARGET, remaining + [Option(None, "Skip")])
+            if second_type is not None:
+                second_count = monsters[second_type]
+                game_state.remove_dungeon_dice(second_type, second_count)
+                say(f"✨ Champion also defeats {second_count} {second_type}(s)! ✨")
+                MonsterPhase.spend_companion(
+                    game_state, source, companion,
+                    f" after defeating {selected_count + second_count} monsters "
+                    f"({selected_count} {selected_type}s + {second_count} {second_type}s)")
+                return True
+            say("Skipping second monster type.")
+
+        MonsterPhase.spend_companion(game_state, source, companion, f" after defeating {selected_count} {selected_type}(s)")
+        return True
+
     @staticmethod
     def can_defeat_monster(companion_type, monster_type):
         """Check if a companion can defeat a specific monster type."""
-        if companion_type == PartyDiceFace.CHAMPION.value:
+        if companion_type == PartyDiceFace.CHAMPION:
             return True  # Champions can defeat any monster
-        
-        if monster_type == DungeonDiceFace.GOBLIN.value:
-            return companion_type in [PartyDiceFace.FIGHTER.value, PartyDiceFace.CLERIC.value, PartyDiceFace.MAGE.value, PartyDiceFace.THIEF.value]
-        elif monster_type == DungeonDiceFace.SKELETON.value:
-            return companion_type in [PartyDiceFace.FIGHTER.value, PartyDiceFace.CLERIC.value, PartyDiceFace.MAGE.value, PartyDiceFace.THIEF.value]
-        elif monster_type == DungeonDiceFace.OOZE.value:
-            return companion_type in [PartyDiceFace.FIGHTER.value, PartyDiceFace.CLERIC.value, PartyDiceFace.MAGE.value, PartyDiceFace.THIEF.value]
-        
+
+        if monster_type in MONSTER_FACES:
+            return companion_type in [PartyDiceFace.FIGHTER, PartyDiceFace.CLERIC, PartyDiceFace.MAGE, PartyDiceFace.THIEF]
+
         return False
-    
+
     @staticmethod
-    def can_defeat_monsters(game_state, monsters, hero_card, specialty_active):
+    def get_treasure_counts(game_state):
+        """Count the companion treasures acting as each party face."""
+        return game_state.player_treasure.companion_counts()
+
+    @staticmethod
+    def plan_defeat(game_state, hero_card, specialty_active):
+        """Find the cheapest way for the party and companion treasures to defeat every monster."""
+        champion_types = 2 if specialty_active and hero_card.current_rank == HeroRank.MASTER else 1
+        return solve_monsters(tuple(game_state.dungeon_counts), tuple(game_state.party_counts),
+                              tuple(MonsterPhase.get_treasure_counts(game_state)), champion_types, specialty_active)
+
+    @staticmethod
+    def can_defeat_monsters(game_state, hero_card):
         """Check if all monsters can be defeated with available companions."""
-        if not monsters:
-            return True
-        
-        # Create a copy of available companions
-        available_companions = []
-        
-        # Add party dice companions
-        for i, die in enumerate(game_state.party_dice):
-            if die != PartyDiceFace.SCROLL.value:  # Scrolls are not companions
-                available_companions.append(("party", i, die))
-        
-        # Add treasure companions
-        treasure_companions = game_state.get_usable_companions()
-        for idx, token in treasure_companions:
-            available_companions.append(("treasure", idx, token))
-        
-        if not available_companions:
-            return False
-        
-        # Create a copy of monsters to simulate defeat
-        remaining_monsters = monsters.copy()
-        
-        # Try to defeat monsters using available companions
-        for source, idx, companion in available_companions:
-            if not remaining_monsters:
-                break
-            
-            # Determine companion type
-            if source == "treasure":
-                companion_type = companion.get_companion_type()
-            else:
-                companion_type = companion
-            
-            # Apply specialty transformations
-            if specialty_active:
-                if companion_type == PartyDiceFace.THIEF.value:
-                    companion_type = PartyDiceFace.MAGE.value
-                elif companion_type == PartyDiceFace.MAGE.value:
-                    companion_type = PartyDiceFace.THIEF.value
-            
-            # Find monsters this companion can defeat
-            defeatable_monsters = [m for m in remaining_monsters if MonsterPhase.can_defeat_monster(companion_type, m)]
-            
-            if defeatable_monsters:
-                if companion_type == PartyDiceFace.CHAMPION.value:
-                    # Champions can defeat any number of monsters of a given type
-                    # For simulation, just remove one monster (the actual implementation will handle multiple)
-                    remaining_monsters.remove(defeatable_monsters[0])
-                elif companion_type == PartyDiceFace.FIGHTER.value:
-                    # Fighter defeats one Skeleton, one Ooze, or any number of Goblins
-                    goblins = [m for m in defeatable_monsters if m == DungeonDiceFace.GOBLIN.value]
-                    if goblins:
-                        # Remove all Goblins
-                        for monster in goblins:
-                            remaining_monsters.remove(monster)
-                    else:
-                        # Defeat one monster of any type they can handle
-                        remaining_monsters.remove(defeatable_monsters[0])
-                elif companion_type == PartyDiceFace.CLERIC.value:
-                    # Cleric defeats one Goblin, one Ooze, or any number of Skeletons
-                    skeletons = [m for m in defeatable_monsters if m == DungeonDiceFace.SKELETON.value]
-                    if skeletons:
-                        # Remove all Skeletons
-                        for monster in skeletons:
-                            remaining_monsters.remove(monster)
-                    else:
-                        # Defeat one monster of any type they can handle
-                        remaining_monsters.remove(defeatable_monsters[0])
-                elif companion_type == PartyDiceFace.MAGE.value:
-                    # Mage defeats one Goblin, one Skeleton, or any number of Oozes
-                    oozes = [m for m in defeatable_monsters if m == DungeonDiceFace.OOZE.value]
-                    if oozes:
-                        # Remove all Oozes
-                        for monster in oozes:
-                            remaining_monsters.remove(monster)
-                    else:
-                        # Defeat one monster of any type they can handle
-                        remaining_monsters.remove(defeatable_monsters[0])
-                else:
-                    # Other companions (like Thieves) can only defeat one monster
-                    remaining_monsters.remove(defeatable_monsters[0])
-        
-        return len(remaining_monsters) == 0
-    
+        return can_defeat_monsters(game_state, hero_card)
+
     @staticmethod
-    def use_companions_for_remaining_monsters(game_state, monsters, hero_card, specialty_active):
-        """Automatically use companions to defeat remaining monsters."""
-        if not monsters:
-            return True
-        
-        print("\n🤖 Automatically defeating remaining monsters...")
-        
-        # Create a copy of available companions
-        available_companions = []
-        
-        # Add party dice companions
-        for i, die in enumerate(game_state.party_dice):
-            if die != PartyDiceFace.SCROLL.value:  # Scrolls are not companions
-                available_companions.append(("party", i, die))
-        
-        # Add treasure companions
-        treasure_companions = game_state.get_usable_companions()
-        for idx, token in treasure_companions:
-            available_companions.append(("treasure", idx, token))
-        
-        if not available_companions:
+    def use_companions_for_remaining_monsters(game_state, hero_card, specialty_active):
+        """Automatically defeat the remaining monsters with the fewest and least valuable companions."""
+        plan = MonsterPhase.plan_defeat(game_state, hero_card, specialty_active)
+        if not plan.feasible:
             return False
-        
-        # Try to defeat monsters using available companions
-        for source, idx, companion in available_companions:
-            if not monsters:
-                break
-            
-            # Determine companion type
-            if source == "treasure":
-                companion_type = companion.get_companion_type()
-            else:
-                companion_type = companion
-            
-            # Apply specialty transformations
-            if specialty_active:
-                if companion_type == PartyDiceFace.THIEF.value:
-                    companion_type = PartyDiceFace.MAGE.value
-                elif companion_type == PartyDiceFace.MAGE.value:
-                    companion_type = PartyDiceFace.THIEF.value
-            
-            # Find monsters this companion can defeat
-            defeatable_monsters = [m for m in monsters if MonsterPhase.can_defeat_monster(companion_type, m)]
-            
-            if defeatable_monsters:
-                if companion_type == PartyDiceFace.CHAMPION.value:
-                    # Champions can defeat any number of monsters of a given type
-                    # For automatic defeat, just defeat one monster (the actual implementation will handle multiple)
-                    defeated_monster = defeatable_monsters[0]
-                    game_state.dungeon_dice.remove(defeated_monster)
-                    monsters.remove(defeated_monster)
-                    
-                    # Use companion
-                    if source == "party":
-                        game_state.use_party_die(idx)
-                        print(f"{companion} moved to Graveyard after defeating {defeated_monster}.")
-                    else:  # treasure
-                        game_state.use_treasure(idx)
-                        print(f"{companion.name} used and returned to treasure pool after defeating {defeated_monster}.")
-                    
-                elif companion_type == PartyDiceFace.FIGHTER.value:
-                    # Fighter defeats one Skeleton, one Ooze, or any number of Goblins
-                    goblins = [m for m in defeatable_monsters if m == DungeonDiceFace.GOBLIN.value]
-                    if goblins:
-                        # Defeat all Goblins
-                        for monster in goblins:
-                            game_state.dungeon_dice.remove(monster)
-                            monsters.remove(monster)
-                        
-                        # Use companion
-                        if source == "party":
-                            game_state.use_party_die(idx)
-                            print(f"{companion} moved to Graveyard after defeating {len(goblins)} Goblin(s).")
-                        else:  # treasure
-                            game_state.use_treasure(idx)
-                            print(f"{companion.name} used and returned to treasure pool after defeating {len(goblins)} Goblin(s).")
-                    else:
-                        # Defeat one monster of any type they can handle
-                        defeated_monster = defeatable_monsters[0]
-                        game_state.dungeon_dice.remove(defeated_monster)
-                        monsters.remove(defeated_monster)
-                        
-                        # Use companion
-                        if source == "party":
-                            game_state.use_party_die(idx)
-                            print(f"{companion} moved to Graveyard after defeating {defeated_monster}.")
-                        else:  # treasure
-                            game_state.use_treasure(idx)
-                            print(f"{companion.name} used and returned to treasure pool after defeating {defeated_monster}.")
-                    
-                elif companion_type == PartyDiceFace.CLERIC.value:
-                    # Cleric defeats one Goblin, one Ooze, or any number of Skeletons
-                    skeletons = [m for m in defeatable_monsters if m == DungeonDiceFace.SKELETON.value]
-                    if skeletons:
-                        # Defeat all Skeletons
-                        for monster in skeletons:
-                            game_state.dungeon_dice.remove(monster)
-                            monsters.remove(monster)
-                        
-                        # Use companion
-                        if source == "party":
-                            game_state.use_party_die(idx)
-                            print(f"{companion} moved to Graveyard after defeating {len(skeletons)} Skeleton(s).")
-                        else:  # treasure
-                            game_state.use_treasure(idx)
-                            print(f"{companion.name} used and returned to treasure pool after defeating {len(skeletons)} Skeleton(s).")
-                    else:
-                        # Defeat one monster of any type they can handle
-                        defeated_monster = defeatable_monsters[0]
-                        game_state.dungeon_dice.remove(defeated_monster)
-                        monsters.remove(defeated_monster)
-                        
-                        # Use companion
-                        if source == "party":
-                            game_state.use_party_die(idx)
-                            print(f"{companion} moved to Graveyard after defeating {defeated_monster}.")
-                        else:  # treasure
-                            game_state.use_treasure(idx)
-                            print(f"{companion.name} used and returned to treasure pool after defeating {defeated_monster}.")
-                    
-                elif companion_type == PartyDiceFace.MAGE.value:
-                    # Mage defeats one Goblin, one Skeleton, or any number of Oozes
-                    oozes = [m for m in defeatable_monsters if m == DungeonDiceFace.OOZE.value]
-                    if oozes:
-                        # Defeat all Oozes
-                        for monster in oozes:
-                            game_state.dungeon_dice.remove(monster)
-                            monsters.remove(monster)
-                        
-                        # Use companion
-                        if source == "party":
-                            game_state.use_party_die(idx)
-                            print(f"{companion} moved to Graveyard after defeating {len(oozes)} Ooze(s).")
-                        else:  # treasure
-                            game_state.use_treasure(idx)
-                            print(f"{companion.name} used and returned to treasure pool after defeating {len(oozes)} Ooze(s).")
-                    else:
-                        # Defeat one monster of any type they can handle
-                        defeated_monster = defeatable_monsters[0]
-                        game_state.dungeon_dice.remove(defeated_monster)
-                        monsters.remove(defeated_monster)
-                        
-                        # Use companion
-                        if source == "party":
-                            game_state.use_party_die(idx)
-                            print(f"{companion} moved to Graveyard after defeating {defeated_monster}.")
-                        else:  # treasure
-                            game_state.use_treasure(idx)
-                            print(f"{companion.name} used and returned to treasure pool after defeating {defeated_monster}.")
-                    
-                else:
-                    # Other companions (like Thieves) can only defeat one monster
-                    defeated_monster = defeatable_monsters[0]
-                    game_state.dungeon_dice.remove(defeated_monster)
-                    monsters.remove(defeated_monster)
-                    
-                    # Use companion
-                    if source == "party":
-                        game_state.use_party_die(idx)
-                        print(f"{companion} moved to Graveyard after defeating {defeated_monster}.")
-                    else:  # treasure
-                        game_state.use_treasure(idx)
-                        print(f"{companion.name} used and returned to treasure pool after defeating {defeated_monster}.")
-        
-        return len(monsters) == 0 
\ No newline at end of file
+
+        say("\n🤖 Automatically defeating remaining monsters...")
+        for source, face, defeats in plan.steps:
+            for monster_type, count in defeats:
+                game_state.remove_dungeon_dice(monster_type, count)
+            companion = COMPANION_TREASURES[face] if source == "treasure" else face
+            defeated = " and ".join(f"{count} {monster_type}(s)" for monster_type, count in defeats)
+            MonsterPhase.spend_companion(game_state, source, companion, f" after defeating {defeated}")
+        return True
@@ -0,0 +1,122 @@
+from collections import namedtuple
+from functools import lru_cache
+from itertools import product
+from dice import PartyDiceFace, DungeonDiceFace, MONSTER_FACES
+
+# Companions that defeat any number of one monster type
+GROUP_KILLERS = {
+    DungeonDiceFace.GOBLIN: (PartyDiceFace.FIGHTER,),
+    DungeonDiceFace.SKELETON: (PartyDiceFace.CLERIC,),
+    DungeonDiceFace.OOZE: (PartyDiceFace.MAGE,),
+}
+
+# Party faces that can defeat a single monster of any type
+SINGLE_KILLERS = (PartyDiceFace.FIGHTER, PartyDiceFace.MAGE, PartyDiceFace.CLERIC, PartyDiceFace.THIEF)
+
+# Cost of spending one companion. Treasures are kept over dice because they score at the end
+# of the game; among dice the more versatile Thieves and Champions are kept over the rest.
+DIE_COSTS = {
+    PartyDiceFace.FIGHTER: 100,
+    PartyDiceFace.MAGE: 100,
+    PartyDiceFace.CLERIC: 100,
+    PartyDiceFace.THIEF: 101,
+    PartyDiceFace.CHAMPION: 103,
+}
+TREASURE_COST = 1000
+
+# Every kind of companion that can defeat a single monster as (cost, source, face), cheapest first
+UNIT_KINDS = sorted([(DIE_COSTS[face], "party", face) for face in SINGLE_KILLERS] +
+                    [(TREASURE_COST, "treasure", face) for face in SINGLE_KILLERS])
+
+SWEEP, GROUP, SINGLE = range(3)
+
+# Result of the solver. Each step is (source, face, ((monster type, count), ...)):
+# spend one companion from "party" or "treasure" showing `face` to defeat those monsters.
+MonsterPlan = namedtuple("MonsterPlan", ["feasible", "cost", "steps"])
+
+NO_PLAN = MonsterPlan(False, None, ())
+
+@lru_cache(maxsize=1 << 16)
+def solve_monsters(monsters, party, treasures, champion_types=1, thief_as_mage=False):
+    """Find the cheapest way to defeat every monster, or report that it can't be done.
+
+    `monsters` is the dungeon count vector, `party` the party count vector and
+    `treasures` the number of companion treasures acting as each party face.
+    A Champion sweeps `champion_types` monster types; with `thief_as_mage`
+    Thieves may also defeat every Ooze (the Minstrel/Bard specialty).
+    """
+    present = [m for m in MONSTER_FACES if monsters[m]]
+    if not present:
+        return MonsterPlan(True, 0, ())
+
+    available = [party[face] if source == "party" else treasures[face] for cost, source, face in UNIT_KINDS]
+    champions = party[PartyDiceFace.CHAMPION]
+    ooze_killers = GROUP_KILLERS[DungeonDiceFace.OOZE] + ((PartyDiceFace.THIEF,) if thief_as_mage else ())
+    killers = {m: ooze_killers if m == DungeonDiceFace.OOZE else GROUP_KILLERS[m] for m in present}
+
+    # Each monster type is swept by a Champion, group-killed by one companion or defeated one by one.
+    # A group kill of a single monster is never cheaper than defeating it with the cheapest companion.
+    allowed = []
+    for m in present:
+        modes = [SINGLE]
+        if champions:
+            modes.append(SWEEP)
+        if monsters[m] > 1 and any(available[k] and face in killers[m] for k, (_, _, face) in enumerate(UNIT_KINDS)):
+            modes.append(GROUP)
+        allowed.append(modes)
+
+    best_cost, best_modes = None, None
+    for modes in product(*allowed):
+        plan = _apply_modes(modes, present, monsters, available, champions, champion_types, killers)
+        if plan is not None and (best_cost is None or plan[0] < best_cost):
+            best_cost, best_modes = plan[0], modes
+
+    if best_modes is None:
+        return NO_PLAN
+    return MonsterPlan(True, best_cost,
+                       _apply_modes(best_modes, present, monsters, available, champions, champion_types, killers, True)[1])
+
+def _apply_modes(modes, present, monsters, available, champions, champion_types, killers, with_steps=False):
+    """Cost (and optionally steps) of defeating each present monster type the given way, or None."""
+    swept = [m for m, mode in zip(present, modes) if mode == SWEEP]
+    needed = -(-len(swept) // champion_types)
+    if needed > champions:
+        return None
+
+    cost = needed * DIE_COSTS[PartyDiceFace.CHAMPION]
+    steps = []
+    if with_steps:
+        steps = [("party", PartyDiceFace.CHAMPION, tuple((m, monsters[m]) for m in swept[i:i + champion_types]))
+                 for i in range(0, len(swept), champion_types)]
+    remaining = list(available)
+
+    singles = 0
+    for m, mode in zip(present, modes):
+        if mode == SINGLE:
+            singles += monsters[m]
+        elif mode == GROUP:
+            for kind, (unit_cost, source, face) in enumerate(UNIT_KINDS):
+                if remaining[kind] and face in killers[m]:
+                    break
+            else:
+                return None
+            remaining[kind] -= 1
+            cost += unit_cost
+            if with_steps:
+                steps.append((source, face, ((m, monsters[m]),)))
+
+    if singles > sum(remaining):
+        return None
+    # The cheapest companions left each defeat one monster
+    kind = 0
+    for m, mode in zip(present, modes):
+        if mode != SINGLE:
+            continue
+        for _ in range(monsters[m]):
+            while not remaining[kind]:
+                kind += 1
+            remaining[kind] -= 1
+            cost += UNIT_KINDS[kind][0]
+            if with_steps:
+                steps.append((UNIT_KINDS[kind][1], UNIT_KINDS[kind][2], ((m, 1),)))
+    return cost, tuple(steps)
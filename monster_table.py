@@ -0,0 +1,107 @@
+from itertools import product
+import numpy as np
+from dice import PartyDiceFace, DungeonDiceFace, MONSTER_FACES
+from monster_solver import GROUP_KILLERS
+
+# The party faces that fight monsters, in table order (the same order as their face values)
+COMPANION_FACES = (PartyDiceFace.FIGHTER, PartyDiceFace.MAGE, PartyDiceFace.CLERIC,
+                   PartyDiceFace.THIEF, PartyDiceFace.CHAMPION)
+MAX_DICE = 7
+
+# Count vectors are packed as base-8 digits; the index arrays map a packed key to its table row
+RADIX = MAX_DICE + 1
+
+# Hero specialties that change combat, one table plane each
+SPECIALTY_NONE, SPECIALTY_MINSTREL, SPECIALTY_BARD = range(3)
+
+SWEEP, GROUP, SINGLE = range(3)
+
+def multisets(n_faces, max_total):
+    """All count vectors over `n_faces` faces with at most `max_total` dice, in lexicographic order."""
+    if n_faces == 0:
+        return [()]
+    return [(first,) + rest for first in range(max_total + 1) for rest in multisets(n_faces - 1, max_total - first)]
+
+def pack(counts):
+    """Pack a count vector into an integer key."""
+    key = 0
+    for count in counts:
+        key = key * RADIX + count
+    return key
+
+def build_index(vectors):
+    """Direct-address table from packed key to row number (-1 for vectors not in the table)."""
+    index = np.full(RADIX ** len(vectors[0]), -1, dtype=np.int16)
+    for row, counts in enumerate(vectors):
+        index[pack(counts)] = row
+    return index
+
+# 792 companion vectors and 120 monster vectors
+COMPANION_VECTORS = multisets(len(COMPANION_FACES), MAX_DICE)
+MONSTER_VECTORS = multisets(len(MONSTER_FACES), MAX_DICE)
+COMPANION_INDEX = build_index(COMPANION_VECTORS)
+MONSTER_INDEX = build_index(MONSTER_VECTORS)
+
+_table = None
+
+def build_table():
+    """Compute whether every companion vector defeats every monster vector, for each specialty.
+
+    Returns a (3, 792, 120) bool array. Each monster type is swept by a Champion,
+    group-killed by one matching companion or defeated one at a time by any other
+    companion; an entry is True if some such choice is affordable.
+    """
+    companions = np.array(COMPANION_VECTORS, dtype=np.int16)[:, :, None]
+    monsters = np.array(MONSTER_VECTORS, dtype=np.int16)[None, :, :]
+    fighters, mages, clerics, thieves, champions = (companions[:, i] for i in range(len(COMPANION_FACES)))
+    singles_pool = fighters + mages + clerics + thieves
+
+    table = np.zeros((3, len(COMPANION_VECTORS), len(MONSTER_VECTORS)), dtype=bool)
+    for specialty in (SPECIALTY_NONE, SPECIALTY_MINSTREL, SPECIALTY_BARD):
+        champion_types = 2 if specialty == SPECIALTY_BARD else 1
+        killers = {face: companions[:, COMPANION_FACES.index(group_face[0])] for face, group_face in GROUP_KILLERS.items()}
+        if specialty != SPECIALTY_NONE:
+            killers[DungeonDiceFace.OOZE] = killers[DungeonDiceFace.OOZE] + thieves  # Thieves may be used as Mages
+
+        for modes in product((SWEEP, GROUP, SINGLE), repeat=len(MONSTER_FACES)):
+            present = [monsters[:, :, i] > 0 for i in range(len(MONSTER_FACES))]
+            swept = sum(present[i] & (mode == SWEEP) for i, mode in enumerate(modes))
+            ok = -(-swept // champion_types) <= champions
+            groups = 0
+            singles = 0
+            for i, (monster, mode) in enumerate(zip(MONSTER_FACES, modes)):
+                if mode == GROUP:
+                    ok = ok & ((killers[monster] > 0) | ~present[i])
+                    groups = groups + present[i]
+                elif mode == SINGLE:
+                    singles = singles + monsters[:, :, i]
+            table[specialty] |= ok & (singles <= singles_pool - groups)
+    return table
+
+def feasibility_table():
+    """The (3, 792, 120) feasibility table, built on first use."""
+    global _table
+    if _table is None:
+        _table = build_table()
+    return _table
+
+def can_defeat_all(monsters, companions, specialty=SPECIALTY_NONE):
+    """Check with one table lookup if `companions` can defeat every monster.
+
+    `monsters` is the dungeon count vector and `companions` the party count
+    vector with companion treasures already added to their faces.
+    """
+    return can_defeat_counts(monsters[0], monsters[1], monsters[2], companions[0], companions[1],
+                             companions[2], companions[3], companions[4], specialty)
+
+def can_defeat_counts(goblins, skeletons, oozes, fighters, mages, clerics, thieves, champions, specialty=SPECIALTY_NONE):
+    """`can_defeat_all` on counts already unpacked, for callers that can read them without building a vector."""
+    # Every companion defeats at least one monster, so only smaller parties need the table
+    if fighters + mages + clerics + thieves + champions >= goblins + skeletons + oozes:
+        return True
+
+    # pack() inlined, this is the hot path
+    companion_row = COMPANION_INDEX.item((((fighters * RADIX + mages) * RADIX + clerics) * RADIX + thieves) * RADIX + champions)
+    monster_row = MONSTER_INDEX.item((goblins * RADIX + skeletons) * RADIX + oozes)
+    table = _table if _table is not None else feasibility_table()
+    return table.item((specialty * table.shape[1] + companion_row) * table.shape[2] + monster_row)
@@ -0,0 +1,150 @@
+import random
+from collections import namedtuple
+from enum import Enum
+from dice import PartyDiceFace
+from render import say, flush
+
+# Dungeon dice in the game; the Dragon's Lair holds the ones not rolled
+DUNGEON_DICE = 7
+
+class Decision(Enum):
+    MONSTER_ACTION = "monster_action"
+    COMPANION = "companion"
+    COMPANION_ROLE = "companion_role"
+    MONSTER_TARGET = "monster_target"
+    CHAMPION_TARGET = "champion_target"
+    LOOT_ACTION = "loot_action"
+    CHEST_COMPANION = "chest_companion"
+    QUAFF_DIE = "quaff_die"
+    POTION_FACE = "potion_face"
+    DRAGON_ACTION = "dragon_action"
+    DRAGON_SCROLL = "dragon_scroll"
+    DRAGON_COMPANION = "dragon_companion"
+    REGROUP_ACTION = "regroup_action"
+    SCROLL_TARGET = "scroll_target"
+    TREASURE = "treasure"
+    ELIXIR_FACE = "elixir_face"
+    REVIVE_DIE = "revive_die"
+    DISCARD_TREASURE = "discard_treasure"
+
+# A legal choice at a decision point: `value` is handed back to the game, `label` is for display
+Option = namedtuple("Option", ["value", "label"])
+
+PROMPTS = {
+    Decision.MONSTER_ACTION: "Choose action (number): ",
+    Decision.COMPANION: "Choose companion to use (number): ",
+    Decision.COMPANION_ROLE: "Choose how to use this companion (number): ",
+    Decision.MONSTER_TARGET: "Choose option (number): ",
+    Decision.CHAMPION_TARGET: "Choose monster type to defeat (number): ",
+    Decision.LOOT_ACTION: "Choose action (number): ",
+    Decision.CHEST_COMPANION: "Choose companion (number): ",
+    Decision.QUAFF_DIE: "Choose Party die (number): ",
+    Decision.POTION_FACE: "Choose face (number): ",
+    Decision.DRAGON_ACTION: "Choose action (number): ",
+    Decision.DRAGON_SCROLL: "Use a Scroll before selecting companions? (number): ",
+    Decision.DRAGON_COMPANION: "Choose companion (number): ",
+    Decision.REGROUP_ACTION: "Choose action (number): ",
+    Decision.SCROLL_TARGET: "Choose dice to re-roll (number): ",
+    Decision.TREASURE: "Choose treasure to use (number): ",
+    Decision.ELIXIR_FACE: "Choose face (number): ",
+    Decision.REVIVE_DIE: "Choose companion (number): ",
+    Decision.DISCARD_TREASURE: "Choose treasure to discard (number): ",
+}
+
+class Policy:
+    """Base class for anything that makes the player's decisions.
+
+    The game calls `choose` at every decision point with the current game state,
+    the `Decision` being made and the list of legal `Option`s, and expects one of
+    the option values back. `seed` seeds the policy's own random stream, which
+    policies may use to break ties. Interactive policies are offered a few
+    escape hatches, such as cancelling a Scroll, that bots have no use for.
+    """
+    interactive = False
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose(self, game_state, decision, options):
+        raise NotImplementedError
+
+class CLIPolicy(Policy):
+    """Interactive policy that asks a human at the terminal."""
+    interactive = True
+
+    def choose(self, game_state, decision, options):
+        if decision == Decision.REGROUP_ACTION and game_state.selected_hero_card:
+            self.show_regroup_values(game_state)
+        for i, option in enumerate(options, 1):
+            say(f"{i}. {option.label}")
+
+        prompt = PROMPTS.get(decision, "Choose (number): ")
+        while True:
+            flush()
+            try:
+                choice_idx = int(input(prompt).strip()) - 1
+                if 0 <= choice_idx < len(options):
+                    return options[choice_idx].value
+                say(f"Invalid choice. Please enter a number between 1 and {len(options)}.")
+            except ValueError:
+                say("Invalid input. Please enter a number.")
+
+    @staticmethod
+    def show_regroup_values(game_state):
+        """Print the expected Experience of retiring and of seeking glory."""
+        from delve_value import regroup_values
+        values = regroup_values(game_state, game_state.selected_hero_card)
+        say(f"📈 Expected Experience: retire {values['retire']:.2f}, seek glory {values['seek_glory']:.2f}")
+
+class RandomPolicy(Policy):
+    """Policy that picks uniformly among the legal options."""
+    def choose(self, game_state, decision, options):
+        return self.rng.choice(options).value
+
+class GreedyPolicy(Policy):
+    """Takes the most productive action of each phase and seeks glory while every Dungeon die has a companion to face it.
+
+    Phase actions follow `PREFERENCES`; every other choice is random among the
+    options that do something (Cancel and Skip are never picked).
+    """
+    PREFERENCES = {
+        Decision.MONSTER_ACTION: ("auto", "ultimate", "companion", "flee"),
+        Decision.LOOT_ACTION: ("chests", "potions", "end"),
+        Decision.DRAGON_ACTION: ("battle", "flee"),
+        Decision.DRAGON_SCROLL: (False,),
+    }
+
+    def choose(self, game_state, decision, options):
+        if decision == Decision.REGROUP_ACTION:
+            return "seek_glory" if self.should_seek(game_state) else "retire"
+        values = [option.value for option in options]
+        for preferred in self.PREFERENCES.get(decision, ()):
+            if preferred in values:
+                return preferred
+        useful = [value for value in values if value is not None]
+        return self.rng.choice(useful or values)
+
+    def should_seek(self, game_state):
+        """Whether to seek glory at this Regroup Phase."""
+        companions = (game_state.party_size - game_state.party_counts[PartyDiceFace.SCROLL] +
+                      sum(game_state.player_treasure.companion_counts()))
+        return companions >= min(game_state.level + 1, DUNGEON_DICE - game_state.dragons_lair)
+
+class LookaheadPolicy(GreedyPolicy):
+    """Plays like GreedyPolicy but seeks glory when the one-step lookahead of `delve_value` favours it.
+
+    It scores about a point a game more than GreedyPolicy, and plays more than ten times fewer games a second.
+    """
+    def should_seek(self, game_state):
+        from delve_value import regroup_values
+        values = regroup_values(game_state, game_state.selected_hero_card)
+        return values["seek_glory"] > values["retire"]
+
+class RetireAtLevelPolicy(GreedyPolicy):
+    """Plays like GreedyPolicy but always seeks glory below `level` and retires on reaching it."""
+    def __init__(self, seed=None, level=3):
+        super().__init__(seed)
+        self.level = level
+
+    def should_seek(self, game_state):
+        return game_state.level < self.level
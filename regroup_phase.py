@@ -1,304 +1,211 @@
-from dice import PartyDiceFace, DungeonDiceFace, DiceManager
-from hero import HeroRank
-from treasure import TreasureType
-import random
+from actions import legal_values
+from dice import PartyDiceFace, DungeonDiceFace, DIE_SIDES
+from policy import Decision, Option
+from scroll import ScrollActions
+from render import say, display
 
 class RegroupPhase:
     @staticmethod
-    def execute(game_state, hero_card):
+    def execute(game_state, hero_card, policy):
         """Execute the regroup phase."""
-        print("\n" + "="*50)
-        print("🔄 REGROUP PHASE 🔄".center(50))
-        print("="*50)
+        say("\n" + "="*50)
+        say("🔄 REGROUP PHASE 🔄".center(50))
+        say("="*50)
         
-        # Display current game state
-        print("\nGame State:")
-        print("Party Dice:")
-        # Count dice types in the party (only actual party dice, not treasure companions)
-        dice_counts = {}
-        for die in game_state.party_dice:
-            dice_counts[die] = dice_counts.get(die, 0) + 1
-        
-        for die_type, count in dice_counts.items():
-            print(f"- {die_type}: {count} dice")
+        while True:
+            RegroupPhase.print_state(game_state)
+            
+            # Check for "Stuff of Legend" - if level 10 was just cleared, force retirement
+            if game_state.level == 10:
+                return RegroupPhase.stuff_of_legend(game_state)
+            
+            say("Choose your Regroup action:")
+            choice = policy.choose(game_state, Decision.REGROUP_ACTION, RegroupPhase.get_actions(game_state))
+            if choice == "retire":
+                return RegroupPhase.retire_to_tavern(game_state, forced_retirement=False)
+            elif choice == "seek_glory":
+                return RegroupPhase.seek_glory(game_state)
+            else:  # scroll
+                RegroupPhase.use_scroll(game_state, policy)
+    
+    @staticmethod
+    def get_dice_to_roll(game_state):
+        """Number of Dungeon dice the next level will roll."""
+        total_dungeon_dice = 7  # Total dice in the game
+        available_dice = total_dungeon_dice - game_state.dragons_lair
+        return min(game_state.level + 1, available_dice)
+    
+    @staticmethod
+    def get_actions(game_state):
+        """Get the legal Regroup Phase actions."""
+        labels = {
+            "retire": "Retire to the Tavern (End delve and gain Experience)",
+            "seek_glory": f"Seek Glory (Challenge dungeon level {game_state.level + 1} "
+                          f"with {RegroupPhase.get_dice_to_roll(game_state)} Dungeon dice)",
+            "scroll": "Use Scroll to Re-roll Dice",
+        }
+        return [Option(action, labels[action]) for action in legal_values(game_state, Decision.REGROUP_ACTION)]
+    
+    @staticmethod
+    @display
+    def print_state(game_state):
+        """Display the current game state."""
+        say("\nGame State:")
+        say("Party Dice:")
+        # Only actual party dice, not treasure companions
+        for die_type, count in game_state.party_faces():
+            say(f"- {die_type}: {count} dice")
         
         # Calculate total companions (only actual party dice)
-        total_companions = len(game_state.party_dice)
-        print(f"Total Companions: {total_companions}")
-        print(f"Total Scrolls: {dice_counts.get('Scroll', 0)}")
+        total_companions = game_state.party_size
+        say(f"Total Companions: {total_companions}")
+        say(f"Total Scrolls: {game_state.party_counts[PartyDiceFace.SCROLL]}")
         
         # Show treasure companions separately for clarity
         treasure_companions = game_state.get_usable_companions()
         if treasure_companions:
-            print("\nTreasure Companions:")
-            for idx, token in treasure_companions:
-                print(f"- {token.name} (acts as {token.get_companion_type()})")
+            say("\nTreasure Companions:")
+            for token in treasure_companions:
+                say(f"- {token.name} (acts as {token.get_companion_type()})")
         
-        print("\nGraveyard:")
-        if not game_state.graveyard:
-            print("- Empty")
+        say("\nGraveyard:")
+        if not game_state.graveyard_size:
+            say("- Empty")
         else:
-            # Count dice types in the graveyard
-            graveyard_counts = {}
-            for die in game_state.graveyard:
-                graveyard_counts[die] = graveyard_counts.get(die, 0) + 1
-            
-            for die_type, count in graveyard_counts.items():
-                print(f"- {die_type}: {count} dice")
-        
-        print("\nDungeon Dice:")
-        # Count dungeon dice types
-        dungeon_counts = {}
-        for die in game_state.dungeon_dice:
-            dungeon_counts[die] = dungeon_counts.get(die, 0) + 1
+            for die_type, count in game_state.graveyard_faces():
+                say(f"- {die_type}: {count} dice")
         
-        monster_count = sum(count for die_type, count in dungeon_counts.items() 
-                          if die_type in ['Goblin', 'Skeleton', 'Ooze', 'Dragon'])
-        print(f"Total Monsters: {monster_count}")
-        print(f"Total Chests: {dungeon_counts.get('Chest', 0)}")
-        print(f"Total Potions: {dungeon_counts.get('Potion', 0)}")
+        say("\nDungeon Dice:")
+        say(f"Total Monsters: {game_state.monster_count}")
+        say(f"Total Chests: {game_state.dungeon_counts[DungeonDiceFace.CHEST]}")
+        say(f"Total Potions: {game_state.dungeon_counts[DungeonDiceFace.POTION]}")
         
-        print(f"\n🐉 Dragon's Lair: {len(game_state.dragons_lair)} dragon dice")
+        say(f"\n🐉 Dragon's Lair: {game_state.dragons_lair} dragon dice")
         
-        print(f"\n💎 Collected Treasures:")
+        say(f"\n💎 Collected Treasures:")
         treasures = game_state.get_available_treasures()
         if treasures:
             for treasure in treasures:
-                print(f"  ▫️ {treasure.name} - {treasure.get_description()}")
+                say(f"  ▫️ {treasure.name} - {treasure.get_description()}")
         else:
-            print("  ▫️ None")
-        
-        print(f"\n📊 Resources:")
-        print(f"  ▫️ Treasure Tokens: {game_state.treasure_tokens}")
-        print(f"  ▫️ Experience Tokens: {game_state.experience_tokens}")
+            say("  ▫️ None")
         
-        print(f"\nCurrent Level: {game_state.level}\n")
+        say(f"\n📊 Resources:")
+        say(f"  ▫️ Treasure Tokens: {game_state.treasure_tokens}")
+        say(f"  ▫️ Experience Tokens: {game_state.experience_tokens}")
         
-        # Check for "Stuff of Legend" - if level 10 was just cleared, force retirement
-        if game_state.level == 10:
-            print("\n🏆 STUFF OF LEGEND! 🏆")
-            print("You've cleared the dungeon at Level 10!")
-            print("This is a legendary achievement!")
-            print("The Adventurer must Retire! They collect 10 Experience tokens.")
-            print("The delve is over.")
-            
-            # Award 10 experience tokens
-            game_state.experience_tokens += 10
-            print(f"You gain 10 Experience tokens for this legendary feat!")
-            print(f"Total Experience tokens: {game_state.experience_tokens}")
-            
-            # Return dragons to available pool if any
-            if game_state.dragons_lair:
-                print(f"\nReturning {len(game_state.dragons_lair)} Dragon dice to the available pool.")
-                game_state.dragons_lair = []
-            
-            return False  # End the delve
-        
-        # Check if scrolls are available
-        scrolls_available = [i for i, die in enumerate(game_state.party_dice) if die == PartyDiceFace.SCROLL.value]
-        
-        print("Choose your Regroup action:")
-        print("1) Retire to the Tavern (End delve and gain Experience)")
-        print("2) Seek Glory (Challenge the next dungeon level)")
-        if scrolls_available:
-            print("3) Use Scroll to Re-roll Dice")
+        say(f"\nCurrent Level: {game_state.level}\n")
+    
+    @staticmethod
+    def stuff_of_legend(game_state):
+        """Clearing level 10 forces a legendary retirement."""
+        say("\n🏆 STUFF OF LEGEND! 🏆")
+        say("You've cleared the dungeon at Level 10!")
+        say("This is a legendary achievement!")
+        say("The Adventurer must Retire! They collect 10 Experience tokens.")
+        say("The delve is over.")
+        
+        # Award 10 experience tokens
+        game_state.experience_tokens += 10
+        say(f"You gain 10 Experience tokens for this legendary feat!")
+        say(f"Total Experience tokens: {game_state.experience_tokens}")
+        
+        # Return dragons to available pool if any
+        if game_state.dragons_lair:
+            say(f"\nReturning {game_state.dragons_lair} Dragon dice to the available pool.")
+            game_state.dragons_lair = 0
         
-        while True:
-            try:
-                choice = input("Choose action (number): ").strip()
-                if choice == "1":
-                    return RegroupPhase.retire_to_tavern(game_state, forced_retirement=False)
-                elif choice == "2":
-                    return RegroupPhase.seek_glory(game_state)
-                elif choice == "3" and scrolls_available:
-                    RegroupPhase.use_scroll(game_state)
-                    # Re-display the game state after scroll usage
-                    RegroupPhase.execute(game_state, hero_card)
-                    return True
-                else:
-                    max_choice = "3" if scrolls_available else "2"
-                    print(f"Invalid choice. Please enter 1-{max_choice}.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+        return False  # End the delve
     
     @staticmethod
     def retire_to_tavern(game_state, forced_retirement):
         """End the delve and collect experience."""
         # Show congratulatory message and party status first
-        print("\n" + "="*50)
-        print("🎉 CONGRATULATIONS! THE DUNGEON HAS BEEN CLEARED! 🎉".center(50))
-        print("="*50)
-        
-        print("\nFinal Party Status:")
-        print("Active Party:")
-        dice_counts = {}
-        for die in game_state.party_dice:
-            dice_counts[die] = dice_counts.get(die, 0) + 1
-        for die_face, count in dice_counts.items():
-            print(f"- {die_face}: {count} dice")
-        
-        print("\nGraveyard:")
-        if not game_state.graveyard:
-            print("- Empty")
-        else:
-            # Count dice types in the graveyard
-            graveyard_counts = {}
-            for die in game_state.graveyard:
-                graveyard_counts[die] = graveyard_counts.get(die, 0) + 1
-            
-            for die_type, count in graveyard_counts.items():
-                print(f"- {die_type}: {count} dice")
-        
-        # Show available treasures
-        print("\nAvailable Treasures:")
-        treasures = game_state.get_available_treasures()
-        if treasures:
-            for treasure in treasures:
-                print(f"- {treasure.name}")
-                print(f"  Effect: {treasure.get_description()}")
-        else:
-            print("- None")
-            
-        print("\n" + "="*50)
-        print("RETURNING TO TAVERN".center(50))
-        print("="*50)
+        RegroupPhase.show_final_party(game_state)
         
         if forced_retirement:
-            print("\nLegendary retirement at level 10!")
+            say("\nLegendary retirement at level 10!")
             exp_gained = 10
         else:
-            print("\nYou retire to the tavern, ending this delve.")
+            say("\nYou retire to the tavern, ending this delve.")
             exp_gained = game_state.level
             
         # Gain experience based on current level
         game_state.experience_tokens += exp_gained
-        print(f"You gain {exp_gained} Experience tokens for reaching level {game_state.level}!")
-        print(f"Total Experience tokens: {game_state.experience_tokens}")
+        say(f"You gain {exp_gained} Experience tokens for reaching level {game_state.level}!")
+        say(f"Total Experience tokens: {game_state.experience_tokens}")
         
         # Return all dungeon dice to available pool
         if game_state.dragons_lair:
-            print(f"\nReturning {len(game_state.dragons_lair)} Dragon dice to the available pool.")
-            game_state.dragons_lair = []
+            say(f"\nReturning {game_state.dragons_lair} Dragon dice to the available pool.")
+            game_state.dragons_lair = 0
         
         # End this delve
         return False
     
+    @staticmethod
+    @display
+    def show_final_party(game_state):
+        """Display the party, graveyard and treasures the adventurer retires with."""
+        say("\n" + "="*50)
+        say("🎉 CONGRATULATIONS! THE DUNGEON HAS BEEN CLEARED! 🎉".center(50))
+        say("="*50)
+        
+        say("\nFinal Party Status:")
+        say("Active Party:")
+        for die_face, count in game_state.party_faces():
+            say(f"- {die_face}: {count} dice")
+        
+        say("\nGraveyard:")
+        if not game_state.graveyard_size:
+            say("- Empty")
+        else:
+            for die_type, count in game_state.graveyard_faces():
+                say(f"- {die_type}: {count} dice")
+        
+        # Show available treasures
+        say("\nAvailable Treasures:")
+        treasures = game_state.get_available_treasures()
+        if treasures:
+            for treasure in treasures:
+                say(f"- {treasure.name}")
+                say(f"  Effect: {treasure.get_description()}")
+        else:
+            say("- None")
+            
+        say("\n" + "="*50)
+        say("RETURNING TO TAVERN".center(50))
+        say("="*50)
+
     @staticmethod
     def seek_glory(game_state):
         """Continue to the next dungeon level."""
+        # Calculate available dice before the level changes
+        dice_to_roll = RegroupPhase.get_dice_to_roll(game_state)
+        
         # Increase dungeon level
         game_state.level += 1
-        print(f"\nProceeding to dungeon level {game_state.level}...")
+        say(f"\nProceeding to dungeon level {game_state.level}...")
         
-        # Calculate available dice
-        total_dungeon_dice = 7  # Total dice in the game
-        available_dice = total_dungeon_dice - len(game_state.dragons_lair)
-        dice_to_roll = min(game_state.level, available_dice)
-        
-        print(f"\nWARNING! The Dungeon Lord will roll {dice_to_roll} Dungeon dice.")
-        print("Once rolled, you must defeat all monsters and possibly the Dragon,")
-        print("or you must Flee, gaining NO Experience for this delve!")
-        print("There is no turning back once the Dungeon dice are cast!")
-        
-        proceed = input("\nDo you wish to proceed? (y/n): ").lower().strip()
-        if proceed != 'y':
-            print("Wise choice. You retire to the tavern.")
-            return RegroupPhase.retire_to_tavern(game_state, forced_retirement=False)
+        say(f"\nWARNING! The Dungeon Lord rolls {dice_to_roll} Dungeon dice.")
+        say("Once rolled, you must defeat all monsters and possibly the Dragon,")
+        say("or you must Flee, gaining NO Experience for this delve!")
         
         # Roll dungeon dice
-        game_state.dungeon_dice = []  # Clear previous dice
-        
-        dice_manager = DiceManager()
-        new_dice = dice_manager.roll_dungeon_dice(dice_to_roll)
+        game_state.dungeon_counts = [0] * DIE_SIDES  # Clear previous dice
         
-        # Handle dragon dice separately
-        for die in new_dice:
-            if die == DungeonDiceFace.DRAGON.value:
-                game_state.dragons_lair.append(die)
-                print("A Dragon appears! The die moves to the Dragon's Lair.")
-            else:
-                game_state.dungeon_dice.append(die)
+        # Dragon dice go to the Dragon's Lair
+        dragons = game_state.add_dungeon_dice(game_state.dice.roll_dungeon_dice(dice_to_roll))
+        for _ in range(dragons):
+            say("A Dragon appears! The die moves to the Dragon's Lair.")
         
         if game_state.dragons_lair:
-            print(f"\nDragon's Lair now contains {len(game_state.dragons_lair)} dice!")
+            say(f"\nDragon's Lair now contains {game_state.dragons_lair} dice!")
         
         # Continue delving
         return True
     
     @staticmethod
-    def use_scroll(game_state):
-        """Use a Scroll to re-roll dice during the Regroup Phase."""
-        # Check if there are scrolls available
-        scroll_indices = [i for i, die in enumerate(game_state.party_dice) if die == PartyDiceFace.SCROLL.value]
-        
-        if not scroll_indices:
-            print("No Scrolls available in your active party!")
-            return False
-        
-        # Select a scroll to use
-        if len(scroll_indices) == 1:
-            scroll_idx = scroll_indices[0]
-        else:
-            print("Select which Scroll to use:")
-            for i, idx in enumerate(scroll_indices):
-                print(f"{i+1}. Scroll at position {idx+1}")
-            choice = input("Choose a Scroll (number): ").strip()
-            try:
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(scroll_indices):
-                    scroll_idx = scroll_indices[choice_idx]
-                else:
-                    print("Invalid choice.")
-                    return False
-            except ValueError:
-                print("Invalid input.")
-                return False
-        
-        # Create a list of all available dice to re-roll BEFORE removing the scroll
-        print("Used a Scroll! Select dice to re-roll (results will be random).")
-        print("\nAvailable Dice to Re-roll:")
-        print("=== Party Dice ===")
-        reroll_options = []
-        # Add party dice (excluding the scroll we just selected)
-        for i, die in enumerate(game_state.party_dice):
-            if i != scroll_idx:  # Don't show the scroll we just selected
-                reroll_options.append(("party", i, die))
-                print(f"{len(reroll_options)}. Party Die: {die}")
-        
-        if not reroll_options:
-            print("No party dice available to re-roll!")
-            return False
-        
-        print(f"{len(reroll_options)+1}. Cancel")
-        
-        choice = input("Choose dice to re-roll (number): ").strip()
-        try:
-            choice_idx = int(choice) - 1
-            if choice_idx == len(reroll_options):
-                print("Re-roll cancelled.")
-                return False
-            if 0 <= choice_idx < len(reroll_options):
-                source, idx, old_die = reroll_options[choice_idx]
-                
-                # Re-roll the selected die
-                dice_manager = DiceManager()
-                new_die = dice_manager.roll_party_dice(1)[0]
-                
-                # Move scroll to graveyard AFTER user makes their choice
-                game_state.use_party_die(scroll_idx)
-                
-                # Adjust the index if the scroll was before the selected die
-                adjusted_idx = idx
-                if scroll_idx < idx:
-                    adjusted_idx = idx - 1
-                
-                game_state.party_dice[adjusted_idx] = new_die
-                print(f"Party die re-rolled: {old_die} → {new_die}")
-                
-                return True
-            else:
-                print("Invalid choice.")
-                return False
-        except ValueError:
-            print("Invalid input.")
-            return False 
\ No newline at end of file
+    def use_scroll(game_state, policy):
+        """Use a Scroll to re-roll one party die during the Regroup Phase."""
+        return ScrollActions.use_party_scroll(game_state, policy, include_dungeon=False)
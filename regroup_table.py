@@ -0,0 +1,167 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+from math import prod
+
+import numpy as np
+
+from dice import DIE_SIDES
+from hero import HeroRank
+from monster_table import multisets, build_index, pack, MAX_DICE
+
+DEFAULT_PATH = "regroup_table.bin"
+
+# File layout: header, hero class names, the expected Experience of a whole delve (float32) by
+# (heroes, ranks), then the margins (float32) and choices (uint8) of every state as flat
+# C-order arrays of shape (heroes, ranks, levels, lair, exhausted, parties)
+MAGIC = b"DDRT"
+VERSION = 2
+HEADER = struct.Struct("<4s7I")  # magic, version, then the six axis lengths
+NAME_SIZE = 32  # Bytes per hero class name, NUL padded
+ALIGN = 16
+
+RANKS = tuple(HeroRank)
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+
+# The Dragon Phase starts at 3 dice in the Lair, so at most 2 are left at a Regroup Phase
+MAX_REGROUP_LAIR = 2
+
+# Party axis: every count vector over the six faces with at most 7 dice, in the solver's order
+PARTY_INDEX = build_index(multisets(DIE_SIDES, MAX_DICE))
+
+# One table entry: seek glory or not, and the expected Experience of seeking minus retiring
+RegroupEntry = namedtuple("RegroupEntry", ["seek", "margin"])
+
+def align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+def data_offsets(num_heroes):
+    """Byte offsets of the delve values and of the margins array in a table with `num_heroes` heroes."""
+    values = align(HEADER.size + num_heroes * NAME_SIZE)
+    return values, align(values + num_heroes * len(RANKS) * 4)
+
+def write_table(policies, path=DEFAULT_PATH):
+    """Write solved policies {(hero, rank): DelvePolicy} to a Regroup table file.
+
+    The file is written next to `path` and moved into place, so processes that
+    still map the old table keep reading it unchanged.
+    """
+    heroes = sorted({hero for hero, _ in policies})
+    first = next(iter(policies.values()))
+    levels, _, exhausted, parties = first.margins.shape
+    levels -= 1  # The Regroup Phase after level 10 has no choice to make
+    shape = (len(heroes), len(RANKS), levels, MAX_REGROUP_LAIR + 1, exhausted, parties)
+    delve_values = np.zeros(shape[:2], dtype="<f4")
+    margins = np.zeros(shape, dtype="<f4")
+    choices = np.zeros(shape, dtype=np.uint8)
+    for h, hero in enumerate(heroes):
+        for r, rank in enumerate(RANKS):
+            policy = policies[hero, rank]
+            delve_values[h, r] = policy.start_value
+            margins[h, r] = policy.margins[:levels, :MAX_REGROUP_LAIR + 1]
+            choices[h, r] = policy.seek[:levels, :MAX_REGROUP_LAIR + 1]
+
+    values_offset, margins_offset = data_offsets(len(heroes))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, *shape))
+        for hero in heroes:
+            f.write(hero.encode().ljust(NAME_SIZE, b"\0"))
+        f.write(b"\0" * (values_offset - f.tell()))
+        f.write(delve_values.tobytes())
+        f.write(b"\0" * (margins_offset - f.tell()))
+        f.write(margins.tobytes())
+        f.write(choices.tobytes())
+    os.replace(temp_path, path)
+
+class RegroupTable:
+    """The solved Regroup choice and its margin for every state, read from a memory-mapped file.
+
+    The file is mapped read only, so every process that opens it shares the
+    same pages of the OS page cache and nothing is parsed or copied at startup.
+    A lookup indexes the mapped arrays directly by (hero, rank, level, lair,
+    exhausted, party).
+
+    The choices are optimal only within `DelveSolver`'s model of the game. In
+    particular the key has no companion treasures: a state is looked up by its
+    party dice alone, as if the treasures held were not there. The solver
+    does not model them, and counting them as extra party dice scores worse,
+    since treasures spent in fights are end-game points lost.
+    """
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"{path} is not a Regroup table")
+        magic, version, *shape = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Regroup table")
+        if version != VERSION:
+            raise ValueError(f"{path} is a version {version} Regroup table; run `python regroup_table.py` to rebuild it")
+        num_heroes = shape[0]
+        names = self.buffer[HEADER.size:HEADER.size + num_heroes * NAME_SIZE]
+        self.heroes = {names[i * NAME_SIZE:(i + 1) * NAME_SIZE].rstrip(b"\0").decode(): i for i in range(num_heroes)}
+        size = prod(shape)
+        values_offset, offset = data_offsets(num_heroes)
+        if len(self.buffer) != offset + 5 * size:
+            raise ValueError(f"{path} is truncated")
+        self.delve_values = np.frombuffer(self.buffer, dtype="<f4", count=prod(shape[:2]),
+                                          offset=values_offset).reshape(shape[:2])
+        self.margins = np.frombuffer(self.buffer, dtype="<f4", count=size, offset=offset).reshape(shape)
+        self.choices = np.frombuffer(self.buffer, dtype=np.uint8, count=size, offset=offset + 4 * size).reshape(shape)
+
+    def key(self, game_state):
+        """Index of a Regroup state in the table's arrays."""
+        hero = game_state.selected_hero_card
+        return (self.heroes[hero.__class__.__name__], RANK_INDEX[hero.current_rank], game_state.level,
+                min(game_state.dragons_lair, MAX_REGROUP_LAIR), int(hero.is_exhausted),
+                PARTY_INDEX.item(pack(game_state.party_counts)))
+
+    def should_seek(self, game_state):
+        """Whether seeking glory beats retiring at this Regroup Phase."""
+        return bool(self.choices.item(self.key(game_state)))
+
+    def lookup(self, game_state):
+        """The RegroupEntry of this Regroup Phase."""
+        key = self.key(game_state)
+        return RegroupEntry(bool(self.choices.item(key)), self.margins.item(key))
+
+    def delve_value(self, hero_card):
+        """Expected Experience of a whole delve for this hero and rank, in the solver's model."""
+        return self.delve_values.item(self.heroes[hero_card.__class__.__name__], RANK_INDEX[hero_card.current_rank])
+
+_tables = {}  # Open tables by path, shared by everything in the process
+
+def open_table(path=None):
+    """The RegroupTable at `path` (default DEFAULT_PATH), mapped once per process."""
+    path = path or DEFAULT_PATH
+    if path not in _tables:
+        _tables[path] = RegroupTable(path)
+    return _tables[path]
+
+def main(argv=None):
+    from delve_policy import solve_all
+    parser = argparse.ArgumentParser(description="Solve the Regroup choice of every state and write the table.")
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH, help="where to write the Regroup table")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    write_table(solve_all(args.workers), args.output)
+    table = RegroupTable(args.output)
+    print(f"Wrote {table.choices.size} Regroup states in {time.perf_counter() - start:.1f}s to {args.output} "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB)")
+    for hero, h in table.heroes.items():
+        for rank in RANKS:
+            r = RANK_INDEX[rank]
+            print(f"{hero:30} {rank.name:7} seeks glory in {table.choices[h, r, 1:].mean():.1%} of Regroup states, "
+                  f"expected delve Experience {table.delve_values[h, r]:.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
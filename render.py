@@ -0,0 +1,106 @@
+import functools
+import sys
+from contextlib import contextmanager
+
+# ANSI escape sequence that clears the terminal and moves the cursor to the top
+CLEAR_SCREEN = "\n\n\n\n\033[2J\033[H\n\n"
+
+class Renderer:
+    """Where the game's output goes. All game text is routed through `say`, which
+    hands finished lines to the current renderer.
+
+    A renderer with `silent` set receives nothing: `say` returns before joining
+    its arguments and functions marked `@display` are not called at all.
+    """
+    silent = False
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def flush(self):
+        """End of a frame: the game is about to wait for the player or finish."""
+        pass
+
+    def clear(self):
+        self.write(CLEAR_SCREEN)
+
+class TerminalRenderer(Renderer):
+    """Writes every line to the terminal as soon as it is said (the default)."""
+    def __init__(self, stream=None):
+        self.stream = stream  # None follows sys.stdout, so redirecting it still works
+
+    def write(self, text):
+        (self.stream or sys.stdout).write(text)
+
+class BufferedRenderer(Renderer):
+    """Collects the lines of a frame and writes them with a single call on `flush`."""
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def flush(self):
+        if self.parts:
+            stream = self.stream or sys.stdout
+            stream.write("".join(self.parts))
+            stream.flush()
+            self.parts.clear()
+
+    def getvalue(self):
+        """The text of the current frame, without flushing it."""
+        return "".join(self.parts)
+
+class SilentRenderer(Renderer):
+    """Discards all output. Display code is skipped rather than formatted."""
+    silent = True
+
+    def write(self, text):
+        pass
+
+    def clear(self):
+        pass
+
+_renderer = TerminalRenderer()
+
+def get_renderer():
+    return _renderer
+
+def set_renderer(renderer):
+    """Route all game output to `renderer`. Returns the previous renderer."""
+    global _renderer
+    previous, _renderer = _renderer, renderer
+    return previous
+
+@contextmanager
+def rendering(renderer):
+    """Use `renderer` inside a `with` block, flushing it on the way out."""
+    previous = set_renderer(renderer)
+    try:
+        yield renderer
+    finally:
+        renderer.flush()
+        set_renderer(previous)
+
+def say(*parts, sep=" ", end="\n"):
+    """Drop-in for `print` that goes to the current renderer."""
+    renderer = _renderer
+    if renderer.silent:
+        return
+    renderer.write(sep.join(map(str, parts)) + end)
+
+def flush():
+    _renderer.flush()
+
+def clear_screen():
+    _renderer.clear()
+
+def display(function):
+    """Mark a function that only produces output; it is not called while the renderer is silent."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if _renderer.silent:
+            return None
+        return function(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,26 @@
+import numpy as np
+
+# Independent random streams of one game, in spawn order
+STREAMS = ("dice", "treasure", "policy")
+
+def stream_seed(master_seed, game_id, stream):
+    """The SeedSequence of one stream of one game.
+
+    Equal to child `stream` of child `game_id` of the master SeedSequence, so
+    any game can be recreated from its id without spawning the games before it.
+    """
+    return np.random.SeedSequence(master_seed, spawn_key=(game_id, STREAMS.index(stream)))
+
+class GameRandom:
+    """The random number generators of one game: dice, treasure draws and a seed for the policy.
+
+    Without a master seed the streams draw fresh entropy from the OS.
+    """
+    def __init__(self, master_seed=None, game_id=0):
+        if master_seed is None:
+            master_seed = np.random.SeedSequence().entropy
+        self.master_seed = master_seed
+        self.game_id = game_id
+        self.dice = np.random.default_rng(stream_seed(master_seed, game_id, "dice"))
+        self.treasure = np.random.default_rng(stream_seed(master_seed, game_id, "treasure"))
+        self.policy_seed = int(stream_seed(master_seed, game_id, "policy").generate_state(1, np.uint64)[0])
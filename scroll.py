@@ -0,0 +1,91 @@
+from collections import Counter
+from dice import PartyDiceFace, DungeonDiceFace
+from policy import Decision, Option
+from render import say
+
+class ScrollActions:
+    @staticmethod
+    def get_reroll_options(game_state, include_dungeon=True):
+        """Get one re-roll option per distinct die face in play."""
+        options = []
+        if include_dungeon:
+            for die, _ in game_state.dungeon_faces():
+                options.append(Option(("dungeon", die), f"Dungeon Die: {die}"))
+        for die, _ in game_state.party_faces():
+            options.append(Option(("party", die), f"Party Die: {die}"))
+        return options
+
+    @staticmethod
+    def reroll(game_state, source, die):
+        """Re-roll a single die and report the result."""
+        if source == "dungeon":
+            new_die = game_state.reroll_dungeon_die(die)
+            say(f"Dungeon die re-rolled: {die} → {new_die}")
+            if new_die == DungeonDiceFace.DRAGON:
+                say("Rolled a Dragon! It goes to the Dragon's Lair.")
+        else:  # party
+            new_die = game_state.reroll_party_die(die)
+            say(f"Party die re-rolled: {die} → {new_die}")
+        return new_die
+
+    @staticmethod
+    def reroll_one(game_state, policy, include_dungeon=True, allow_cancel=True):
+        """Let the policy pick one die to re-roll. Returns True if a die was re-rolled."""
+        options = ScrollActions.get_reroll_options(game_state, include_dungeon)
+        if not options:
+            say("No dice available to re-roll!")
+            return False
+        if allow_cancel:
+            options.append(Option(None, "Cancel"))
+
+        say("\nAvailable Dice to Re-roll:")
+        choice = policy.choose(game_state, Decision.SCROLL_TARGET, options)
+        if choice is None:
+            say("Re-roll cancelled.")
+            return False
+
+        source, die = choice
+        ScrollActions.reroll(game_state, source, die)
+        return True
+
+    @staticmethod
+    def reroll_many(game_state, policy):
+        """Let the policy pick any number of dice to re-roll, each at most once."""
+        remaining = Counter({("dungeon", die): count for die, count in game_state.dungeon_faces()})
+        remaining.update({("party", die): count for die, count in game_state.party_faces()})
+        rerolled = 0
+        while remaining:
+            options = [Option(key, f"{key[0].capitalize()} Die: {key[1]}") for key in remaining]
+            options.append(Option(None, "Done re-rolling"))
+            say("\nAvailable Dice to Re-roll:")
+            choice = policy.choose(game_state, Decision.SCROLL_TARGET, options)
+            if choice is None:
+                break
+
+            remaining[choice] -= 1
+            if not remaining[choice]:
+                del remaining[choice]
+            ScrollActions.reroll(game_state, *choice)
+            rerolled += 1
+
+        if not rerolled:
+            say("No dice re-rolled.")
+        return rerolled
+
+    @staticmethod
+    def use_party_scroll(game_state, policy, include_dungeon=True):
+        """Spend a Scroll from the active party to re-roll one die.
+
+        Interactive policies may cancel, which returns the Scroll to the party.
+        """
+        if not game_state.has_party_face(PartyDiceFace.SCROLL):
+            say("No Scrolls available in your active party!")
+            return False
+
+        game_state.use_party_face(PartyDiceFace.SCROLL)
+        say("Used a Scroll! Select dice to re-roll (results will be random).")
+        if ScrollActions.reroll_one(game_state, policy, include_dungeon, allow_cancel=policy.interactive):
+            return True
+        if policy.interactive:
+            game_state.revive_die(PartyDiceFace.SCROLL, PartyDiceFace.SCROLL)
+        return False
@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from dice import PARTY_FACES, DUNGEON_FACES
+from engine import DelveEngine, MENU_PHASES, Anchor
+from game_record import capture_keyframe, restore_keyframe, pack_keyframe, unpack_keyframe
+from policy import Policy
+from render import set_renderer, SilentRenderer
+from rng import GameRandom
+from simulate import HEROES
+from treasure import TREASURE_LABELS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Longest request line accepted from a client
+MAX_LINE = 64 * 1024
+
+class DecisionNeeded(Exception):
+    """Raised by ScriptedPolicy when the game reaches a decision the player has not made yet."""
+    def __init__(self, game_state, decision, options):
+        super().__init__(decision)
+        self.game_state = game_state
+        self.decision = decision
+        self.options = options
+
+class ScriptedPolicy(Policy):
+    """Answers decisions from a list of option indices and stops the game at the first unanswered one.
+
+    At every action menu it passes it takes an Anchor of the game, with the
+    keyframe packed to bytes, and notes how many choices were made before it.
+    """
+    interactive = True  # Sessions are played by people
+
+    def __init__(self, choices):
+        self.choices = choices
+        self.step = 0
+        self.anchor = None
+        self.anchor_step = 0
+
+    def choose(self, game_state, decision, options):
+        phase = MENU_PHASES.get(decision)
+        if phase is not None:
+            dice_state, rolls = game_state.dice.stream_state()
+            self.anchor = Anchor(phase, pack_keyframe(capture_keyframe(game_state)), (dice_state, bytes(rolls)),
+                                 game_state.treasure_manager.stream_state())
+            self.anchor_step = self.step
+        if self.step == len(self.choices):
+            raise DecisionNeeded(game_state, decision, options)
+        index = self.choices[self.step]
+        self.step += 1
+        return options[index].value
+
+def state_view(game_state):
+    """The public part of a game state as JSON-ready values."""
+    hero = game_state.selected_hero_card
+    return {
+        "delve": game_state.delve_count,
+        "level": game_state.level,
+        "party": {face.label: count for face, count in zip(PARTY_FACES, game_state.party_counts) if count},
+        "graveyard": {face.label: count for face, count in zip(PARTY_FACES, game_state.graveyard_counts) if count},
+        "dungeon": {face.label: count for face, count in zip(DUNGEON_FACES, game_state.dungeon_counts) if count},
+        "dragons_lair": game_state.dragons_lair,
+        "experience": game_state.experience_tokens,
+        "treasure": {TREASURE_LABELS[t]: count for t, count in enumerate(game_state.player_treasure.counts) if count},
+        "hero": hero.name,
+        "hero_rank": hero.current_rank.value,
+        "hero_exhausted": hero.is_exhausted,
+    }
+
+class GameSession:
+    """One player's game, stored as the Anchor of its last action menu and the choices made since.
+
+    The engine cannot pause in the middle of a phase without a thread, so each
+    step restores the anchor and replays the game silently from that menu with
+    the recorded choices until it reaches the next open decision. A step costs
+    at most one phase of replay, and a session about 2.5-3 KB however long the
+    game runs. Before the first menu the game is replayed from its seed.
+    """
+    __slots__ = ("session_id", "hero", "seed", "game_id", "anchor", "choices", "steps", "pending", "score")
+
+    def __init__(self, session_id, hero, seed, game_id):
+        self.session_id = session_id
+        self.hero = hero
+        self.seed = seed
+        self.game_id = game_id
+        self.anchor = None
+        self.choices = bytearray()  # Option indices chosen since the anchor
+        self.steps = 0              # Decisions made in the whole game
+        self.pending = None  # Number of options of the open decision
+        self.score = None    # Final score once the game is over
+
+    def advance(self):
+        """Replay the game from the anchor up to the next decision. Returns the message for the player."""
+        policy = ScriptedPolicy(self.choices)
+        anchor = self.anchor
+        if anchor is None:
+            engine = DelveEngine(HEROES[self.hero](), policy, GameRandom(self.seed, self.game_id))
+        else:
+            engine = DelveEngine(HEROES[self.hero](), policy)
+            state = engine.state
+            restore_keyframe(state, unpack_keyframe(anchor.keyframe, 0))
+            dice_state, rolls = anchor.dice
+            state.dice.resume_stream(state.dice.rng, (dice_state, list(rolls)))
+            state.treasure_manager.resume_stream(state.treasure_manager.rng, anchor.treasure)
+        try:
+            self.score = engine.play_game() if anchor is None else engine.resume_game(anchor.phase)
+        except DecisionNeeded as needed:
+            self.pending = len(needed.options)
+            reply = {"session": self.session_id, "step": self.steps, "decision": needed.decision.value,
+                     "options": [option.label for option in needed.options], "state": state_view(needed.game_state)}
+        else:
+            self.pending = None
+            reply = {"session": self.session_id, "step": self.steps, "game_over": True, "score": self.score,
+                     "state": state_view(engine.state)}
+        # Later steps start from the last menu this replay passed
+        if policy.anchor is not None:
+            self.anchor = policy.anchor
+            del self.choices[:policy.anchor_step]
+        return reply
+
+    def choose(self, option):
+        """Make the open decision and play on to the next one."""
+        if self.pending is None:
+            raise ValueError("The game is over")
+        if type(option) is not int or not 0 <= option < self.pending:
+            raise ValueError(f"option must be an integer from 0 to {self.pending - 1}")
+        self.choices.append(option)
+        self.steps += 1
+        return self.advance()
+
+class GameServer:
+    """Hosts many GameSessions in one process behind a JSON-lines protocol.
+
+    Every request is one JSON object per line with an "op" field; every request
+    gets one JSON line back:
+
+        {"op": "new", "hero": "minstrel"}                -> first decision of a new session
+        {"op": "choose", "session": 1, "option": 0}      -> the next decision, or the final score
+        {"op": "state", "session": 1}                    -> the open decision again
+        {"op": "close", "session": 1}                    -> {"closed": 1}
+        {"op": "stats"}                                  -> sessions, messages and latency
+
+    A "new" request may also give a "seed" and "game" to play a particular deal.
+    Requests may carry an "id", which is echoed in the reply. Errors are replied
+    as {"error": "..."}; an unexpected error inside a game also closes that
+    session and names it in "closed". Sessions belong to the server, not the connection, so a
+    player can reconnect and continue.
+    """
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.messages = 0
+        self.busy_time = 0.0
+        self.max_latency = 0.0
+
+    def handle(self, request):
+        """Answer one decoded request."""
+        start = time.perf_counter()
+        try:
+            reply = self.dispatch(request)
+        except (ValueError, KeyError, TypeError) as e:
+            reply = {"error": str(e)}
+        except Exception as e:
+            # A failed step may leave the session's anchor half updated, so it is dropped
+            reply = {"error": f"internal error: {e!r}"}
+            dropped = self.sessions.pop(request.get("session"), None) if request.get("op") != "new" else None
+            if dropped is not None:
+                reply["closed"] = dropped.session_id
+        if isinstance(request, dict) and "id" in request:
+            reply["id"] = request["id"]
+        elapsed = time.perf_counter() - start
+        self.messages += 1
+        self.busy_time += elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+        return reply
+
+    def dispatch(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        op = request.get("op")
+        if op == "new":
+            hero = request.get("hero", "minstrel")
+            if hero not in HEROES:
+                raise ValueError(f"Unknown hero '{hero}'. Choose from: {', '.join(HEROES)}")
+            session_id = next(self.session_ids)
+            session = GameSession(session_id, hero, request.get("seed", self.seed), request.get("game", session_id))
+            reply = session.advance()
+            self.sessions[session_id] = session
+            return reply
+        if op == "stats":
+            return self.stats()
+        session = self.get_session(request)
+        if op == "choose":
+            return session.choose(request.get("option"))
+        if op == "state":
+            return session.advance()
+        if op == "close":
+            del self.sessions[session.session_id]
+            return {"closed": session.session_id}
+        raise ValueError(f"Unknown op '{op}'")
+
+    def get_session(self, request):
+        try:
+            return self.sessions[request["session"]]
+        except KeyError:
+            raise ValueError(f"No session {request.get('session')}")
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "messages": self.messages,
+            "mean_latency_ms": self.busy_time / self.messages * 1000 if self.messages else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
+
+    async def serve_client(self, reader, writer):
+        """Answer JSON lines from one connection until it closes."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"error": "invalid JSON"}
+                else:
+                    reply = self.handle(request)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start listening. Returns the asyncio Server."""
+        set_renderer(SilentRenderer())
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+
+def session_memory(n_sessions, seed=0, moves=0):
+    """Bytes a GameServer holds per open session, measured with tracemalloc.
+
+    Each session is opened and then plays up to `moves` random moves, so late
+    and finished games are measured as well as fresh ones.
+    """
+    server = GameServer(seed)
+    chooser = random.Random(seed)
+    set_renderer(SilentRenderer())
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(n_sessions):
+        reply = server.handle({"op": "new", "hero": "minstrel"})
+        for _ in range(moves):
+            if reply.get("game_over"):
+                break
+            reply = server.handle({"op": "choose", "session": reply["session"],
+                                   "option": chooser.randrange(len(reply["options"]))})
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used / n_sessions if n_sessions else 0.0
+
+async def load_test(n_sessions, connections=10, seed=0):
+    """Play `n_sessions` games at once over localhost with random legal moves.
+
+    Every session is opened before any game moves on, so all of them are alive
+    together. Returns the measurements as a dict.
+    """
+    server = GameServer(seed)
+    listener = await server.start(DEFAULT_HOST, 0)
+    port = listener.sockets[0].getsockname()[1]
+    chooser = random.Random(seed)
+    latencies = []
+
+    async def client(session_count, opened, ready):
+        reader, writer = await asyncio.open_connection(DEFAULT_HOST, port, limit=MAX_LINE)
+
+        async def call(request):
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            return reply
+
+        open_games = [await call({"op": "new", "hero": "minstrel"}) for _ in range(session_count)]
+        opened.append(len(open_games))
+        await ready.wait()
+        while open_games:
+            replies = []
+            for reply in open_games:
+                reply = await call({"op": "choose", "session": reply["session"],
+                                    "option": chooser.randrange(len(reply["options"]))})
+                if not reply.get("game_over"):
+                    replies.append(reply)
+            open_games = replies
+        writer.close()
+
+    opened, ready = [], asyncio.Event()
+    shares = [n_sessions // connections + (i < n_sessions % connections) for i in range(connections)]
+    tasks = [asyncio.create_task(client(share, opened, ready)) for share in shares if share]
+    while len(opened) < len(tasks):
+        await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    ready.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    listener.close()
+    await listener.wait_closed()
+
+    latencies.sort()
+    stats = server.stats()
+    return {
+        "sessions": n_sessions,
+        "connections": len(tasks),
+        "messages": stats["messages"],
+        "bytes_per_session": session_memory(n_sessions, seed),
+        "bytes_per_finished_session": session_memory(n_sessions, seed, moves=1000),
+        "messages_per_second": (stats["messages"] - n_sessions) / elapsed if elapsed else 0.0,
+        "server_mean_ms": stats["mean_latency_ms"],
+        "server_max_ms": stats["max_latency_ms"],
+        "client_p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "client_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+async def serve(host, port, seed):
+    server = GameServer(seed)
+    listener = await server.start(host, port)
+    print(f"Dungeon Dice server listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many Dungeon Dice games over a JSON-lines protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=None, help="master seed for new sessions (default: random)")
+    parser.add_argument("--load-test", type=int, metavar="SESSIONS",
+                        help="play this many concurrent games against a local server and report the measurements")
+    parser.add_argument("--connections", type=int, default=10, help="client connections used by --load-test")
+    args = parser.parse_args(argv)
+
+    if args.load_test is not None:
+        print(json.dumps(asyncio.run(load_test(args.load_test, args.connections, args.seed or 0)), indent=2))
+        return 0
+    try:
+        asyncio.run(serve(args.host, args.port, args.seed))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from engine import DelveEngine
+from hero import MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero
+from policy import RandomPolicy, GreedyPolicy, LookaheadPolicy
+from rng import GameRandom
+from instrumentation import PhaseStats
+from render import rendering, SilentRenderer
+
+# Games are sharded into fixed-size chunks so results never depend on the worker count
+CHUNK_SIZE = 500
+
+HEROES = {
+    "minstrel": MinstrelBardHero,
+    "alchemist": AlchemistThaumaturgeHero,
+    "archaeologist": ArchaeologistTombRaiderHero,
+}
+
+POLICIES = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "lookahead": LookaheadPolicy,
+}
+
+class SimulationResult:
+    """Aggregate statistics over many games. Results from any split of the games merge exactly."""
+    def __init__(self):
+        self.games = 0
+        self.score_total = 0
+        self.score_squares = 0
+        self.score_counts = Counter()
+        self.delves = 0
+        self.delves_fled = 0
+        self.level_counts = Counter()
+        self.dragons_slain = 0
+        self.phase_stats = None  # PhaseStats, when the run was instrumented
+
+    def add_game(self, engine, score):
+        """Record one finished game."""
+        self.games += 1
+        self.score_total += score
+        self.score_squares += score * score
+        self.score_counts[score] += 1
+        for result in engine.delve_results:
+            self.delves += 1
+            self.delves_fled += result.fled
+            self.level_counts[result.level] += 1
+        self.dragons_slain += engine.state.dragons_slain
+
+    def merge(self, other):
+        """Add the games of another result to this one."""
+        self.games += other.games
+        self.score_total += other.score_total
+        self.score_squares += other.score_squares
+        self.score_counts.update(other.score_counts)
+        self.delves += other.delves
+        self.delves_fled += other.delves_fled
+        self.level_counts.update(other.level_counts)
+        self.dragons_slain += other.dragons_slain
+        if other.phase_stats is not None:
+            self.phase_stats = (self.phase_stats or PhaseStats()).merge(other.phase_stats)
+        return self
+
+    @property
+    def mean_score(self):
+        return self.score_total / self.games if self.games else 0.0
+
+    @property
+    def score_stdev(self):
+        if self.games < 2:
+            return 0.0
+        variance = (self.score_squares - self.score_total ** 2 / self.games) / (self.games - 1)
+        return max(variance, 0.0) ** 0.5
+
+    def to_dict(self):
+        stats = {
+            "games": self.games,
+            "mean_score": self.mean_score,
+            "score_stdev": self.score_stdev,
+            "min_score": min(self.score_counts) if self.score_counts else None,
+            "max_score": max(self.score_counts) if self.score_counts else None,
+            "score_counts": dict(sorted(self.score_counts.items())),
+            "delves": self.delves,
+            "delves_fled": self.delves_fled,
+            "level_counts": dict(sorted(self.level_counts.items())),
+            "dragons_slain": self.dragons_slain,
+        }
+        if self.phase_stats is not None:
+            stats["phase_stats"] = self.phase_stats.to_dict()
+        return stats
+
+def resolve(name_or_class, registry, kind):
+    """Accept either a registered name or the class itself."""
+    if isinstance(name_or_class, str):
+        try:
+            return registry[name_or_class]
+        except KeyError:
+            raise ValueError(f"Unknown {kind} '{name_or_class}'. Choose from: {', '.join(registry)}")
+    return name_or_class
+
+def play_one(hero_class, policy_class, seed, game_id, recorder=None, stats=None):
+    """Play game `game_id` of the run seeded with `seed` headlessly. Returns the engine and the final score.
+
+    Every game has its own random streams, so any game of a run can be replayed on its own.
+    """
+    rng = GameRandom(seed, game_id)
+    engine = DelveEngine(hero_class(), policy_class(seed=rng.policy_seed), rng, recorder, stats)
+    return engine, engine.play_game()
+
+def run_chunk(hero_class, policy_class, seed, first_game, num_games, record=False, instrument=False):
+    """Play games [first_game, first_game + num_games) in this process.
+
+    Returns the SimulationResult and, if `record` is set, the binary record of every game.
+    With `instrument`, the result carries the PhaseStats of the chunk.
+    """
+    if record:
+        from game_record import GameRecorder
+    result = SimulationResult()
+    if instrument:
+        result.phase_stats = PhaseStats()
+    records = []
+    with rendering(SilentRenderer()):
+        for game_id in range(first_game, first_game + num_games):
+            recorder = GameRecorder() if record else None
+            engine, score = play_one(hero_class, policy_class, seed, game_id, recorder, result.phase_stats)
+            result.add_game(engine, score)
+            if record:
+                records.append(recorder.getvalue())
+    return result, records
+
+def simulate(n_games, hero="minstrel", policy="random", workers=None, seed=0, record_path=None, instrument=False):
+    """Play `n_games` headless games across a process pool and return the merged SimulationResult.
+
+    Every game is seeded from (`seed`, game id) alone, so the result is identical
+    for any number of workers. With `record_path`, every game's binary record is
+    written there in game order. With `instrument`, per-phase timings and delve
+    outcome counters are collected in `result.phase_stats`.
+    """
+    hero_class = resolve(hero, HEROES, "hero")
+    policy_class = resolve(policy, POLICIES, "policy")
+    workers = workers or os.cpu_count() or 1
+
+    chunks = [(hero_class, policy_class, seed, start, min(CHUNK_SIZE, n_games - start), record_path is not None,
+               instrument)
+              for start in range(0, n_games, CHUNK_SIZE)]
+
+    if workers == 1 or len(chunks) <= 1:
+        chunk_results = [run_chunk(*chunk) for chunk in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = list(executor.map(run_chunk, *zip(*chunks)))
+
+    result = SimulationResult()
+    records = []
+    for chunk_result, chunk_records in chunk_results:
+        result.merge(chunk_result)
+        records += chunk_records
+    if record_path is not None:
+        from game_record import write_archive
+        write_archive(record_path, records)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless Dungeon Dice games in parallel.")
+    parser.add_argument("-n", "--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("--hero", choices=sorted(HEROES), default="minstrel")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    parser.add_argument("--record", metavar="PATH", help="write every game's binary record to PATH")
+    parser.add_argument("--phase-stats", action="store_true", help="time every phase and count how delves end")
+    parser.add_argument("--replay", type=int, metavar="GAME_ID", help="replay one game of the run with full output")
+    args = parser.parse_args(argv)
+
+    if args.replay is not None:
+        engine, score = play_one(HEROES[args.hero], POLICIES[args.policy], args.seed, args.replay)
+        print(f"\nGame {args.replay} of seed {args.seed} scored {score}")
+        return 0
+
+    try:
+        result = simulate(args.games, args.hero, args.policy, args.workers, args.seed, args.record, args.phase_stats)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+        return 0
+
+    stats = result.to_dict()
+    print(f"Games played:   {stats['games']}")
+    print(f"Mean score:     {stats['mean_score']:.3f} (stdev {stats['score_stdev']:.3f})")
+    print(f"Score range:    {stats['min_score']} - {stats['max_score']}")
+    print(f"Delves fled:    {stats['delves_fled']} of {stats['delves']}")
+    print(f"Dragons slain:  {stats['dragons_slain']}")
+    print("Levels reached: " + ", ".join(f"L{level}: {count}" for level, count in stats["level_counts"].items()))
+    if result.phase_stats is not None:
+        print()
+        for line in result.phase_stats.report():
+            print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
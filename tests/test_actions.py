@@ -0,0 +1,99 @@
+from collections import Counter
+
+import pytest
+
+from actions import legal_values
+from engine import DelveEngine
+from dice import DungeonDiceFace
+from game_record import GameRecorder
+from hero import HeroRank, MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero
+from policy import Decision, GreedyPolicy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+from treasure import COMPANION_TYPES
+
+class ContextPolicy(GreedyPolicy):
+    """Plays like GreedyPolicy with random slips and checks every menu against `legal_values`.
+
+    The context of a decision is rebuilt from the choices that led to it, the
+    way the phase that asks it keeps track.
+    """
+    def __init__(self, seed=None, interactive=False):
+        super().__init__(seed)
+        self.interactive = interactive
+        self.previous = (None, None)   # The last decision and the value chosen
+        self.companion_type = None     # Type of the companion being spent in the Monster Phase
+        self.used_types = set()        # Companion types chosen for the Dragon battle
+        self.rerolls = None            # Dice still re-rollable while re-rolling several at once
+        self.checked = Counter()
+
+    def context(self, game_state, decision):
+        last, value = self.previous
+        if decision in (Decision.COMPANION_ROLE, Decision.MONSTER_TARGET):
+            return self.companion_type
+        if decision == Decision.CHAMPION_TARGET:
+            return value if last == Decision.CHAMPION_TARGET else None
+        if decision == Decision.LOOT_ACTION:
+            return game_state.dungeon_counts[DungeonDiceFace.CHEST], game_state.dungeon_counts[DungeonDiceFace.POTION]
+        if decision == Decision.DRAGON_COMPANION:
+            return self.used_types if last == Decision.DRAGON_COMPANION else set()
+        if decision == Decision.SCROLL_TARGET:
+            # The Dragon battle re-rolls any number of dice, the Regroup Phase only party dice
+            if self.rerolls is None and last in (Decision.DRAGON_ACTION, Decision.DRAGON_SCROLL):
+                self.rerolls = Counter({("dungeon", die): count for die, count in game_state.dungeon_faces()})
+                self.rerolls.update({("party", die): count for die, count in game_state.party_faces()})
+            if self.rerolls is not None:
+                return self.rerolls
+            return last != Decision.REGROUP_ACTION
+        return None
+
+    def choose(self, game_state, decision, options):
+        context = self.context(game_state, decision)
+        expected = set(legal_values(game_state, decision, context))
+        values = {option.value for option in options}
+        # A single re-roll may be cancelled only by interactive players
+        if decision == Decision.SCROLL_TARGET and self.rerolls is None and None in values:
+            expected.add(None)
+        assert values == expected, (decision, context)
+        self.checked[decision] += 1
+
+        if self.rng.random() < 0.5:
+            value = self.rng.choice(options).value
+        else:
+            value = super().choose(game_state, decision, options)
+        if decision == Decision.COMPANION:
+            if value is not None:
+                source, companion = value
+                self.companion_type = COMPANION_TYPES[companion] if source == "treasure" else companion
+        elif decision == Decision.COMPANION_ROLE:
+            self.companion_type = value
+        elif decision == Decision.DRAGON_COMPANION:
+            if self.previous[0] != Decision.DRAGON_COMPANION:
+                self.used_types = set()
+            if value is not None:
+                source, companion = value
+                self.used_types.add(COMPANION_TYPES[companion] if source == "treasure" else companion)
+        elif decision == Decision.SCROLL_TARGET and self.rerolls is not None:
+            if value is None:
+                self.rerolls = None
+            else:
+                self.rerolls[value] -= 1
+                self.rerolls = +self.rerolls or None
+        self.previous = (decision, value)
+        return value
+
+@pytest.mark.parametrize("interactive", [False, True])
+@pytest.mark.parametrize("rank", list(HeroRank))
+@pytest.mark.parametrize("hero_class", [MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero])
+def test_legal_values_match_every_menu(hero_class, rank, interactive):
+    checked = Counter()
+    with rendering(SilentRenderer()):
+        for game_id in range(60):
+            policy = ContextPolicy(game_id, interactive)
+            # Games may start with a Master hero, to reach the Master specialties often
+            hero = hero_class()
+            hero.current_rank = rank
+            engine = DelveEngine(hero, policy, GameRandom(11, game_id), recorder=GameRecorder())
+            engine.play_game()
+            checked += policy.checked
+    assert checked[Decision.MONSTER_ACTION] and checked[Decision.LOOT_ACTION] and checked[Decision.DRAGON_ACTION]
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from batch_engine import BatchEngine, BatchRulesPolicy, HEROES, play_batch, retire_at_level
+from simulate import simulate
+from treasure import TreasureType
+
+ENGINE_GAMES = 4000
+BATCH_GAMES = 200000
+
+def delving(hero, party, dungeon, lair=0):
+    """A one-game BatchEngine at the Monster Phase with the given party and dungeon counts."""
+    engine = BatchEngine(1, hero, seed=0)
+    engine.party[:, 0] = party
+    engine.graveyard[0] = 7 - sum(party)
+    engine.dungeon[:, 0] = dungeon
+    engine.lair[0] = lair
+    engine.delving[0] = True
+    return engine
+
+def test_companion_treasure_defeats_a_group():
+    # Three Goblins and no Fighter: the Vorpal Sword takes the group, the Thief is kept
+    engine = delving("archaeologist", [0, 0, 0, 1, 0, 0], [3, 0, 0, 0, 0, 0])
+    engine.hoard[TreasureType.VORPAL_SWORD, 0] = 1
+    engine.monster_phase()
+    assert engine.delving[0]
+    assert engine.party[:, 0].tolist() == [0, 0, 0, 1, 0, 0]
+    assert engine.hoard[TreasureType.VORPAL_SWORD, 0] == 0
+
+def test_minstrel_banishes_in_the_monster_phase():
+    # The Dragon Phase has no ultimate, so the banish happens while monsters are fought
+    engine = delving("minstrel", [1, 0, 0, 0, 0, 0], [1, 0, 0, 0, 0, 0], lair=3)
+    engine.monster_phase()
+    assert engine.lair[0] == 0 and engine.exhausted[0]
+
+    engine = delving("minstrel", [1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 1, 0], lair=3)
+    engine.monster_phase()
+    engine.loot_phase()
+    engine.dragon_phase()
+    assert not engine.delving[0] and not engine.exhausted[0]
+
+@pytest.mark.slow
+@pytest.mark.parametrize("hero", HEROES)
+def test_batch_engine_agrees_with_the_engine(hero):
+    result = simulate(ENGINE_GAMES, hero, BatchRulesPolicy, workers=1, seed=3)
+    scores = play_batch(BATCH_GAMES, hero, retire_at_level(3), seed=3).scores
+    error = math.hypot(result.score_stdev / math.sqrt(ENGINE_GAMES), scores.std() / math.sqrt(BATCH_GAMES))
+    assert abs(result.mean_score - scores.mean()) < 3 * error
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from dice import DiceManager, PARTY_FACES, DUNGEON_FACES, DIE_SIDES, ROLL_BUFFER_SIZE
+
+# Chi-square critical value for 5 degrees of freedom at p = 0.001
+CHI2_CRITICAL = 20.515
+
+def chi_square(faces):
+    counts = np.bincount(faces.ravel(), minlength=DIE_SIDES)
+    expected = faces.size / DIE_SIDES
+    return ((counts - expected) ** 2 / expected).sum()
+
+@pytest.mark.parametrize("roll, faces", [("roll_party_batch", PARTY_FACES), ("roll_dungeon_batch", DUNGEON_FACES)])
+def test_batch_rolls(roll, faces):
+    dice = DiceManager(np.random.default_rng(0))
+    for n_games, num_dice in [(1, 1), (5, 7), (0, 3), (100000, 7)]:
+        rolls = getattr(dice, roll)(n_games, num_dice)
+        assert rolls.shape == (n_games, num_dice)
+        assert rolls.dtype == np.uint8
+        assert rolls.size == 0 or rolls.max() < len(faces)
+    assert chi_square(rolls) < CHI2_CRITICAL
+
+def test_roll_buffer_refills_without_losing_rolls():
+    dice = DiceManager(np.random.default_rng(1))
+    rolls = []
+    for _ in range(300):
+        rolls += dice._roll_indices(7)
+    # A roll bigger than the buffer takes what is left and one larger refill
+    rolls += dice._roll_indices(2 * ROLL_BUFFER_SIZE)
+
+    reference = np.random.default_rng(1)
+    blocks = [reference.integers(0, DIE_SIDES, size=ROLL_BUFFER_SIZE, dtype=np.uint8) for _ in range(3)]
+    blocks.append(reference.integers(0, DIE_SIDES, size=2 * ROLL_BUFFER_SIZE, dtype=np.uint8))
+    assert rolls == np.concatenate(blocks).tolist()[:len(rolls)]
+    assert chi_square(np.array(rolls)) < CHI2_CRITICAL
+
+def test_single_rolls_map_to_faces():
+    dice = DiceManager(np.random.default_rng(2))
+    party = [dice.roll_party_dice(7) for _ in range(500)]
+    dungeon = [dice.roll_dungeon_dice(3) for _ in range(500)]
+    assert all(len(roll) == 7 and set(roll) <= set(PARTY_FACES) for roll in party)
+    assert all(len(roll) == 3 and set(roll) <= set(DUNGEON_FACES) for roll in dungeon)
+    assert set(face for roll in party for face in roll) == set(PARTY_FACES)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import render
+from env import DungeonDiceEnv, SubprocVectorEnv
+
+def play_episode(env, rng):
+    _, info = env.reset()
+    total = 0.0
+    while True:
+        action = rng.choice(np.flatnonzero(info["action_mask"]))
+        _, reward, terminated, _, info = env.step(action)
+        total += reward
+        if terminated:
+            return total, info["score"]
+
+def test_rewards_add_up_to_score_and_renderer_is_restored():
+    renderer = render.get_renderer()
+    env = DungeonDiceEnv("alchemist", seed=3)
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        total, score = play_episode(env, rng)
+        assert total == score
+        assert render.get_renderer() is renderer
+    env.reset()
+    env.close()
+    assert render.get_renderer() is renderer
+
+def test_worker_errors_are_raised_in_the_parent():
+    vec = SubprocVectorEnv(4, "minstrel", seed=0, workers=2)
+    try:
+        _, masks = vec.reset()
+        illegal = [int(np.flatnonzero(~mask)[0]) for mask in masks]
+        with pytest.raises(ValueError, match="not legal"):
+            vec.step(illegal)
+        # The workers are still serving
+        _, masks = vec.reset()
+        vec.step([int(np.flatnonzero(mask)[0]) for mask in masks])
+    finally:
+        vec.close()
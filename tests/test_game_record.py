@@ -0,0 +1,72 @@
+import pytest
+
+from engine import DelveEngine
+from game_record import GameRecorder, GameRecord, RecordingPolicy, capture_keyframe
+from hero import MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero
+from policy import Decision, Policy, GreedyPolicy, RandomPolicy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+
+class CapturingPolicy(Policy):
+    """Takes a keyframe of the game before every decision."""
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+        self.keyframes = []
+
+    def choose(self, game_state, decision, options):
+        self.keyframes.append(capture_keyframe(game_state))
+        return self.inner.choose(game_state, decision, options)
+
+def record_game(hero_class, inner, game_id):
+    recorder = GameRecorder()
+    policy = CapturingPolicy(inner)
+    with rendering(SilentRenderer()):
+        DelveEngine(hero_class(), policy, rng=GameRandom(7, game_id), recorder=recorder).play_game()
+    return GameRecord(recorder.getvalue()), policy.keyframes
+
+@pytest.mark.parametrize("game_id", range(6))
+@pytest.mark.parametrize("hero_class", [MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero])
+def test_state_at_matches_live_game(hero_class, game_id):
+    inner = GreedyPolicy() if game_id % 2 else RandomPolicy(GameRandom(7, game_id).policy_seed)
+    record, keyframes = record_game(hero_class, inner, game_id)
+    decisions = [step for step, event in record.events() if event.kind == "decision"]
+    assert len(decisions) == len(keyframes)
+    # The state after the event before a decision is the state the policy saw
+    for step, keyframe in zip(decisions, keyframes):
+        assert capture_keyframe(record.state_at(step - 1)) == keyframe
+    # Before the first keyframe the game is replayed from the start and reaches the same state
+    first, _ = record.keyframes()[0]
+    assert capture_keyframe(record.state_at(first - 1)) == capture_keyframe(record.state_at(first))
+    # The last keyframe is the final state, whether restored or played out
+    _, final = record.keyframes()[-1]
+    assert capture_keyframe(record.state_at(len(record) - 1)) == final
+    assert capture_keyframe(record.state_at(len(record) - 2)) == final
+
+def test_state_at_range():
+    record, _ = record_game(MinstrelBardHero, GreedyPolicy(), 0)
+    with pytest.raises(IndexError):
+        record.state_at(len(record))
+
+class InteractiveRandomPolicy(RandomPolicy):
+    """Picks at random, including the options only offered to interactive players."""
+    interactive = True
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.cancels_offered = 0
+
+    def choose(self, game_state, decision, options):
+        if decision == Decision.SCROLL_TARGET and options[-1].value is None:
+            self.cancels_offered += 1
+        return super().choose(game_state, decision, options)
+
+def test_recording_keeps_an_interactive_policy_interactive():
+    policy = InteractiveRandomPolicy(seed=3)
+    with rendering(SilentRenderer()):
+        for game_id in range(10):
+            engine = DelveEngine(MinstrelBardHero(), policy, GameRandom(3, game_id), recorder=GameRecorder())
+            assert type(engine.policy) is RecordingPolicy
+            assert engine.policy.interactive and engine.policy.rng is policy.rng
+            engine.play_game()
+    assert policy.cancels_offered
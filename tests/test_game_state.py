@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from dice import PARTY_FACES, DUNGEON_FACES
+from game_state import (GameState, MoveDice, MoveTreasure, Adjust, SetExhausted, ADJUSTABLE_FIELDS,
+                        PARTY, GRAVEYARD, DUNGEON, LAIR, SUPPLY, TREASURE_POOL, HOARD)
+from hero import MinstrelBardHero
+from treasure import TreasureType
+
+def observe(state):
+    """Everything `apply` may change."""
+    return (list(state.party_counts), list(state.graveyard_counts), list(state.dungeon_counts), state.dragons_lair,
+            state.treasure_manager.snapshot(), state.treasure_manager.pool_size,
+            state.player_treasure.snapshot(), state.player_treasure.size, state.treasure_tokens,
+            [getattr(state, field) for field in ADJUSTABLE_FIELDS], state.selected_hero_card.is_exhausted,
+            state.zobrist_hash)
+
+def new_state():
+    state = GameState()
+    state.selected_hero_card = MinstrelBardHero()
+    state.party_counts = [2, 1, 1, 1, 1, 1]
+    state.dungeon_counts = [1, 2, 0, 0, 1, 1]
+    state.dragons_lair = 1
+    state.level = state.delve_count = 2
+    return state
+
+def random_action(rng, state):
+    """A random primitive change; some of them move dice or tokens that are not there."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        source, target = rng.choice([PARTY, GRAVEYARD, DUNGEON, LAIR, SUPPLY]), rng.choice([PARTY, GRAVEYARD, DUNGEON, LAIR])
+        faces = DUNGEON_FACES if DUNGEON in (source, target) else PARTY_FACES
+        return MoveDice(source, target, rng.choice(faces), rng.choice((None,) + faces), rng.randint(1, 2))
+    if kind == 1:
+        return MoveTreasure(rng.choice(list(TreasureType)), *rng.sample([TREASURE_POOL, HOARD], 2))
+    if kind == 2:
+        field = rng.choice(ADJUSTABLE_FIELDS)
+        # Level and delve count are kept in hashable range
+        return Adjust(field, rng.randint(-min(getattr(state, field), 1), 1))
+    return SetExhausted(rng.random() < 0.5)
+
+def test_apply_and_undo_round_trip():
+    rng = random.Random(0)
+    state = new_state()
+    history = []
+    for _ in range(2000):
+        action = random_action(rng, state)
+        if rng.random() < 0.2:
+            action = [action, random_action(rng, state)]
+        before = observe(state)
+        try:
+            token = state.apply(action)
+        except ValueError:
+            assert observe(state) == before
+            continue
+        history.append((before, token))
+        # Undo now and then, checking every state on the way back
+        if rng.random() < 0.3 or len(history) > 20:
+            for _ in range(rng.randint(1, len(history))):
+                before, token = history.pop()
+                state.undo(token)
+                assert observe(state) == before
+    while history:
+        before, token = history.pop()
+        state.undo(token)
+        assert observe(state) == before
+    assert observe(state) == observe(new_state())
+
+def test_failed_action_list_leaves_the_state_unchanged():
+    state = new_state()
+    before = observe(state)
+    actions = [MoveDice(PARTY, GRAVEYARD, PARTY_FACES[0], count=2), MoveTreasure(TreasureType.ELIXIR, TREASURE_POOL, HOARD),
+               Adjust("experience_tokens", 3), SetExhausted(True),
+               MoveTreasure(TreasureType.TOWN_PORTAL, HOARD, TREASURE_POOL)]
+    with pytest.raises(ValueError):
+        state.apply(actions)
+    assert observe(state) == before
+    # Without the failing move the list applies and undoes as one change
+    token = state.apply(actions[:-1])
+    assert observe(state) != before
+    state.undo(token)
+    assert observe(state) == before
@@ -0,0 +1,18 @@
+import pytest
+
+import import_budget
+
+pytestmark = pytest.mark.slow
+
+@pytest.fixture(scope="module")
+def results():
+    return {result["module"]: result for result in import_budget.check(runs=3)}
+
+@pytest.mark.parametrize("module", sorted(import_budget.BUDGETS_MS))
+def test_import_within_budget(results, module):
+    result = results[module]
+    assert result["total_ms"] <= result["budget_ms"], result
+
+@pytest.mark.parametrize("module", sorted(import_budget.BUDGETS_MS))
+def test_optional_modules_not_loaded(results, module):
+    assert results[module]["unexpected_modules"] == []
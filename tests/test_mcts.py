@@ -0,0 +1,54 @@
+import gc
+import time
+
+import pytest
+
+from engine import DelveEngine
+from hero import MinstrelBardHero
+from mcts import MCTSPolicy
+from policy import GreedyPolicy, RetireAtLevelPolicy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+from tournament import policy_factory
+
+BUDGET_MS = 10
+# A move may overrun its budget by the engine step in progress at the deadline
+SLACK_MS = 15
+
+def play(policy, game_id=0):
+    with rendering(SilentRenderer()):
+        return DelveEngine(MinstrelBardHero(), policy, GameRandom(0, game_id)).play_game()
+
+def test_moves_keep_to_the_budget():
+    policy = MCTSPolicy(seed=0, budget_ms=BUDGET_MS)
+    # Collector pauses stop the whole process and are no part of the search
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        play(policy)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    assert policy.move_times
+    assert max(policy.move_times) * 1000 < BUDGET_MS + SLACK_MS
+    assert elapsed * 1000 < len(policy.move_times) * (BUDGET_MS + SLACK_MS)
+    # Iterations abandoned at the deadline are never backed up
+    for node in policy.nodes.values():
+        assert node.visits == sum(edge.visits for edge in node.edges.values())
+
+def test_rollout_policy_is_explicit(tmp_path, monkeypatch):
+    # The default does not depend on which files happen to exist
+    assert type(MCTSPolicy(seed=0).rollout) is GreedyPolicy
+    monkeypatch.chdir(tmp_path)
+    policy = MCTSPolicy(seed=0, iterations=5)
+    assert type(policy.rollout) is GreedyPolicy
+    assert play(policy) >= 0
+
+    policy = MCTSPolicy(seed=0, iterations=5, rollout=RetireAtLevelPolicy)
+    assert type(policy.rollout) is RetireAtLevelPolicy
+    assert play(policy) >= 0
+    with pytest.raises(ValueError, match="regroup_table.bin not found"):
+        policy_factory("mcts#5+solver")
+    with pytest.raises(ValueError, match="rollout"):
+        policy_factory("mcts#5+greedy")
+    assert policy_factory("mcts@5").keywords["rollout"] is GreedyPolicy
@@ -0,0 +1,127 @@
+import random
+from functools import lru_cache
+from itertools import combinations
+
+import pytest
+
+from dice import PartyDiceFace, DungeonDiceFace, MONSTER_FACES
+from monster_solver import solve_monsters, DIE_COSTS, TREASURE_COST, GROUP_KILLERS, SINGLE_KILLERS
+
+FIGHTER, MAGE, CLERIC, THIEF, CHAMPION = (PartyDiceFace.FIGHTER, PartyDiceFace.MAGE, PartyDiceFace.CLERIC,
+                                           PartyDiceFace.THIEF, PartyDiceFace.CHAMPION)
+GOBLIN, SKELETON, OOZE = MONSTER_FACES
+
+def group_killers(monster, thief_as_mage):
+    return GROUP_KILLERS[monster] + ((THIEF,) if thief_as_mage and monster == OOZE else ())
+
+def spend(counts, face):
+    counts = list(counts)
+    counts[face] -= 1
+    return tuple(counts)
+
+def brute_force(monsters, party, treasures, champion_types, thief_as_mage):
+    """(cost, treasures spent, companions spent) of the cheapest way to defeat every monster, or None.
+
+    Tries every companion on every legal target, one companion at a time.
+    """
+    @lru_cache(maxsize=None)
+    def best(monsters, party, treasures):
+        present = [m for m in MONSTER_FACES if monsters[m]]
+        if not present:
+            return 0, 0, 0
+        found = []
+
+        def after(cost, treasure, targets, party, treasures):
+            left = list(monsters)
+            for m, count in targets:
+                left[m] -= count
+            rest = best(tuple(left), party, treasures)
+            if rest is not None:
+                found.append((cost + rest[0], treasure + rest[1], 1 + rest[2]))
+
+        if party[CHAMPION]:
+            for n in range(1, champion_types + 1):
+                for swept in combinations(present, n):
+                    after(DIE_COSTS[CHAMPION], 0, [(m, monsters[m]) for m in swept], spend(party, CHAMPION), treasures)
+        for face in SINGLE_KILLERS:
+            for counts, cost, treasure in ((party, DIE_COSTS[face], 0), (treasures, TREASURE_COST, 1)):
+                if not counts[face]:
+                    continue
+                party_left, treasures_left = (spend(party, face), treasures) if not treasure else \
+                    (party, spend(treasures, face))
+                for m in present:
+                    after(cost, treasure, [(m, 1)], party_left, treasures_left)
+                    if face in group_killers(m, thief_as_mage):
+                        after(cost, treasure, [(m, monsters[m])], party_left, treasures_left)
+        return min(found, default=None)
+
+    return best(monsters, party, treasures)
+
+def check_steps(plan, monsters, party, treasures, champion_types, thief_as_mage):
+    """Play the plan's steps and return (cost, treasures spent, companions spent)."""
+    monsters, pools = list(monsters), {"party": list(party), "treasure": list(treasures)}
+    cost = treasure_count = 0
+    for source, face, targets in plan.steps:
+        assert pools[source][face] > 0
+        pools[source][face] -= 1
+        cost += TREASURE_COST if source == "treasure" else DIE_COSTS[face]
+        treasure_count += source == "treasure"
+        if face == CHAMPION:
+            assert len(targets) <= champion_types
+        else:
+            assert len(targets) == 1
+        for m, count in targets:
+            assert 0 < count <= monsters[m]
+            if face == CHAMPION or count > 1:
+                assert count == monsters[m]
+                assert face == CHAMPION or face in group_killers(m, thief_as_mage)
+            monsters[m] -= count
+    assert not any(monsters[m] for m in MONSTER_FACES)
+    return cost, treasure_count, len(plan.steps)
+
+def vector(counts):
+    full = [0] * 6
+    for face, count in counts.items():
+        full[face] = count
+    return tuple(full)
+
+def compare(monsters, party, treasures, champion_types=1, thief_as_mage=False):
+    plan = solve_monsters(monsters, party, treasures, champion_types, thief_as_mage)
+    expected = brute_force(monsters, party, treasures, champion_types, thief_as_mage)
+    assert plan.feasible == (expected is not None)
+    if plan.feasible:
+        # The plan's steps are legal, add up to its cost and spend the fewest treasures, then the fewest companions
+        assert check_steps(plan, monsters, party, treasures, champion_types, thief_as_mage) == expected
+        assert plan.cost == expected[0]
+
+@pytest.mark.parametrize("monsters, party, treasures, champion_types, thief_as_mage, companions", [
+    # Group kills: one Fighter takes every Goblin, one Cleric every Skeleton, one Mage every Ooze
+    ({GOBLIN: 3, SKELETON: 2, OOZE: 2}, {FIGHTER: 1, CLERIC: 1, MAGE: 1}, {}, 1, False, 3),
+    # A Thief only defeats one Goblin
+    ({GOBLIN: 2}, {THIEF: 1}, {}, 1, False, None),
+    # The Champion sweeps one type, or two for the Bard
+    ({GOBLIN: 2, SKELETON: 2}, {CHAMPION: 1}, {}, 1, False, None),
+    ({GOBLIN: 2, SKELETON: 2}, {CHAMPION: 1}, {}, 2, False, 1),
+    ({GOBLIN: 1, SKELETON: 1, OOZE: 3}, {CHAMPION: 1, THIEF: 1}, {}, 2, False, 2),
+    # Treasure companions fill in, and are spent last
+    ({OOZE: 3}, {}, {MAGE: 1}, 1, False, 1),
+    ({GOBLIN: 2}, {THIEF: 2}, {FIGHTER: 1}, 1, False, 2),
+    # The Minstrel/Bard's Thieves defeat every Ooze
+    ({OOZE: 3}, {THIEF: 1}, {}, 1, False, None),
+    ({OOZE: 3}, {THIEF: 1}, {}, 1, True, 1),
+    ({OOZE: 2, GOBLIN: 1}, {FIGHTER: 1}, {THIEF: 1}, 1, True, 2),
+])
+def test_solver_examples(monsters, party, treasures, champion_types, thief_as_mage, companions):
+    monsters, party, treasures = vector(monsters), vector(party), vector(treasures)
+    compare(monsters, party, treasures, champion_types, thief_as_mage)
+    plan = solve_monsters(monsters, party, treasures, champion_types, thief_as_mage)
+    assert len(plan.steps) == companions if companions else not plan.feasible
+
+@pytest.mark.parametrize("champion_types, thief_as_mage", [(1, False), (2, False), (1, True), (2, True)])
+def test_solver_matches_brute_force(champion_types, thief_as_mage):
+    rng = random.Random(champion_types * 2 + thief_as_mage)
+    for _ in range(400):
+        monsters = vector({m: rng.randint(0, 3) for m in MONSTER_FACES})
+        party = vector({face: rng.randint(0, 2) for face in (FIGHTER, MAGE, CLERIC, THIEF, CHAMPION)})
+        treasures = vector({face: rng.randint(0, 1) for face in SINGLE_KILLERS if rng.random() < 0.3})
+        compare(monsters, party, treasures, champion_types, thief_as_mage)
@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from dice import PartyDiceFace
+from monster_solver import solve_monsters
+from monster_table import (COMPANION_VECTORS, MONSTER_VECTORS, SPECIALTY_NONE, SPECIALTY_MINSTREL, SPECIALTY_BARD,
+                           can_defeat_counts, feasibility_table)
+
+# solve_monsters arguments for each specialty: (Champion types, Thieves as Mages)
+SOLVER_SPECIALTIES = {SPECIALTY_NONE: (1, False), SPECIALTY_MINSTREL: (1, True), SPECIALTY_BARD: (2, True)}
+NO_TREASURES = (0,) * 6
+
+@pytest.mark.slow
+@pytest.mark.parametrize("specialty", SOLVER_SPECIALTIES)
+def test_every_table_entry_matches_the_solver(specialty):
+    table = feasibility_table()[specialty]
+    for row, companions in enumerate(COMPANION_VECTORS):
+        party = companions + (0,)
+        for column, monsters in enumerate(MONSTER_VECTORS):
+            feasible = solve_monsters(monsters + (0, 0, 0), party, NO_TREASURES, *SOLVER_SPECIALTIES[specialty]).feasible
+            assert table[row, column] == feasible
+            assert can_defeat_counts(*monsters, *companions, specialty) == feasible
+
+def test_companion_treasures_count_as_dice():
+    rng = random.Random(0)
+    treasure_faces = (PartyDiceFace.FIGHTER, PartyDiceFace.MAGE, PartyDiceFace.CLERIC, PartyDiceFace.THIEF)
+    for _ in range(5000):
+        specialty = rng.choice(list(SOLVER_SPECIALTIES))
+        companions, monsters = rng.choice(COMPANION_VECTORS), rng.choice(MONSTER_VECTORS)
+        # Some of the Fighters, Mages, Clerics and Thieves are companion treasures instead of dice
+        treasures = [rng.randint(0, companions[face]) if face in treasure_faces else 0 for face in range(6)]
+        party = [count - treasure for count, treasure in zip(companions + (0,), treasures)]
+        plan = solve_monsters(monsters + (0, 0, 0), tuple(party), tuple(treasures), *SOLVER_SPECIALTIES[specialty])
+        assert can_defeat_counts(*monsters, *companions, specialty) == plan.feasible
@@ -0,0 +1,31 @@
+import numpy as np
+
+from delve_policy import DelvePolicy, NUM_PARTIES, HERO_NAMES
+from delve_value import MAX_LEVEL
+from hero import HeroRank, MinstrelBardHero
+from regroup_table import RegroupTable, RANK_INDEX, MAX_REGROUP_LAIR, write_table
+
+def random_policies(seed=0):
+    rng = np.random.default_rng(seed)
+    shape = (MAX_LEVEL + 1, MAX_REGROUP_LAIR + 1, 2, NUM_PARTIES)
+    policies = {}
+    for hero in HERO_NAMES:
+        for rank in HeroRank:
+            margins = rng.normal(size=shape)
+            policies[hero, rank] = DelvePolicy(hero, rank, rng.uniform(0, 10, size=shape), margins > 0, margins)
+    return policies
+
+def test_table_round_trip(tmp_path):
+    policies = random_policies()
+    path = tmp_path / "regroup_table.bin"
+    write_table(policies, path)
+    table = RegroupTable(path)
+    for (hero, rank), policy in policies.items():
+        h, r = table.heroes[hero], RANK_INDEX[rank]
+        assert np.array_equal(table.choices[h, r], policy.seek[:MAX_LEVEL, :MAX_REGROUP_LAIR + 1])
+        assert np.array_equal(table.margins[h, r], policy.margins[:MAX_LEVEL].astype("<f4"))
+        assert table.delve_values[h, r] == np.float32(policy.start_value)
+
+    hero = MinstrelBardHero()
+    hero.current_rank = HeroRank.MASTER
+    assert table.delve_value(hero) == np.float32(policies["MinstrelBardHero", HeroRank.MASTER].start_value)
@@ -0,0 +1,59 @@
+import pytest
+
+from render import BufferedRenderer, SilentRenderer, TerminalRenderer, display, flush, get_renderer, rendering, say
+
+class CountingStream:
+    """Records every write call."""
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        self.flushes += 1
+
+def test_silent_renderer_skips_display_functions():
+    calls = []
+
+    @display
+    def show(value):
+        calls.append(value)
+        return value
+
+    with rendering(SilentRenderer()):
+        assert show(1) is None
+        say("not formatted", object())
+    assert calls == []
+    stream = CountingStream()
+    with rendering(TerminalRenderer(stream)):
+        assert show(2) == 2
+    assert calls == [2]
+
+def test_buffered_renderer_writes_once_per_flush():
+    stream = CountingStream()
+    with rendering(BufferedRenderer(stream)) as renderer:
+        say("one")
+        say("two", 2, sep="-")
+        assert stream.writes == [] and renderer.getvalue() == "one\ntwo-2\n"
+        flush()
+        assert stream.writes == ["one\ntwo-2\n"] and stream.flushes == 1
+        # An empty frame writes nothing
+        flush()
+        say("three", end="")
+    assert stream.writes == ["one\ntwo-2\n", "three"] and stream.flushes == 2
+
+def test_rendering_restores_the_previous_renderer():
+    outer = get_renderer()
+    silent = SilentRenderer()
+    with rendering(silent):
+        buffered = BufferedRenderer(CountingStream())
+        with rendering(buffered):
+            assert get_renderer() is buffered
+        assert get_renderer() is silent
+        with pytest.raises(RuntimeError):
+            with rendering(BufferedRenderer(CountingStream())):
+                raise RuntimeError
+        assert get_renderer() is silent
+    assert get_renderer() is outer
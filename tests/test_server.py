@@ -0,0 +1,55 @@
+import random
+
+from engine import DelveEngine
+from render import rendering, SilentRenderer
+from rng import GameRandom
+from server import GameServer, GameSession, ScriptedPolicy, session_memory
+from simulate import HEROES
+
+def test_session_matches_game_replayed_from_seed():
+    server = GameServer(seed=5)
+    chooser = random.Random(5)
+    with rendering(SilentRenderer()):
+        for hero in sorted(HEROES):
+            reply = server.handle({"op": "new", "hero": hero, "game": 1})
+            choices = []
+            while not reply.get("game_over"):
+                assert server.handle({"op": "state", "session": reply["session"]}) == reply
+                choices.append(chooser.randrange(len(reply["options"])))
+                reply = server.handle({"op": "choose", "session": reply["session"], "option": choices[-1]})
+            assert reply["step"] == len(choices)
+            engine = DelveEngine(HEROES[hero](), ScriptedPolicy(choices), GameRandom(5, 1))
+            assert engine.play_game() == reply["score"]
+
+def test_session_keeps_only_the_last_phase():
+    server = GameServer(seed=0)
+    with rendering(SilentRenderer()):
+        reply = server.handle({"op": "new", "hero": "minstrel"})
+        session = server.sessions[reply["session"]]
+        while not reply.get("game_over"):
+            reply = server.handle({"op": "choose", "session": reply["session"], "option": 0})
+            assert session.anchor is not None
+            assert len(session.choices) < 10
+
+def test_finished_sessions_stay_small():
+    assert session_memory(200, moves=1000) < 5000
+
+def test_engine_error_closes_only_its_session(monkeypatch):
+    server = GameServer(seed=0)
+    with rendering(SilentRenderer()):
+        broken = server.handle({"op": "new", "hero": "minstrel"})["session"]
+        other = server.handle({"op": "new", "hero": "minstrel"})["session"]
+
+        advance = GameSession.advance
+
+        def fail(session):
+            if session.session_id == broken:
+                raise RuntimeError("corrupt anchor")
+            return advance(session)
+        monkeypatch.setattr(GameSession, "advance", fail)
+        reply = server.handle({"op": "choose", "session": broken, "option": 0, "id": 7})
+        assert "corrupt anchor" in reply["error"]
+        assert reply["closed"] == broken and reply["id"] == 7
+        assert broken not in server.sessions
+        assert "options" in server.handle({"op": "choose", "session": other, "option": 0})
+        assert server.handle({"op": "stats"})["messages"] == 4
@@ -0,0 +1,50 @@
+import simulate as simulate_module
+from policy import Decision, GreedyPolicy, RandomPolicy
+from render import rendering, SilentRenderer
+from simulate import SimulationResult, play_one, run_chunk, simulate, HEROES
+from treasure import TreasureType
+
+class PortalPolicy(GreedyPolicy):
+    """Leaves through a Town Portal as soon as monsters turn up and one is held."""
+    def choose(self, game_state, decision, options):
+        values = [option.value for option in options]
+        if decision == Decision.MONSTER_ACTION and "treasure" in values and \
+                game_state.player_treasure.count_treasure_type(TreasureType.TOWN_PORTAL):
+            return "treasure"
+        if decision == Decision.TREASURE and TreasureType.TOWN_PORTAL in values:
+            return TreasureType.TOWN_PORTAL
+        return super().choose(game_state, decision, options)
+
+def test_town_portal_is_not_counted_as_fleeing():
+    result = simulate(300, "minstrel", PortalPolicy, workers=1, seed=0, instrument=True)
+    outcomes = result.phase_stats.outcomes
+    assert outcomes["town_portal"] > 0
+    assert result.delves_fled == outcomes["fled_monsters"] + outcomes["fled_dragon"]
+
+def replay(game_id, seed=4):
+    """Play one game of a run on its own. Returns the engine and the final score."""
+    with rendering(SilentRenderer()):
+        engine, score = play_one(HEROES["minstrel"], RandomPolicy, seed, game_id)
+    return engine, score
+
+def test_any_game_replays_from_seed_and_id(monkeypatch):
+    games = 30
+    played = [replay(game_id) for game_id in range(games)]
+    # Alone, in a different order, after other games in the same process
+    for game_id in reversed(range(games)):
+        engine, score = replay(game_id)
+        assert (engine.delve_results, score) == (played[game_id][0].delve_results, played[game_id][1])
+
+    expected = SimulationResult()
+    for engine, score in played:
+        expected.add_game(engine, score)
+    # Games land in other chunks and workers, and the run is the same
+    monkeypatch.setattr(simulate_module, "CHUNK_SIZE", 7)
+    for workers in (1, 3):
+        assert simulate(games, "minstrel", RandomPolicy, workers=workers, seed=4).to_dict() == expected.to_dict()
+    for first in (0, 5, 13):
+        chunk, _ = run_chunk(HEROES["minstrel"], RandomPolicy, 4, first, 11)
+        part = SimulationResult()
+        for engine, score in played[first:first + 11]:
+            part.add_game(engine, score)
+        assert chunk.to_dict() == part.to_dict()
@@ -0,0 +1,25 @@
+from tournament import Matchup, run_tournament, sequential_z
+
+def test_matchup_statistics_frozen_when_resolved():
+    scores = {"a": [10, 12, 11, 13], "b": [5, 12, 6, 4]}
+    matchup = Matchup("a", "b")
+    matchup.update(scores, 1.0, 2)
+    assert matchup.resolved
+    frozen = matchup.to_dict()
+    # "a" plays on in other matchups; this one keeps reporting the games it was decided on
+    scores["a"] += [0] * 10
+    scores["b"] += [20] * 10
+    assert matchup.to_dict() == frozen
+    assert frozen["games"] == 4
+    assert (frozen["wins"], frozen["ties"], frozen["losses"]) == (3, 1, 0)
+    assert frozen["win_rate"] == 3.5 / 4
+
+def test_alpha_split_over_matchups():
+    assert sequential_z(0.05, 1000, 100, 6) > sequential_z(0.05, 1000, 100)
+
+def test_report_consistent():
+    report = run_tournament(["random", "greedy", "retire@3"], ["minstrel"], batch_size=50, max_games=200, workers=1)
+    for matchup in report["heroes"]["minstrel"]["matchups"]:
+        assert matchup["wins"] + matchup["ties"] + matchup["losses"] == matchup["games"]
+        low, high = matchup["interval"]
+        assert (matchup["winner"] is not None) == (low > 0 or high < 0)
@@ -0,0 +1,62 @@
+import random
+from collections import Counter
+
+import numpy as np
+
+from treasure import TreasureManager, PlayerTreasure, TreasureType, INITIAL_POOL, TREASURE_TYPES
+
+# Chi-square critical values at p = 0.001 by degrees of freedom
+CHI2_CRITICAL = {8: 26.124, 9: 27.877}
+
+def chi_square(counts, weights):
+    total, weight = sum(counts), sum(weights)
+    expected = [total * w / weight for w in weights]
+    return sum((c - e) ** 2 / e for c, e in zip(counts, expected) if e)
+
+def first_draws(n, pool):
+    manager = TreasureManager(np.random.default_rng(0))
+    draws = Counter()
+    for _ in range(n):
+        manager.restore(pool)
+        draws[manager.draw_treasure().type] += 1
+    return [draws[t] for t in TREASURE_TYPES]
+
+def test_draws_follow_pool_proportions():
+    counts = first_draws(20000, INITIAL_POOL)
+    assert chi_square(counts, INITIAL_POOL) < CHI2_CRITICAL[9]
+
+def test_exhausted_type_is_never_drawn():
+    pool = list(INITIAL_POOL)
+    pool[TreasureType.DRAGON_SCALE] = 0
+    counts = first_draws(20000, pool)
+    assert counts[TreasureType.DRAGON_SCALE] == 0
+    assert chi_square(counts, pool) < CHI2_CRITICAL[8]
+
+def test_emptying_the_pool_draws_every_token():
+    manager = TreasureManager(np.random.default_rng(1))
+    draws = Counter(manager.draw_treasure().type for _ in range(sum(INITIAL_POOL)))
+    assert [draws[t] for t in TREASURE_TYPES] == list(INITIAL_POOL)
+    assert manager.draw_treasure() is None and manager.get_pool_size() == 0
+    assert manager.take_treasure(TreasureType.ELIXIR) is None
+
+def test_pool_and_hoard_stay_consistent():
+    rng = random.Random(2)
+    manager = TreasureManager(np.random.default_rng(2))
+    hoard = PlayerTreasure(manager)
+    for _ in range(5000):
+        move = rng.randrange(3)
+        if move == 0:
+            token = manager.draw_treasure()
+            if token is not None:
+                hoard.add_treasure(token)
+        elif move == 1:
+            token = manager.take_treasure(rng.choice(TREASURE_TYPES))
+            if token is not None:
+                hoard.add_treasure(token)
+        else:
+            hoard.use_treasure_type(rng.choice(TREASURE_TYPES))
+        # Every token is in the pool or the hoard, and the sizes match the counts
+        assert [p + h for p, h in zip(manager.pool_counts, hoard.counts)] == list(INITIAL_POOL)
+        assert min(manager.pool_counts) >= 0 and min(hoard.counts) >= 0
+        assert manager.pool_size == sum(manager.pool_counts)
+        assert hoard.size == sum(hoard.counts)
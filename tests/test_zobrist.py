@@ -0,0 +1,59 @@
+import pytest
+
+from engine import DelveEngine
+from game_state import GameState
+from hero import MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero
+from policy import RandomPolicy
+from render import rendering, SilentRenderer
+from rng import GameRandom
+from zobrist import MAX_COUNT
+
+def fresh_hash(game_state):
+    """The Zobrist hash of a copy of `game_state` built from scratch."""
+    copy = GameState()
+    copy.selected_hero_card = game_state.selected_hero_card
+    copy.party_counts = list(game_state.party_counts)
+    copy.graveyard_counts = list(game_state.graveyard_counts)
+    copy.dungeon_counts = list(game_state.dungeon_counts)
+    copy.treasure_manager.restore(game_state.treasure_manager.snapshot())
+    copy.player_treasure.restore(game_state.player_treasure.snapshot())
+    copy.dragons_lair = game_state.dragons_lair
+    copy.level = game_state.level
+    copy.delve_count = game_state.delve_count
+    return copy.zobrist_hash
+
+class CheckingPolicy(RandomPolicy):
+    """Plays at random and checks the incremental hash at every decision."""
+    def choose(self, game_state, decision, options):
+        assert game_state.zobrist_hash == fresh_hash(game_state)
+        return super().choose(game_state, decision, options)
+
+@pytest.mark.parametrize("hero_class", [MinstrelBardHero, AlchemistThaumaturgeHero, ArchaeologistTombRaiderHero])
+def test_incremental_hash_in_play(hero_class):
+    with rendering(SilentRenderer()):
+        for game_id in range(20):
+            engine = DelveEngine(hero_class(), CheckingPolicy(game_id), rng=GameRandom(3, game_id))
+            engine.play_game()
+            assert engine.state.zobrist_hash == fresh_hash(engine.state)
+
+@pytest.mark.parametrize("count", [-1, MAX_COUNT + 1])
+def test_counts_out_of_range(count):
+    state = GameState()
+    state.party_counts = [1, 2, 0, 0, 0, 0]
+    before = state.zobrist_hash
+    with pytest.raises(ValueError):
+        state.party_counts[0] = count
+    with pytest.raises(ValueError):
+        state.party_counts = [0, 0, 0, 0, 0, count]
+    assert state.party_counts == [1, 2, 0, 0, 0, 0]
+    assert state.zobrist_hash == before
+
+@pytest.mark.parametrize("name", ["dragons_lair", "level", "delve_count"])
+def test_scalars_out_of_range(name):
+    state = GameState()
+    setattr(state, name, -1)
+    with pytest.raises(ValueError):
+        state.zobrist_hash
+    setattr(state, name, MAX_COUNT + 1)
+    with pytest.raises(ValueError):
+        state.zobrist_hash
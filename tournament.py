@@ -0,0 +1,237 @@
+import argparse
+import json
+import math
+import os
+import sys
+from functools import partial
+from itertools import combinations
+from statistics import NormalDist, fmean, stdev
+
+from policy import RandomPolicy, GreedyPolicy, LookaheadPolicy, RetireAtLevelPolicy
+from render import rendering, SilentRenderer
+from simulate import HEROES, play_one
+
+# Games each active policy plays between checks of the stopping rule
+BATCH_SIZE = 200
+
+# A matchup still unresolved after this many games is reported as undecided
+MAX_GAMES = 20000
+
+# Family-wise error rate of all the pairwise comparisons of one hero's tournament: the chance
+# of declaring any false winner, over every matchup and every check
+ALPHA = 0.05
+
+def policy_factory(spec):
+    """Turn a policy name into something that builds the policy from a seed.
+
+    Names are "random", "greedy", "lookahead", "retire@K" (seek glory until level K),
+    "solver" or "solver=PATH" (Regroup choices from the table written by `python regroup_table.py`,
+    solved in `DelveSolver`'s model, which leaves companion treasures out of the state)
+    and "mcts@MS" or "mcts#N" (tree search for MS milliseconds or N iterations a move, with
+    GreedyPolicy rollouts, or SolverPolicy rollouts with a "+solver" suffix).
+    """
+    if spec == "random":
+        return RandomPolicy
+    if spec == "greedy":
+        return GreedyPolicy
+    if spec == "lookahead":
+        return LookaheadPolicy
+    if spec.startswith("retire@"):
+        level = int(spec[len("retire@"):])
+        if not 1 <= level <= 10:
+            raise ValueError(f"{spec}: the retirement level must be from 1 to 10")
+        return partial(RetireAtLevelPolicy, level=level)
+    if spec == "solver" or spec.startswith("solver="):
+        from delve_policy import SolverPolicy
+        from regroup_table import DEFAULT_PATH
+        path = spec.partition("=")[2] or DEFAULT_PATH
+        if not os.path.exists(path):
+            raise ValueError(f"{path} not found. Run `python regroup_table.py` to solve the Regroup table first")
+        return partial(SolverPolicy, path=path)
+    if spec.startswith(("mcts@", "mcts#")):
+        from mcts import MCTSPolicy
+        budget_spec, plus, rollout_spec = spec[len("mcts@"):].partition("+")
+        if plus and rollout_spec != "solver":
+            raise ValueError(f"{spec}: the only rollout that can be named is +solver")
+        rollout = policy_factory("solver") if plus else GreedyPolicy
+        try:
+            budget = int(budget_spec)
+        except ValueError:
+            raise ValueError(f"{spec}: the search budget must be a whole number")
+        if budget < 1:
+            raise ValueError(f"{spec}: the search budget must be at least 1")
+        if spec[4] == "#":
+            return partial(MCTSPolicy, iterations=budget, rollout=rollout)
+        return partial(MCTSPolicy, budget_ms=budget, rollout=rollout)
+    raise ValueError(f"Unknown policy '{spec}'. Use random, greedy, lookahead, retire@K, solver[=PATH], "
+                     "mcts@MS[+solver] or mcts#N[+solver]")
+
+def play_scores(hero_class, spec, seed, first_game, num_games):
+    """Final scores of games [first_game, first_game + num_games) played silently by policy `spec`."""
+    factory = policy_factory(spec)
+    with rendering(SilentRenderer()):
+        return [play_one(hero_class, factory, seed, game_id)[1] for game_id in range(first_game, first_game + num_games)]
+
+def sequential_z(alpha, max_games, batch_size, matchups=1):
+    """Critical z for checking each of `matchups` matchups after every batch.
+
+    Splitting `alpha` evenly over every planned check of every matchup
+    (Bonferroni) keeps the chance of ever declaring any false winner below
+    `alpha`, however early the matchups stop.
+    """
+    looks = math.ceil(max_games / batch_size)
+    return NormalDist().inv_cdf(1 - alpha / (2 * looks * matchups))
+
+def mean_interval(values, z):
+    """Mean and half-width of its normal confidence interval."""
+    if len(values) < 2:
+        return (fmean(values) if values else 0.0), math.inf
+    return fmean(values), z * stdev(values) / math.sqrt(len(values))
+
+class Matchup:
+    """Two policies compared game by game on the same seeded games.
+
+    Every statistic is taken from the games played up to the last update, so a
+    resolved matchup reports the games it was resolved on, even if one of its
+    policies goes on playing in other matchups.
+    """
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.resolved = False
+        self.games = 0
+        self.difference = 0.0
+        self.half_width = math.inf
+        self.wins = 0
+        self.ties = 0
+
+    def update(self, scores, z, min_games):
+        """Recompute the paired statistics and stop the matchup once its interval excludes zero."""
+        pairs = list(zip(scores[self.first], scores[self.second]))
+        self.games = len(pairs)
+        self.difference, self.half_width = mean_interval([a - b for a, b in pairs], z)
+        self.wins = sum(a > b for a, b in pairs)
+        self.ties = sum(a == b for a, b in pairs)
+        self.resolved = self.games >= min_games and abs(self.difference) > self.half_width
+
+    def to_dict(self):
+        wins, ties = self.wins, self.ties
+        return {
+            "first": self.first,
+            "second": self.second,
+            "games": self.games,
+            "mean_difference": self.difference,
+            "interval": [self.difference - self.half_width, self.difference + self.half_width],
+            "wins": wins,
+            "ties": ties,
+            "losses": self.games - wins - ties,
+            "win_rate": (wins + ties / 2) / self.games if self.games else 0.0,
+            "winner": (self.first if self.difference > 0 else self.second) if self.resolved else None,
+        }
+
+def run_hero(hero, specs, seed, batch_size, max_games, z, executor=None, workers=1):
+    """Play one hero's matchups until each is resolved or reaches `max_games`. Returns (scores, matchups)."""
+    hero_class = HEROES[hero]
+    scores = {spec: [] for spec in specs}
+    matchups = [Matchup(first, second) for first, second in combinations(specs, 2)]
+    played = 0
+    while played < max_games:
+        active = [spec for spec in specs if any(not m.resolved and spec in (m.first, m.second) for m in matchups)]
+        if not active:
+            break
+        count = min(batch_size, max_games - played)
+        # Split each policy's batch into one job per worker
+        step = math.ceil(count / workers)
+        jobs = [(hero_class, spec, seed, start, min(step, played + count - start))
+                for spec in active for start in range(played, played + count, step)]
+        if executor is None:
+            results = [play_scores(*job) for job in jobs]
+        else:
+            results = list(executor.map(play_scores, *zip(*jobs)))
+        for job, result in zip(jobs, results):
+            scores[job[1]] += result
+        played += count
+        for matchup in matchups:
+            if not matchup.resolved:
+                matchup.update(scores, z, batch_size)
+    return scores, matchups
+
+def run_tournament(specs, heroes=None, seed=0, batch_size=BATCH_SIZE, max_games=MAX_GAMES, alpha=ALPHA, workers=None):
+    """Play every pair of policies against each other for every hero and return the report as a dict.
+
+    Game `g` of every policy uses the dice and treasure streams of
+    `GameRandom(seed, g)`, so policies are compared on identical deals and each
+    comparison is paired game by game. A matchup stops as soon as the
+    difference in mean score is resolved; `alpha` bounds the chance of any
+    false winner among a hero's matchups. Policy means get plain intervals at
+    level `alpha` each.
+    """
+    if len(specs) < 2:
+        raise ValueError("A tournament needs at least two policies")
+    for spec in specs:
+        policy_factory(spec)
+    heroes = heroes or list(HEROES)
+    workers = workers or os.cpu_count() or 1
+    z = sequential_z(alpha, max_games, batch_size, math.comb(len(specs), 2))
+    interval_z = NormalDist().inv_cdf(1 - alpha / 2)
+
+    report = {"seed": seed, "alpha": alpha, "batch_size": batch_size, "max_games": max_games, "heroes": {}}
+    executor = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for hero in heroes:
+            scores, matchups = run_hero(hero, specs, seed, batch_size, max_games, z, executor, workers)
+            policies = {}
+            for spec in specs:
+                mean, half_width = mean_interval(scores[spec], interval_z)
+                policies[spec] = {"games": len(scores[spec]), "mean_score": mean,
+                                  "interval": [mean - half_width, mean + half_width]}
+            report["heroes"][hero] = {"policies": policies,
+                                      "matchups": [matchup.to_dict() for matchup in matchups]}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pit policies against each other on identical seeded games.")
+    parser.add_argument("policies", nargs="+",
+                        help="random, greedy, lookahead, retire@K, solver[=PATH] (Regroup table choices, which ignore "
+                             "companion treasures), mcts@MS or mcts#N (add +solver for SolverPolicy rollouts)")
+    parser.add_argument("--hero", action="append", choices=sorted(HEROES),
+                        help="hero to play (repeatable; default: every hero)")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="games per policy between checks")
+    parser.add_argument("--max-games", type=int, default=MAX_GAMES, help="games after which a matchup is undecided")
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="chance of declaring any false winner among a hero's matchups")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_tournament(args.policies, args.hero, args.seed, args.batch, args.max_games, args.alpha,
+                                args.workers)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    for hero, result in report["heroes"].items():
+        print(f"\n{hero}")
+        for spec, stats in sorted(result["policies"].items(), key=lambda item: -item[1]["mean_score"]):
+            low, high = stats["interval"]
+            print(f"  {spec:16} {stats['mean_score']:7.3f}  [{low:.3f}, {high:.3f}]  {stats['games']} games")
+        for matchup in result["matchups"]:
+            low, high = matchup["interval"]
+            verdict = f"{matchup['winner']} better" if matchup["winner"] else "undecided"
+            print(f"  {matchup['first']} vs {matchup['second']}: {matchup['mean_difference']:+.3f} "
+                  f"[{low:+.3f}, {high:+.3f}], wins {matchup['win_rate']:.1%} over {matchup['games']} games, {verdict}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,54 @@
-import random
-from enum import Enum
+import numpy as np
+from enum import IntEnum
 from typing import List, Dict
-from dice import PartyDiceFace, DungeonDiceFace
+from dice import PartyDiceFace, MONSTER_FACES, DIE_SIDES
+from policy import Decision, Option
+from scroll import ScrollActions
+from render import say
 
-class TreasureType(Enum):
-    VORPAL_SWORD = "Vorpal Sword"
-    TALISMAN = "Talisman"
-    SCEPTER_OF_POWER = "Scepter of Power"
-    THIEVES_TOOLS = "Thieves' Tools"
-    SCROLL = "Scroll"
-    RING_OF_INVISIBILITY = "Ring of Invisibility"
-    DRAGON_SCALE = "Dragon Scale"
-    ELIXIR = "Elixir"
-    DRAGON_BAIT = "Dragon Bait"
-    TOWN_PORTAL = "Town Portal"
+class TreasureType(IntEnum):
+    """A treasure type stored as a small int, so it can index count vectors."""
+    VORPAL_SWORD = 0
+    TALISMAN = 1
+    SCEPTER_OF_POWER = 2
+    THIEVES_TOOLS = 3
+    SCROLL = 4
+    RING_OF_INVISIBILITY = 5
+    DRAGON_SCALE = 6
+    ELIXIR = 7
+    DRAGON_BAIT = 8
+    TOWN_PORTAL = 9
+
+    @property
+    def label(self):
+        return TREASURE_LABELS[self]
+
+    def __str__(self):
+        return self.label
+
+    def __format__(self, format_spec):
+        return format(self.label, format_spec)
+
+    __hash__ = int.__hash__
+
+TREASURE_LABELS = ("Vorpal Sword", "Talisman", "Scepter of Power", "Thieves' Tools", "Scroll",
+                   "Ring of Invisibility", "Dragon Scale", "Elixir", "Dragon Bait", "Town Portal")
+
+TREASURE_TYPES = tuple(TreasureType)
+NUM_TREASURE_TYPES = len(TREASURE_TYPES)
+
+# Tokens in a full treasure pool, by type
+INITIAL_POOL = (3, 3, 3, 3, 3, 4, 6, 3, 4, 4)
+
+COMPANION_TYPES = {
+    TreasureType.VORPAL_SWORD: PartyDiceFace.FIGHTER,
+    TreasureType.TALISMAN: PartyDiceFace.CLERIC,
+    TreasureType.SCEPTER_OF_POWER: PartyDiceFace.MAGE,
+    TreasureType.THIEVES_TOOLS: PartyDiceFace.THIEF,
+}
+
+# The treasure that acts as each companion type
+COMPANION_TREASURES = {face: treasure_type for treasure_type, face in COMPANION_TYPES.items()}
 
 class TreasureToken:
     def __init__(self, treasure_type: TreasureType):
@@ -21,7 +56,7 @@ class TreasureToken:
         
     @property
     def name(self) -> str:
-        return self.type.value
+        return self.type.label
         
     def get_description(self) -> str:
         descriptions = {
@@ -40,266 +75,230 @@ class TreasureToken:
     
     def can_use_as_companion(self) -> bool:
         """Check if this treasure can be used as a companion."""
-        return self.type in [
-            TreasureType.VORPAL_SWORD,
-            TreasureType.TALISMAN,
-            TreasureType.SCEPTER_OF_POWER,
-            TreasureType.THIEVES_TOOLS
-        ]
+        return self.type in COMPANION_TYPES
     
-    def get_companion_type(self) -> str:
+    def get_companion_type(self) -> PartyDiceFace:
         """Get the companion type this treasure can act as."""
-        companion_map = {
-            TreasureType.VORPAL_SWORD: PartyDiceFace.FIGHTER.value,
-            TreasureType.TALISMAN: PartyDiceFace.CLERIC.value,
-            TreasureType.SCEPTER_OF_POWER: PartyDiceFace.MAGE.value,
-            TreasureType.THIEVES_TOOLS: PartyDiceFace.THIEF.value,
-            TreasureType.SCROLL: PartyDiceFace.SCROLL.value
-        }
-        return companion_map.get(self.type)
+        if self.type == TreasureType.SCROLL:
+            return PartyDiceFace.SCROLL
+        return COMPANION_TYPES.get(self.type)
+
+# Tokens of one type are interchangeable, so one shared token stands for every token of its type
+TREASURE_TOKENS = tuple(TreasureToken(treasure_type) for treasure_type in TREASURE_TYPES)
 
 class TreasureManager:
-    def __init__(self):
-        # Initialize the treasure pool with correct counts
-        self.treasure_pool: List[TreasureToken] = []
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.recorder = None  # Optional GameRecorder told about every draw
+        # The pool is a count vector: entry i is the number of tokens of TreasureType i left
+        self.pool_counts: List[int] = [0] * NUM_TREASURE_TYPES
+        self.pool_size = 0
         self.initialize_treasure_pool()
         
     def initialize_treasure_pool(self):
-        """Initialize the treasure pool with the correct number of each type."""
-        counts = {
-            TreasureType.VORPAL_SWORD: 3,
-            TreasureType.TALISMAN: 3,
-            TreasureType.SCEPTER_OF_POWER: 3,
-            TreasureType.THIEVES_TOOLS: 3,
-            TreasureType.SCROLL: 3,
-            TreasureType.RING_OF_INVISIBILITY: 4,
-            TreasureType.DRAGON_SCALE: 6,
-            TreasureType.ELIXIR: 3,
-            TreasureType.DRAGON_BAIT: 4,
-            TreasureType.TOWN_PORTAL: 4
-        }
-        
-        for treasure_type, count in counts.items():
-            for _ in range(count):
-                self.treasure_pool.append(TreasureToken(treasure_type))
+        """Fill the treasure pool with the starting number of each type."""
+        self.pool_counts[:] = INITIAL_POOL
+        self.pool_size = sum(INITIAL_POOL)
     
     def draw_treasure(self) -> TreasureToken:
-        """Draw a random treasure token from the pool."""
-        if not self.treasure_pool:
+        """Draw a random treasure token from the pool, each remaining token equally likely."""
+        if not self.pool_size:
+            if self.recorder is not None:
+                self.recorder.treasure(None)
+            return None
+        # Walk the (fixed, short) list of types to the chosen token
+        pick = int(self.rng.integers(self.pool_size))
+        for treasure_type, count in enumerate(self.pool_counts):
+            if pick < count:
+                break
+            pick -= count
+        self.pool_counts[treasure_type] -= 1
+        self.pool_size -= 1
+        if self.recorder is not None:
+            self.recorder.treasure(treasure_type)
+        return TREASURE_TOKENS[treasure_type]
+    
+    def stream_state(self):
+        """The generator state, for `resume_stream`."""
+        return self.rng.bit_generator.state
+
+    def resume_stream(self, rng, stream_state):
+        """Draw from `rng` set to a `stream_state()`, repeating the draws that followed it."""
+        rng.bit_generator.state = stream_state
+        self.rng = rng
+    
+    def take_treasure(self, treasure_type: TreasureType) -> TreasureToken:
+        """Take a token of a given type out of the pool, or None if there is none left."""
+        if not self.pool_counts[treasure_type]:
             return None
-        return self.treasure_pool.pop(random.randint(0, len(self.treasure_pool) - 1))
+        self.pool_counts[treasure_type] -= 1
+        self.pool_size -= 1
+        return TREASURE_TOKENS[treasure_type]
     
     def return_treasure(self, token: TreasureToken):
         """Return a used treasure token to the pool."""
-        self.treasure_pool.append(token)
+        self.pool_counts[token.type] += 1
+        self.pool_size += 1
     
     def get_pool_size(self) -> int:
         """Get the number of treasure tokens remaining in the pool."""
-        return len(self.treasure_pool)
+        return self.pool_size
     
     def get_pool_contents(self) -> Dict[str, int]:
         """Get a count of each type of treasure in the pool."""
-        contents = {}
-        for token in self.treasure_pool:
-            contents[token.name] = contents.get(token.name, 0) + 1
-        return contents
+        return {TREASURE_LABELS[i]: count for i, count in enumerate(self.pool_counts) if count}
+
+    def snapshot(self) -> tuple:
+        """The pool as a hashable count tuple."""
+        return tuple(self.pool_counts)
+
+    def restore(self, snapshot: tuple):
+        """Reset the pool to a `snapshot()`."""
+        self.pool_counts[:] = snapshot
+        self.pool_size = sum(snapshot)
 
 class PlayerTreasure:
     def __init__(self, treasure_manager: TreasureManager):
         self.treasure_manager = treasure_manager
-        self.collected_treasures: List[TreasureToken] = []
+        # The hoard is a count vector by TreasureType, like the pool
+        self.counts: List[int] = [0] * NUM_TREASURE_TYPES
+        self.size = 0
     
     def add_treasure(self, token: TreasureToken):
         """Add a treasure token to the player's collection."""
-        self.collected_treasures.append(token)
+        self.counts[token.type] += 1
+        self.size += 1
     
-    def use_treasure(self, index: int) -> TreasureToken:
-        """Use a treasure token from the player's collection."""
-        if 0 <= index < len(self.collected_treasures):
-            token = self.collected_treasures.pop(index)
-            self.treasure_manager.return_treasure(token)
-            return token
-        return None
+    def use_treasure_type(self, treasure_type: TreasureType) -> TreasureToken:
+        """Use a treasure token of the given type, returning it to the pool."""
+        if not self.counts[treasure_type]:
+            return None
+        self.counts[treasure_type] -= 1
+        self.size -= 1
+        token = TREASURE_TOKENS[treasure_type]
+        self.treasure_manager.return_treasure(token)
+        return token
     
     def get_available_treasures(self) -> List[TreasureToken]:
-        """Get all treasures in the player's collection."""
-        return self.collected_treasures
+        """Get all treasures in the player's collection, one token per treasure held."""
+        return [TREASURE_TOKENS[i] for i, count in enumerate(self.counts) for _ in range(count)]
     
     def calculate_end_game_experience(self) -> int:
         """Calculate additional experience from treasures at game end."""
-        exp = 0
-        
-        # Count Dragon Scales (2 exp per pair)
-        dragon_scales = sum(1 for t in self.collected_treasures 
-                          if t.type == TreasureType.DRAGON_SCALE)
-        exp += (dragon_scales // 2) * 2
-        
-        # Count Town Portals (2 exp each if unused)
-        town_portals = sum(1 for t in self.collected_treasures 
-                          if t.type == TreasureType.TOWN_PORTAL)
-        exp += town_portals * 2
-        
-        # All other treasures worth 1 exp
-        other_treasures = len(self.collected_treasures) - dragon_scales - town_portals
-        exp += other_treasures
-        
-        return exp
+        # Dragon Scales score 2 exp per pair, unused Town Portals 2 exp each, everything else 1 exp
+        dragon_scales = self.counts[TreasureType.DRAGON_SCALE]
+        town_portals = self.counts[TreasureType.TOWN_PORTAL]
+        other_treasures = self.size - dragon_scales - town_portals
+        return (dragon_scales // 2) * 2 + town_portals * 2 + other_treasures
     
-    def get_usable_companions(self) -> List[tuple[int, TreasureToken]]:
-        """Get all treasures that can be used as companions."""
-        return [(i, t) for i, t in enumerate(self.collected_treasures) 
-                if t.can_use_as_companion()]
+    def get_usable_companions(self) -> List[TreasureToken]:
+        """Get all treasures that can be used as companions, one token per treasure held."""
+        return [TREASURE_TOKENS[treasure_type] for treasure_type in COMPANION_TYPES
+                for _ in range(self.counts[treasure_type])]
+
+    def companion_counts(self) -> List[int]:
+        """Number of companion treasures acting as each party face, as a count vector."""
+        counts = [0] * DIE_SIDES
+        for treasure_type, face in COMPANION_TYPES.items():
+            counts[face] += self.counts[treasure_type]
+        return counts
     
     def has_treasure_type(self, treasure_type: TreasureType) -> bool:
         """Check if player has a specific type of treasure."""
-        return any(t.type == treasure_type for t in self.collected_treasures)
+        return self.counts[treasure_type] > 0
     
     def count_treasure_type(self, treasure_type: TreasureType) -> int:
         """Count how many of a specific treasure type the player has."""
-        return sum(1 for t in self.collected_treasures if t.type == treasure_type)
+        return self.counts[treasure_type]
+
+    def snapshot(self) -> tuple:
+        """The hoard as a hashable count tuple."""
+        return tuple(self.counts)
+
+    def restore(self, snapshot: tuple):
+        """Reset the hoard to a `snapshot()`."""
+        self.counts[:] = snapshot
+        self.size = sum(snapshot)
 
 class TreasureActions:
     @staticmethod
-    def use_treasure(game_state):
+    def can_use(game_state, treasure_type):
+        """Check if a treasure would have any effect if used outside of combat right now."""
+        if treasure_type == TreasureType.RING_OF_INVISIBILITY:
+            return bool(game_state.dragons_lair)
+        if treasure_type == TreasureType.ELIXIR:
+            return game_state.graveyard_size > 0
+        if treasure_type == TreasureType.DRAGON_BAIT:
+            return game_state.monster_count > 0
+        if treasure_type == TreasureType.TOWN_PORTAL:
+            return True
+        if treasure_type == TreasureType.SCROLL:
+            return game_state.dungeon_size + game_state.party_size > 0
+        return False  # Companion-like treasures are handled in their respective phases
+    
+    @staticmethod
+    def get_usable_treasures(game_state):
+        """Get one option per distinct treasure type that can be used right now."""
+        options = []
+        for token in game_state.get_available_treasures():
+            option = Option(token.type, f"{token.name} - {token.get_description()}")
+            if option not in options and TreasureActions.can_use(game_state, token.type):
+                options.append(option)
+        return options
+    
+    @staticmethod
+    def use_treasure(game_state, policy):
         """Handle using a treasure token."""
-        treasures = game_state.get_available_treasures()
-        if not treasures:
-            print("No treasures available!")
+        options = TreasureActions.get_usable_treasures(game_state)
+        if not options:
+            say("No treasures available!")
+            return False
+        options.append(Option(None, "Cancel"))
+        
+        say("\nAvailable Treasures:")
+        treasure_type = policy.choose(game_state, Decision.TREASURE, options)
+        if treasure_type is None:
             return False
-            
-        print("\nAvailable Treasures:")
-        game_state.display_treasure_info()
-        print(f"{len(treasures)+1}. Cancel")
         
-        choice = input("Choose treasure to use (number): ").strip()
-        try:
-            choice_idx = int(choice) - 1
-            if choice_idx == len(treasures):
-                return False
-            if 0 <= choice_idx < len(treasures):
-                token = treasures[choice_idx]
+        # Handle different treasure types
+        if treasure_type == TreasureType.RING_OF_INVISIBILITY:
+            # Return dragons to pool without defeating them
+            dragon_count = game_state.dragons_lair
+            game_state.dragons_lair = 0
+            say(f"Ring of Invisibility used! {dragon_count} Dragon dice returned to pool.")
+            game_state.use_treasure_type(treasure_type)
+            return True
+            
+        elif treasure_type == TreasureType.ELIXIR:
+            say("\nChoose a die face for the revived Party die:")
+            face_options = [Option(face, face.label) for face in PartyDiceFace]
+            chosen_face = policy.choose(game_state, Decision.ELIXIR_FACE, face_options)
+            game_state.revive_die(chosen_face)
+            say(f"Elixir used! Added a {chosen_face} to your active party!")
+            game_state.use_treasure_type(treasure_type)
+            return True
                 
-                # Handle different treasure types
-                if token.type == TreasureType.RING_OF_INVISIBILITY:
-                    # Return dragons to pool without defeating them
-                    dragon_count = len(game_state.dragons_lair)
-                    game_state.dragons_lair = []
-                    print(f"Ring of Invisibility used! {dragon_count} Dragon dice returned to pool.")
-                    game_state.use_treasure(choice_idx)
-                    return True
-                    
-                elif token.type == TreasureType.ELIXIR:
-                    if not game_state.graveyard:
-                        print("No dice in Graveyard to revive!")
-                        return False
-                    
-                    print("\nChoose a die face for the revived Party die:")
-                    for i, face in enumerate(PartyDiceFace):
-                        print(f"{i+1}. {face.value}")
-                    
-                    face_choice = input("Choose face (number): ").strip()
-                    try:
-                        face_idx = int(face_choice) - 1
-                        if 0 <= face_idx < len(PartyDiceFace):
-                            # Remove a die from graveyard
-                            game_state.graveyard.pop()
-                            # Add new die with chosen face
-                            chosen_face = list(PartyDiceFace)[face_idx].value
-                            game_state.party_dice.append(chosen_face)
-                            print(f"Elixir used! Added a {chosen_face} to your active party!")
-                            game_state.use_treasure(choice_idx)
-                            return True
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                        
-                elif token.type == TreasureType.DRAGON_BAIT:
-                    # Transform all monsters into dragons
-                    monster_count = 0
-                    for i, die in enumerate(game_state.dungeon_dice):
-                        if die in [DungeonDiceFace.GOBLIN.value, DungeonDiceFace.SKELETON.value, DungeonDiceFace.OOZE.value]:
-                            game_state.dragons_lair.append(DungeonDiceFace.DRAGON.value)
-                            monster_count += 1
-                    
-                    # Remove transformed monsters
-                    game_state.dungeon_dice = [die for die in game_state.dungeon_dice 
-                                             if die not in [DungeonDiceFace.GOBLIN.value, 
-                                                          DungeonDiceFace.SKELETON.value, 
-                                                          DungeonDiceFace.OOZE.value]]
-                    
-                    print(f"Dragon Bait used! {monster_count} monsters transformed into Dragons!")
-                    game_state.use_treasure(choice_idx)
-                    return True
-                    
-                elif token.type == TreasureType.TOWN_PORTAL:
-                    # Gain experience equal to level and end delve
-                    exp_gained = game_state.level
-                    game_state.experience_tokens += exp_gained
-                    print(f"Town Portal used! Gained {exp_gained} Experience tokens!")
-                    game_state.use_treasure(choice_idx)
-                    return "END_DELVE"
-                    
-                elif token.type == TreasureType.SCROLL:
-                    # Use Scroll treasure to re-roll dice
-                    print("Scroll treasure used! Select dice to re-roll (results will be random).")
-                    game_state.use_treasure(choice_idx)
-                    
-                    # Create a list of all available dice to re-roll
-                    print("\nAvailable Dice to Re-roll:")
-                    print("=== Dungeon Dice (excluding Dragon dice) ===")
-                    reroll_options = []
-                    # Add dungeon dice (excluding dragon dice)
-                    for i, die in enumerate(game_state.dungeon_dice):
-                        reroll_options.append(("dungeon", i, die))
-                        print(f"{len(reroll_options)}. Dungeon Die: {die}")
-                    
-                    print("\n=== Party Dice ===")
-                    # Add party dice
-                    for i, die in enumerate(game_state.party_dice):
-                        reroll_options.append(("party", i, die))
-                        print(f"{len(reroll_options)}. Party Die: {die}")
-                    
-                    if not reroll_options:
-                        print("No dice available to re-roll!")
-                        return False
-                    
-                    print(f"{len(reroll_options)+1}. Cancel")
-                    
-                    reroll_choice = input("Choose dice to re-roll (number): ").strip()
-                    try:
-                        reroll_choice_idx = int(reroll_choice) - 1
-                        if reroll_choice_idx == len(reroll_options):
-                            print("Re-roll cancelled.")
-                            return False
-                        if 0 <= reroll_choice_idx < len(reroll_options):
-                            source, idx, old_die = reroll_options[reroll_choice_idx]
-                            
-                            # Re-roll the selected die
-                            from dice import DiceManager
-                            dice_manager = DiceManager()
-                            if source == "dungeon":
-                                new_die = dice_manager.roll_dungeon_dice(1)[0]
-                                game_state.dungeon_dice[idx] = new_die
-                                print(f"Dungeon die re-rolled: {old_die} → {new_die}")
-                            else:  # party
-                                new_die = dice_manager.roll_party_dice(1)[0]
-                                game_state.party_dice[idx] = new_die
-                                print(f"Party die re-rolled: {old_die} → {new_die}")
-                            
-                            return True
-                        else:
-                            print("Invalid choice.")
-                            return False
-                    except ValueError:
-                        print("Invalid input.")
-                        return False
-                    
-                else:  # Companion-like treasures are handled in their respective phases
-                    print("This treasure must be used during combat or specific phases.")
-                    return False
-            else:
-                print("Invalid choice.")
-                return False
-        except ValueError:
-            print("Invalid input.")
-            return False 
\ No newline at end of file
+        elif treasure_type == TreasureType.DRAGON_BAIT:
+            # Transform all monsters into dragons
+            monsters = game_state.monster_count
+            for monster in MONSTER_FACES:
+                game_state.remove_dungeon_dice(monster, game_state.dungeon_counts[monster])
+            game_state.dragons_lair += monsters
+            
+            say(f"Dragon Bait used! {monsters} monsters transformed into Dragons!")
+            game_state.use_treasure_type(treasure_type)
+            return True
+            
+        elif treasure_type == TreasureType.TOWN_PORTAL:
+            # Gain experience equal to level and end delve
+            exp_gained = game_state.level
+            game_state.experience_tokens += exp_gained
+            say(f"Town Portal used! Gained {exp_gained} Experience tokens!")
+            game_state.use_treasure_type(treasure_type)
+            return "END_DELVE"
+            
+        else:  # Scroll
+            # Use Scroll treasure to re-roll dice
+            say("Scroll treasure used! Select dice to re-roll (results will be random).")
+            game_state.use_treasure_type(treasure_type)
+            return ScrollActions.reroll_one(game_state, policy, allow_cancel=False)
@@ -0,0 +1,79 @@
+import numpy as np
+
+from dice import DIE_SIDES
+from treasure import NUM_TREASURE_TYPES
+
+# Fixed seed, so hashes are the same in every process and every run
+ZOBRIST_SEED = 0x5EED_D1CE
+
+# Largest count, level or delve number a key is needed for. Real games stay far below it
+# (7 dice, 6 tokens of a treasure type, level 10, delve 3); anything outside 0..MAX_COUNT
+# is a bug and raises ValueError rather than wrapping to another key.
+MAX_COUNT = 40
+
+_rng = np.random.default_rng(ZOBRIST_SEED)
+
+def _keys(*shape):
+    """Random 64-bit keys as nested lists of Python ints, which XOR faster than NumPy scalars."""
+    return _rng.integers(0, 2 ** 64, size=shape, dtype=np.uint64).tolist()
+
+# One key per (slot, count) for each count vector, and one per value for each scalar
+PARTY_KEYS = _keys(DIE_SIDES, MAX_COUNT + 1)
+GRAVEYARD_KEYS = _keys(DIE_SIDES, MAX_COUNT + 1)
+DUNGEON_KEYS = _keys(DIE_SIDES, MAX_COUNT + 1)
+POOL_KEYS = _keys(NUM_TREASURE_TYPES, MAX_COUNT + 1)
+HOARD_KEYS = _keys(NUM_TREASURE_TYPES, MAX_COUNT + 1)
+LAIR_KEYS = _keys(MAX_COUNT + 1)
+LEVEL_KEYS = _keys(MAX_COUNT + 1)
+DELVE_KEYS = _keys(MAX_COUNT + 1)
+HERO_KEYS = _keys(2, 2)  # [master][exhausted]
+
+def check_count(value):
+    """Raise ValueError if `value` has no key."""
+    if not 0 <= value <= MAX_COUNT:
+        raise ValueError(f"count {value} is outside 0..{MAX_COUNT}")
+
+class ZobristHash:
+    """The XOR of the keys of every count held in `HashedCounts` vectors that share it."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+class HashedCounts(list):
+    """A count vector that keeps a shared ZobristHash up to date on every write.
+
+    Each write XORs out the key of the old count and XORs in the key of the new
+    one, so the hash costs O(1) per change. Whole-vector assignment (`counts[:] = ...`)
+    is supported for resets. Counts outside 0..MAX_COUNT raise ValueError and
+    leave the vector and the hash unchanged.
+    """
+    __slots__ = ("keys", "zobrist")
+
+    def __init__(self, values, keys, zobrist):
+        super().__init__(values)
+        self.keys = keys
+        self.zobrist = zobrist
+        for slot, count in enumerate(self):
+            check_count(count)
+            zobrist.value ^= keys[slot][count]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            slots = range(*index.indices(len(self)))
+            if len(value) != len(slots):
+                raise ValueError("HashedCounts cannot change length")
+            digest = self.zobrist.value
+            for slot, count in zip(slots, value):
+                check_count(count)
+                keys = self.keys[slot]
+                digest ^= keys[list.__getitem__(self, slot)] ^ keys[count]
+            self.zobrist.value = digest
+            list.__setitem__(self, index, value)
+            return
+        if not 0 <= value <= MAX_COUNT:
+            raise ValueError(f"count {value} is outside 0..{MAX_COUNT}")
+        keys = self.keys[index]
+        self.zobrist.value ^= keys[list.__getitem__(self, index)] ^ keys[value]
+        list.__setitem__(self, index, value)